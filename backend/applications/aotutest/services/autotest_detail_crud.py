@@ -156,6 +156,44 @@ class AutoTestApiDetailCrud(ScaffoldCrud[AutoTestApiDetailInfo, AutoTestApiDetai
             LOGGER.error(f"{error_message}\n{traceback.format_exc()}")
             raise DataAlreadyExistsException(message=error_message) from e
 
+    async def bulk_create_details(self, details_in: List[AutoTestApiDetailCreate], report_code: str, batch_size: int = 500) -> int:
+        """批量创建同一报告下的执行明细，以多行 INSERT 代替逐条 create_detail（用于延后落库场景）。
+
+        :param details_in: 明细创建 schema 列表。
+        :param report_code: 所属报告标识代码，统一覆盖到每条明细。
+        :param batch_size: 单条 INSERT 语句包含的最大行数。
+        :returns: 写入的明细数量。
+        :raises NotFoundException: 用例不存在时。
+        :raises DataBaseStorageException: 违反唯一约束时。
+        :raises DataAlreadyExistsException: 其他写入冲突时。
+        """
+        if not details_in:
+            return 0
+
+        # 业务层验证：每个用例只校验一次（报告由调用方在同一事务内创建，无需再校验）
+        for case_id, case_code in {(d.case_id, d.case_code) for d in details_in}:
+            await AUTOTEST_API_CASE_CRUD.get_by_conditions(
+                only_one=True,
+                on_error=True,
+                conditions={"id": case_id, "case_code": case_code}
+            )
+        try:
+            # 明细在收集时已通过校验，直接 model_dump 后覆盖 report_code，无需 model_copy 复制模型
+            instances = [
+                self.model(**{**d.model_dump(exclude_none=True, exclude_unset=True), "report_code": report_code})
+                for d in details_in
+            ]
+            await self.model.bulk_create(instances, batch_size=batch_size)
+            return len(instances)
+        except IntegrityError as e:
+            error_message: str = f"批量新增明细信息失败, 违反联合唯一约束规则(report_code, case_code, step_code, num_cycles)"
+            LOGGER.error(f"{error_message}\n{traceback.format_exc()}")
+            raise DataBaseStorageException(message=error_message) from e
+        except Exception as e:
+            error_message: str = f"批量新增明细信息异常, 错误描述: {e}"
+            LOGGER.error(f"{error_message}\n{traceback.format_exc()}")
+            raise DataAlreadyExistsException(message=error_message) from e
+
     async def update_detail(self, detail_in: AutoTestApiDetailUpdate) -> AutoTestApiDetailInfo:
         """更新明细，需提供 detail_id 或 (report_code, step_code) 定位。
 
@@ -6,8 +6,9 @@
 @Module  : autotest_env_crud
 @DateTime: 2026/1/2 17:42
 """
+import time
 import traceback
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Dict, Any, Union, List, Tuple
 
 from tortoise.exceptions import IntegrityError, FieldError, DoesNotExist
 from tortoise.expressions import Q
@@ -31,9 +32,43 @@ from backend.core.exceptions import (
 class AutoTestApiEnvEnumCrud(ScaffoldCrud[AutoTestApiEnvEnumInfo, AutoTestApiEnvCreate, AutoTestApiEnvUpdate]):
     """自动化测试环境的 CRUD 服务，负责环境枚举的增删改查。"""
 
+    # 调试接口按 (project_id, env_name) 查询环境的进程内缓存有效期(秒)
+    ENV_CACHE_TTL: float = 30.0
+
     def __init__(self):
         """初始化 CRUD，绑定模型 AutoTestApiEnvEnumInfo。"""
         super().__init__(model=AutoTestApiEnvEnumInfo)
+        # (project_id, env_name) -> (过期时间, 环境实例)
+        self._env_cache: Dict[Tuple[int, str], Tuple[float, AutoTestApiEnvEnumInfo]] = {}
+
+    def clear_env_cache(self) -> None:
+        """清空环境查询缓存，环境信息发生新增、更新、删除时调用。"""
+        self._env_cache.clear()
+
+    async def get_by_project_env_cached(self, project_id: int, env_name: str) -> Optional[AutoTestApiEnvEnumInfo]:
+        """
+        按项目与环境名称查询环境，结果在进程内缓存 ENV_CACHE_TTL 秒(未命中的查询不缓存)
+        供 HTTP/TCP 请求调试等高频只读场景使用，避免每次调试都访问数据库
+        :param project_id: 项目主键
+        :param env_name: 环境名称
+        :returns: 环境实例或 None
+        :raises ParameterException: 条件非法或查询异常时
+        """
+        cache_key: Tuple[int, str] = (project_id, env_name)
+        cached = self._env_cache.get(cache_key)
+        now: float = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        instance: Optional[AutoTestApiEnvEnumInfo] = await self.get_by_conditions(
+            only_one=True,
+            on_error=False,
+            conditions={"project_id": project_id, "env_name": env_name},
+        )
+        if instance:
+            self._env_cache[cache_key] = (now + self.ENV_CACHE_TTL, instance)
+        else:
+            self._env_cache.pop(cache_key, None)
+        return instance
 
     async def get_by_id(self, env_id: int, on_error: bool = False) -> Optional[AutoTestApiEnvEnumInfo]:
         """
@@ -146,6 +181,7 @@ class AutoTestApiEnvEnumCrud(ScaffoldCrud[AutoTestApiEnvEnumInfo, AutoTestApiEnv
         if not existing_env:
             try:
                 instance: AutoTestApiEnvEnumInfo = await self.create(obj_in=env_dict)
+                self.clear_env_cache()
                 return instance
             except IntegrityError as e:
                 error_message: str = f"新增环境枚举信息异常, 违反约束规则: {e}"
@@ -155,6 +191,7 @@ class AutoTestApiEnvEnumCrud(ScaffoldCrud[AutoTestApiEnvEnumInfo, AutoTestApiEnv
         try:
             env_dict["state"] = 0
             instance: AutoTestApiEnvEnumInfo = await self.update(id=existing_env.id, obj_in=env_dict)
+            self.clear_env_cache()
             return instance
         except (DoesNotExist, IntegrityError) as e:
             error_message: str = f"新增(更新)环境枚举信息异常, 违反约束规则或空指针异常: {e}"
@@ -188,6 +225,7 @@ class AutoTestApiEnvEnumCrud(ScaffoldCrud[AutoTestApiEnvEnumInfo, AutoTestApiEnv
         )
         try:
             instance = await self.update(id=env_id, obj_in=update_dict)
+            self.clear_env_cache()
             return instance
         except DoesNotExist as e:
             error_message: str = f"更新环境枚举信息失败, 环境(id={env_id}或code={env_code})不存在, 错误描述: {e}"
@@ -214,6 +252,7 @@ class AutoTestApiEnvEnumCrud(ScaffoldCrud[AutoTestApiEnvEnumInfo, AutoTestApiEnv
 
         instance.state = 1
         await instance.save()
+        self.clear_env_cache()
         return instance
 
     async def delete_envs(self, env_in: AutoTestApiEnvDelete) -> int:
@@ -230,6 +269,7 @@ class AutoTestApiEnvEnumCrud(ScaffoldCrud[AutoTestApiEnvEnumInfo, AutoTestApiEnv
             count = await self.model.filter(env_code__in=env_codes).update(state=1)
         else:
             count = 0
+        self.clear_env_cache()
         return count
 
     async def select_envs(self, search: Q, page: int, page_size: int, order: list) -> tuple:
@@ -78,6 +78,33 @@ class AutoTestApiTaskRecordCrud(
         await record.save(update_fields=list(update_dict.keys()))
         return record
 
+    async def finish_record_by_celery_id(
+            self,
+            celery_id: str,
+            data: Dict[str, Any],
+            celery_start_time: Optional[datetime] = None,
+    ) -> int:
+        """
+        根据 Celery 调度 ID 将记录置为终态，通常由 Worker on_success/on_failure 调用。
+        开始时间由 Worker 在写入 RUNNING 记录时保留并传入，耗时在内存中算好后单条 filter().update() 写回，不再回查记录。
+
+        :param celery_id: Celery 任务/调度 ID。
+        :param data: 要更新的字段字典，须包含 celery_end_time；task_summary、task_error 允许为 None。
+        :param celery_start_time: 写入 RUNNING 记录时使用的开始时间，为空时不更新 celery_duration。
+        :returns: 受影响的行数，未找到记录时为 0。
+        """
+        if not celery_id:
+            return 0
+        allow_none_keys = ("task_summary", "task_error")
+        db_fields = self.model._meta.fields_db_projection
+        update_dict = {k: v for k, v in data.items() if k in db_fields and (v is not None or k in allow_none_keys)}
+        end_time = update_dict.get("celery_end_time")
+        if celery_start_time and end_time:
+            if getattr(celery_start_time, "tzinfo", None) is not None:
+                celery_start_time = celery_start_time.replace(tzinfo=None)
+            update_dict["celery_duration"] = f"{(end_time - celery_start_time).total_seconds():.2f}s"
+        return await self.model.filter(celery_id=celery_id).update(**update_dict)
+
     async def select_records(
             self,
             record_in: AutoTestApiRecordSelect,
@@ -9,6 +9,7 @@
 import datetime
 import traceback
 import uuid
+from collections import defaultdict
 from typing import Optional, List, Dict, Any, Set, Union
 
 from tortoise.exceptions import DoesNotExist, IntegrityError, FieldError
@@ -41,6 +42,9 @@ from backend.core.exceptions import (
 )
 from backend.enums import AutoTestCaseType, AutoTestStepType, AutoTestReportType
 
+# 批量执行用例时，每累计多少个用例的执行结果提交一次落库事务
+_BATCH_PERSIST_SIZE: int = 20
+
 
 class AutoTestApiStepCrud(ScaffoldCrud[AutoTestApiStepInfo, AutoTestApiStepCreate, AutoTestApiStepUpdate]):
     """自动化测试步骤的 CRUD 服务，负责步骤树增删改查、批量更新及单用例/批量用例执行。"""
@@ -158,12 +162,46 @@ class AutoTestApiStepCrud(ScaffoldCrud[AutoTestApiStepInfo, AutoTestApiStepCreat
             case_instance = await AUTOTEST_API_CASE_CRUD.get_by_code(case_code=case_code, on_error=True)
             case_id: int = case_instance.id
 
+        # 每个用例的有效步骤只查询一次, 按父步骤ID分组(根步骤的键为 None), 避免逐节点查询子步骤
+        case_steps_cache: Dict[int, Dict[Optional[int], List[AutoTestApiStepInfo]]] = {}
+        # 用例信息(to_dict 结果)按 case_id 缓存, 避免树中每个节点重复查询同一用例
+        case_dict_cache: Dict[int, Dict[str, Any]] = {}
+
+        async def load_case_steps(target_case_id: int) -> Dict[Optional[int], List[AutoTestApiStepInfo]]:
+            """查询并缓存指定用例的全部有效步骤(按 step_no 排序), 返回 父步骤ID -> 子步骤列表 的分组。"""
+            grouped = case_steps_cache.get(target_case_id)
+            if grouped is None:
+                grouped = defaultdict(list)
+                case_steps: List[AutoTestApiStepInfo] = await self.model.filter(
+                    case_id=target_case_id,
+                    state__not=1
+                ).order_by("step_no").all()
+                for case_step in case_steps:
+                    grouped[case_step.parent_step_id].append(case_step)
+                case_steps_cache[target_case_id] = grouped
+            return grouped
+
+        async def load_case_dict(target_case_id: int, on_error: bool) -> Optional[Dict[str, Any]]:
+            """查询并缓存用例信息字典, 每次返回浅拷贝, 避免多个节点共享同一个字典对象。"""
+            cached = case_dict_cache.get(target_case_id)
+            if cached is None:
+                case = await AUTOTEST_API_CASE_CRUD.get_by_id(case_id=target_case_id, on_error=on_error)
+                if not case:
+                    return None
+                cached = await case.to_dict(
+                    exclude_fields={
+                        "state",
+                        "created_user", "updated_user",
+                        "created_time", "updated_time",
+                        "reserve_1", "reserve_2", "reserve_3"
+                    },
+                    replace_fields={"id": "case_id"}
+                )
+                case_dict_cache[target_case_id] = cached
+            return dict(cached)
+
         # 获取所有根步骤（没有父步骤的步骤）
-        root_steps: List = await self.model.filter(
-            case_id=case_id,
-            parent_step_id__isnull=True,
-            state__not=1
-        ).order_by("step_no").all()
+        root_steps: List = (await load_case_steps(case_id)).get(None, [])
         root_index = [step.step_no for step in root_steps]
         LOGGER.info(f"获取用例(case_id={case_id})根步骤成功, 共计: {len(root_steps)}个, 根步骤序号: {root_index}")
 
@@ -209,20 +247,11 @@ class AutoTestApiStepCrud(ScaffoldCrud[AutoTestApiStepInfo, AutoTestApiStepCreat
             LOGGER.info(f"获取步骤(step_id={step.id}, step_no={step.step_no})基本信息完成")
             # 获取用例信息（业务层手动查询）
             if step.case_id:
-                case = await AUTOTEST_API_CASE_CRUD.get_by_id(case_id=step.case_id, on_error=True)
-                step_dict["case"] = await case.to_dict(
-                    exclude_fields={
-                        "state",
-                        "created_user", "updated_user",
-                        "created_time", "updated_time",
-                        "reserve_1", "reserve_2", "reserve_3"
-                    },
-                    replace_fields={"id": "case_id"}
-                )
+                step_dict["case"] = await load_case_dict(step.case_id, on_error=True)
                 LOGGER.info(f"获取步骤(step_id={step.id}, step_no={step.step_no})所属用例信息完成")
 
             # 获取子步骤（递归构建）
-            children: List = await self.model.filter(parent_step_id=step.id, state__not=1).order_by("step_no").all()
+            children: List = (await load_case_steps(step.case_id)).get(step.id, []) if step.case_id else []
             if children:
                 LOGGER.info(f"- 获取步骤(step_id={step.id}, step_no={step.step_no})所有子步骤(递归构建)开始 -")
                 step_dict["children"] = [await build_step_tree(child, is_quote=is_quote) for child in children]
@@ -237,30 +266,18 @@ class AutoTestApiStepCrud(ScaffoldCrud[AutoTestApiStepInfo, AutoTestApiStepCreat
                 return step_dict
 
             # 业务层验证：检查引用的公共脚本是否存在
-            quote_case = await AUTOTEST_API_CASE_CRUD.get_by_id(case_id=step.quote_case_id, on_error=False)
-            if not quote_case:
+            quote_case_dict = await load_case_dict(step.quote_case_id, on_error=False)
+            if not quote_case_dict:
                 step_dict["quote_steps"] = []
                 step_dict["quote_case"] = None
                 return step_dict
 
             # 获取引用的公共脚本的所有步骤(包含子步骤, 递归构建)
-            quote_case_root_steps: List = await self.model.filter(
-                case_id=step.quote_case_id,
-                parent_step_id__isnull=True,
-                state__not=1
-            ).order_by("step_no").all()
+            quote_case_root_steps: List = (await load_case_steps(step.quote_case_id)).get(None, [])
             LOGGER.info(
                 f"= 获取步骤(step_id={step.id}, step_no={step.step_no})引用脚本的所有步骤(包含子步骤, 递归构建)开始 =")
             step_dict["quote_steps"] = [await build_step_tree(quote, is_quote=True) for quote in quote_case_root_steps]
-            step_dict["quote_case"] = await quote_case.to_dict(
-                exclude_fields={
-                    "state",
-                    "created_user", "updated_user",
-                    "created_time", "updated_time",
-                    "reserve_1", "reserve_2", "reserve_3"
-                },
-                replace_fields={"id": "case_id"}
-            )
+            step_dict["quote_case"] = quote_case_dict
             LOGGER.info(
                 "= 获取步骤(step_id={step.id}, step_no={step.step_no})引用脚本的所有步骤(包含子步骤, 递归构建)完成 =")
             return step_dict
@@ -643,18 +660,32 @@ class AutoTestApiStepCrud(ScaffoldCrud[AutoTestApiStepInfo, AutoTestApiStepCreat
 
         return deleted_count
 
-    async def select_steps(self, search: Q, page: int, page_size: int, order: list) -> tuple:
+    async def select_steps(
+            self,
+            search: Q,
+            page: int,
+            page_size: int,
+            order: list,
+            fields: Optional[Dict[str, str]] = None
+    ) -> tuple:
         """分页查询步骤列表。
 
         :param search: Tortoise Q 查询条件。
         :param page: 页码。
         :param page_size: 每页条数。
         :param order: 排序字段列表。
+        :param fields: 仅返回的字段映射 {输出字段名: 模型字段名}, 指定时直接 values() 返回字典列表, 不实例化模型。
         :returns: 由 (总条数, 当前页记录列表) 组成的元组。
         :raises ParameterException: 查询条件非法导致 FieldError 时。
         """
         try:
-            return await self.list(page=page, page_size=page_size, search=search, order=order)
+            if not fields:
+                return await self.list(page=page, page_size=page_size, search=search, order=order)
+            query = self.model.filter(search)
+            total: int = await query.count()
+            if not total:
+                return total, []
+            return total, await query.offset((page - 1) * page_size).limit(page_size).order_by(*order).values(**fields)
         except FieldError as e:
             error_message: str = f"查询步骤信息异常, 错误描述: {e}"
             LOGGER.error(f"{error_message}\n{traceback.format_exc()}")
@@ -959,10 +990,12 @@ class AutoTestApiStepCrud(ScaffoldCrud[AutoTestApiStepInfo, AutoTestApiStepCreat
             task_code: Optional[str] = None,
             batch_code: Optional[str] = None,
             dataset_name: Optional[str] = None,
+            pending_persists: Optional[List[Dict[str, Any]]] = None,
     ) -> Dict[str, Any]:
         """执行单个用例：创建报告、拉取步骤树、调用执行引擎并写明细。
 
         参数化执行时仅传入 dataset_name，步骤执行器内按 case_id/step_no/step_code/dataset_name 查表获取数据。
+        传入 pending_persists 时不立即落库，而是把待落库数据追加到该列表，由调用方通过 persist_case_executions 批量写入。
 
         :param case_id: 用例主键 ID。
         :param report_type: 报告类型枚举。
@@ -971,6 +1004,7 @@ class AutoTestApiStepCrud(ScaffoldCrud[AutoTestApiStepInfo, AutoTestApiStepCreat
         :param task_code: 任务标识代码，可选。
         :param batch_code: 批次标识代码，可选。
         :param dataset_name: 参数化执行时本次数据集名称，写入报告；数据由 HTTP 步骤执行器内查表获取。
+        :param pending_persists: 延后落库队列，可选。
         :returns: 包含报告与执行结果的字典（如 report_code、case_state、details 等）。
         :raises NotFoundException: 用例不存在时。
         """
@@ -1035,21 +1069,16 @@ class AutoTestApiStepCrud(ScaffoldCrud[AutoTestApiStepInfo, AutoTestApiStepCreat
             dataset_name=dataset_name,
         )
         if defer_create_report is not None:
-            try:
-                async with in_transaction():
-                    report_instance = await AUTOTEST_API_REPORT_CRUD.create_report(report_in=defer_create_report)
-                    for detail_create in (pending_create_details or []):
-                        detail_schema = detail_create.model_copy(update={"report_code": report_instance.report_code})
-                        await AUTOTEST_API_DETAIL_CRUD.create_detail(detail_in=detail_schema)
-                    case_state = statistics.get("failed_steps", 0) == 0
-                    case_last_time = defer_create_report.case_ed_time
-                    await AUTOTEST_API_CASE_CRUD.update_case(AutoTestApiCaseUpdate(
-                        case_id=case_id,
-                        case_state=case_state,
-                        case_last_time=case_last_time,
-                    ))
-            except Exception as e:
-                LOGGER.error(f"执行或调试步骤树(运行模式)时发生未知异常，错误描述: {e}\n{traceback.format_exc()}")
+            pending_persist: Dict[str, Any] = {
+                "case_id": case_id,
+                "report_create": defer_create_report,
+                "details_create": pending_create_details or [],
+                "case_state": statistics.get("failed_steps", 0) == 0,
+            }
+            if pending_persists is not None:
+                pending_persists.append(pending_persist)
+            else:
+                await self.persist_case_executions([pending_persist])
 
             # 返回运行模式的简化结果
             result_data = {
@@ -1067,6 +1096,39 @@ class AutoTestApiStepCrud(ScaffoldCrud[AutoTestApiStepInfo, AutoTestApiStepCreat
 
             return result_data
 
+    @staticmethod
+    async def persist_case_executions(pending_persists: List[Dict[str, Any]]) -> int:
+        """将一个或多个用例的执行结果（报告、明细、用例状态）落库。
+
+        所有用例在同一个外层事务内提交；每个用例使用嵌套事务（SAVEPOINT），单个用例落库失败只回滚该用例，不影响其余用例。
+
+        :param pending_persists: execute_single_case 产出的待落库数据列表，每项含 case_id、report_create、details_create、case_state。
+        :returns: 成功落库的用例数量。
+        """
+        persisted: int = 0
+        if not pending_persists:
+            return persisted
+        async with in_transaction():
+            for pending in pending_persists:
+                case_id: int = pending["case_id"]
+                report_create = pending["report_create"]
+                try:
+                    async with in_transaction():
+                        report_instance = await AUTOTEST_API_REPORT_CRUD.create_report(report_in=report_create)
+                        await AUTOTEST_API_DETAIL_CRUD.bulk_create_details(
+                            details_in=pending["details_create"],
+                            report_code=report_instance.report_code,
+                        )
+                        await AUTOTEST_API_CASE_CRUD.update_case(AutoTestApiCaseUpdate(
+                            case_id=case_id,
+                            case_state=pending["case_state"],
+                            case_last_time=report_create.case_ed_time,
+                        ))
+                    persisted += 1
+                except Exception as e:
+                    LOGGER.error(f"执行或调试步骤树(运行模式)时发生未知异常，用例ID: {case_id}, 错误描述: {e}\n{traceback.format_exc()}")
+        return persisted
+
     async def batch_execute_cases(
             self,
             case_ids: List[int],
@@ -1096,9 +1158,10 @@ class AutoTestApiStepCrud(ScaffoldCrud[AutoTestApiStepInfo, AutoTestApiStepCreat
         LOGGER.info(f"{'= ' * 20}批量执行开始{'= ' * 20}")
         LOGGER.info(f"本次批量执行的用例ID列表: {case_ids}")
         batch_code: str = f"{int(datetime.datetime.now().timestamp())}-{uuid.uuid4().hex.upper()}"
+        # 执行结果延后落库：每累计 _BATCH_PERSIST_SIZE 个用例提交一次事务（用例间以 SAVEPOINT 隔离），而非每个用例一次事务
+        pending_persists: List[Dict[str, Any]] = []
         for case_id in case_ids:
             try:
-                # 每个用例独立开启事务执行
                 LOGGER.info(f"==========> 执行用例ID: {case_id} 开始")
                 result = await self.execute_single_case(
                     case_id=case_id,
@@ -1107,6 +1170,7 @@ class AutoTestApiStepCrud(ScaffoldCrud[AutoTestApiStepInfo, AutoTestApiStepCreat
                     report_type=report_type,
                     task_code=task_code,
                     batch_code=batch_code,
+                    pending_persists=pending_persists,
                 )
                 result["error"] = None
                 results.append(result)
@@ -1126,6 +1190,10 @@ class AutoTestApiStepCrud(ScaffoldCrud[AutoTestApiStepInfo, AutoTestApiStepCreat
                     "saved_to_database": False
                 })
             LOGGER.info(f"==========> 执行用例ID: {case_id} 结束")
+            if len(pending_persists) >= _BATCH_PERSIST_SIZE:
+                await self.persist_case_executions(pending_persists)
+                pending_persists.clear()
+        await self.persist_case_executions(pending_persists)
         LOGGER.info(f"{'= ' * 20}批量执行结束{'= ' * 20}")
         return {
             "total_cases": total_cases,
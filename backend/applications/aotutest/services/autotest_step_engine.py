@@ -11,6 +11,7 @@ import string
 import time
 import traceback
 import types
+from collections import ChainMap
 from contextlib import AsyncExitStack
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -527,10 +528,13 @@ class StepExecutionContext:
                 **_USER_CODE_EXTRA_BUILTINS,
             }
         }
-        local_context: Dict[str, Any] = {}
+        # 变量命名空间只读挂在 ChainMap 之后, 不再整体拷贝; 代码新定义的名称(函数/result)全部落在 maps[0]
+        code_locals: Dict[str, Any] = {}
         if namespace:
             namespace.pop("__builtins__", None)
-            local_context.update(namespace)
+            local_context = ChainMap(code_locals, namespace)
+        else:
+            local_context = code_locals
 
         try:
             exec(prepared_code, safe_globals, local_context)
@@ -567,7 +571,7 @@ class StepExecutionContext:
 
         functions = {
             name: obj
-            for name, obj in local_context.items()
+            for name, obj in code_locals.items()
             if isinstance(obj, types.FunctionType)
         }
         if functions:
@@ -592,8 +596,8 @@ class StepExecutionContext:
                 )
                 self.log(error_message)
                 raise StepExecutionError(error_message)
-        elif "result" in local_context:
-            result = local_context["result"]
+        elif "result" in code_locals:
+            result = code_locals["result"]
         else:
             result = None
 
@@ -9,20 +9,211 @@
 from __future__ import annotations
 
 import ast
+import functools
 import json
+import operator
 import re
+import reprlib
+import sys
 import traceback
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple, Callable, Union
-from xml.etree import ElementTree as ET
-
 from jsonpath_ng import parse as jsonpath_parse
+from lxml import etree
 
 from backend.applications.aotutest.schemas.autotest_step_schema import AutoTestStepTreeUpdateItem
 from backend.common.generate_utils import GenerateUtils
 from backend.common import JSONPathUtils
 
 
+@functools.lru_cache(maxsize=1024)
+def _compile_json_path(expr: str):
+    """
+    编译并缓存 JSONPath 表达式, 同一表达式在进程内仅解析一次(jsonpath_ng 解析开销远大于 find)
+
+    :param expr: JSONPath 表达式
+    :return: 编译后的 JSONPath 对象
+    """
+    return jsonpath_parse(expr)
+
+
+# 仅由字段名组成的简单 JSONPath($.a.b.c), 可按键逐级取值而无需完整解析
+_RE_SIMPLE_JSON_PATH = re.compile(r"^\$(?:\.[A-Za-z_][\w\-]*)+$")
+
+
+@functools.lru_cache(maxsize=1024)
+def _simple_json_path_keys(expr: str) -> Optional[Tuple[str, ...]]:
+    """
+    将简单 JSONPath 拆分为键序列并缓存, 含通配符/下标/过滤等语法时返回 None
+
+    :param expr: JSONPath 表达式
+    :return: 键序列或 None
+    """
+    if not _RE_SIMPLE_JSON_PATH.match(expr):
+        return None
+    return tuple(expr[2:].split("."))
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_regex(pattern: str) -> re.Pattern:
+    """
+    编译并缓存用户提供的正则表达式(response text 提取/断言), 非法表达式照常抛出 re.error
+
+    :param pattern: 正则表达式
+    :return: 编译后的正则对象
+    """
+    return re.compile(pattern)
+
+
+# 日志中展示提取值/实际值时使用的截断 repr, 大型 JSON 数组/对象只展示前若干项, 完整值仍保留在结果明细中
+_LOG_VALUE_REPR = reprlib.Repr()
+_LOG_VALUE_REPR.maxlevel = 3
+_LOG_VALUE_REPR.maxlist = _LOG_VALUE_REPR.maxtuple = _LOG_VALUE_REPR.maxset = 10
+_LOG_VALUE_REPR.maxdict = 10
+_LOG_VALUE_REPR.maxstring = _LOG_VALUE_REPR.maxother = 200
+_LOG_VALUE_MAX_TEXT = 1000
+
+
+def _brief_log_value(value: Any) -> str:
+    """
+    生成日志展示用的简短文本：字符串超长时截断, 容器类型按层级/条数截断, 避免大响应递归拼接完整 repr
+
+    :param value: 待展示的值
+    :return: 截断后的文本
+    """
+    if isinstance(value, str):
+        return value if len(value) <= _LOG_VALUE_MAX_TEXT else f"{value[:_LOG_VALUE_MAX_TEXT]}...(共{len(value)}字符)"
+    if isinstance(value, (dict, list, tuple, set)):
+        return _LOG_VALUE_REPR.repr(value)
+    return str(value)
+
+
+# 数据源不可用(响应为空或无法解析)时的错误描述, 提取函数与循环外的预检查共用
+_SOURCE_UNAVAILABLE_MESSAGES: Dict[str, str] = {
+    "response json": "响应内容不是有效的JSON数据",
+    "response xml": "响应内容不是有效的XML数据",
+    "response text": "响应内容不是有效的Text数据",
+    "response headers": "响应 Headers 为空",
+    "response cookies": "响应 Cookies 为空",
+}
+
+# 响应头/Cookie 的单键表达式($.name 或 name), 命中时直接按键取值而无需走 JSONPath
+_RE_SIMPLE_KEY_EXPR = re.compile(r"^(?:\$\.)?([A-Za-z0-9_\-]+)$")
+# 单键取值未命中的哨兵, 与值为空字符串/0 的情况区分
+_MISSING = object()
+
+
+def _lookup_simple_key(mapping: Dict[str, Any], expr: str, ignore_case: bool) -> Any:
+    """
+    单键表达式快速取值, 非单键表达式或键不存在时返回 _MISSING 交由 JSONPath 处理
+
+    :param mapping: 响应头或 Cookie 字典
+    :param expr: 提取表达式
+    :param ignore_case: 是否忽略键名大小写(响应头)
+    :return: 键对应的值或 _MISSING
+    """
+    match = _RE_SIMPLE_KEY_EXPR.match(expr.strip())
+    if not match:
+        return _MISSING
+    key = match.group(1)
+    value = mapping.get(key, _MISSING)
+    if value is _MISSING and ignore_case:
+        value = mapping.get(key.lower(), _MISSING)
+    return value
+
+
+@functools.lru_cache(maxsize=64)
+def _normalize_config_key(value: Optional[str]) -> str:
+    """
+    数据源类型/提取范围等配置取值归一化(去空白并小写)并驻留缓存
+    取值集合很小, 循环内重复调用直接命中缓存而不再分配新字符串, 驻留后与字面量比较时按对象身份即可短路
+
+    :param value: 配置中的数据源类型或提取范围
+    :return: 归一化后的取值
+    """
+    return sys.intern((value or "").strip().lower())
+
+
+def _lookup_cache_key(source: Any, expr: Any, range_type: Any = None, index: Any = None) -> Optional[tuple]:
+    """
+    生成单次提取/断言循环内的取值去重键, 相同 (数据源, 表达式, 范围, 下标) 的配置项只计算一次
+
+    :param source: 数据源类型
+    :param expr: 提取表达式
+    :param range_type: 提取范围
+    :param index: 下标
+    :return: 去重键; 取值无法作为键(非字符串或不可哈希)时返回 None, 即不参与去重
+    """
+    if not isinstance(source, str) or not isinstance(expr, str):
+        return None
+    if range_type is not None and not isinstance(range_type, str):
+        return None
+    key = (_normalize_config_key(source), expr, _normalize_config_key(range_type or "SOME"), index)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _parse_response_xml(response_text: str):
+    """
+    使用 lxml 解析 XML 响应文本; 不做进程级缓存(解析树可变且体量大), 由调用方在一次提取/断言中传递复用
+
+    解析器禁用外部实体与网络访问, 文本统一按 UTF-8 编码后解析(忽略报文中的 encoding 声明)
+
+    :param response_text: XML 响应文本
+    :return: 根元素
+    :raises etree.ParseError: 文本不是合法 XML 时
+    """
+    # 同一响应的全部 XML 提取/断言共用这一棵树, 整体解析一次比按表达式各自 iterparse 流式扫描更省;
+    # 不收集 xml:id 索引, 减少大报文解析时的额外哈希表开销
+    parser = etree.XMLParser(encoding="utf-8", resolve_entities=False, no_network=True, collect_ids=False)
+    return etree.fromstring(response_text.encode("utf-8"), parser=parser)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_xpath(expr: str) -> etree.XPath:
+    """
+    编译并缓存 XPath 表达式, 同一表达式在进程内仅编译一次
+
+    :param expr: XPath 表达式
+    :return: 可直接对元素求值的 XPath 对象
+    :raises etree.XPathSyntaxError: 表达式不是合法 XPath 时
+    """
+    return etree.XPath(expr)
+
+
+def _find_xml_nodes(response_xml: Any, expr: str) -> List[Any]:
+    """
+    以根元素为上下文执行 XPath, 非 XPath 语法(如 ElementPath 的 {namespace}tag)回退到 findall
+
+    :param response_xml: XML 根元素
+    :param expr: XPath/ElementPath 表达式
+    :return: 匹配结果列表(元素、字符串或数值)
+    """
+    try:
+        xpath = _compile_xpath(expr)
+    except etree.XPathSyntaxError:
+        return response_xml.findall(expr)
+    nodes = xpath(response_xml)
+    return nodes if isinstance(nodes, list) else [nodes]
+
+
+def _xml_node_value(node: Any) -> Any:
+    """
+    元素取文本(无文本时取序列化内容), text()/@attr 等字符串结果转为普通 str, 数值/布尔原样返回
+
+    :param node: XPath 匹配结果项
+    :return: 节点值
+    """
+    if isinstance(node, etree._Element):
+        return node.text if node.text else etree.tostring(node, encoding="unicode")
+    if isinstance(node, str):
+        return str(node)
+    return node
+
+
 class AutoTestToolService:
     """服务层：对外稳定 API；内部实现见 `AutoTestToolServiceImpl`"""
 
@@ -57,6 +248,40 @@ class AutoTestToolService:
         """
         return AutoTestToolServiceImpl.key_value_list_to_dict(data if isinstance(data, list) else [], skip_if_no_value=False)
 
+    @classmethod
+    def resolve_list_to_dict_for_http(
+            cls,
+            data: List[Dict[str, Any]],
+            logger_object: Callable,
+            finished_variables: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        一次遍历完成 key/value/desc 列表的占位符解析与字典平铺, 等价于先 resolve_placeholders 再 convert_list_to_dict_for_http,
+        但不再构造被立即丢弃的中间列表(每项的 dict 副本)
+
+        使用处：HTTP 请求调试中 request_header、request_params、form_data、urlencoded、form_files 的参数准备
+
+        :param data: 每项含 key、value 的列表
+        :param logger_object: 日志回调, 签名为 (str) -> None
+        :param finished_variables: 变量列表(List[Dict], 每项含 key/value), 含义同 resolve_placeholders
+        :return: 键值对字典(value 已完成占位符解析)；非列表入参返回空字典
+        """
+        if not isinstance(data, list):
+            return {}
+        result: Dict[str, Any] = {}
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            key: Optional[str] = item.get("key")
+            if key:
+                result[key] = AutoTestToolServiceImpl.resolve_placeholders(
+                    item.get("value"),
+                    logger_object,
+                    is_core_engine=False,
+                    finished_variables=finished_variables,
+                )
+        return result
+
     @staticmethod
     def get_value_from_list(variable_list: List[Dict[str, Any]], name: str) -> Any:
         """
@@ -340,6 +565,7 @@ class AutoTestToolService:
             response_cookies: Optional[Dict[str, Any]] = None,
             session_variables_lookup: Optional[Dict[str, Any]] = None,
             operation_type: str = "变量提取",
+            response_xml: Optional[Any] = None,
     ) -> Any:
         """
         从 source 指定来源中按 expr 与 range 提取单个值供 HTTP 调试与步骤引擎共用
@@ -354,124 +580,119 @@ class AutoTestToolService:
         :param response_cookies: 响应 Cookie
         :param session_variables_lookup: 变量池字典（Dict[str, Any]），按 JSONPath 取值
         :param operation_type: 错误信息前缀, 如 "变量提取"、"断言验证"
+        :param response_xml: 已解析的 XML 根元素(由调用方在循环外解析一次), 为空时按 response_text 解析
         :return: 提取得到的值
         :raises ValueError: 提取失败时, 携带可读错误信息
         """
-        range_type = (range_type or "SOME").strip().lower()
-        src = (source or "").strip().lower()
+        handler: Optional[Callable[..., Any]] = _EXTRACT_SOURCE_HANDLERS.get(_normalize_config_key(source))
+        if handler is None:
+            raise ValueError(f"【{operation_type}】数据源源类型 {source} 不被支持")
+        return handler(
+            expr=expr,
+            range_type=_normalize_config_key(range_type or "SOME"),
+            index=index,
+            operation_type=operation_type,
+            response_text=response_text,
+            response_json=response_json,
+            response_headers=response_headers,
+            response_cookies=response_cookies,
+            session_variables_lookup=session_variables_lookup,
+            response_xml=response_xml,
+        )
 
-        if src == "response json":
-            if response_json is None:
-                raise ValueError(f"【{operation_type}】响应内容不是有效的JSON数据")
-            if range_type == "all":
-                return response_json
-            if not expr:
-                raise ValueError(f"【{operation_type}】模式[SOME]下参数[expr]是必须的, 并且需要是有效的JSONPath表达式")
-            try:
-                extract_value = AutoTestToolServiceImpl.resolve_json_path(data=response_json, expr=expr)
-            except Exception as e:
-                raise ValueError(str(e)) from e
-            if isinstance(extract_value, list) and index is not None:
-                try:
-                    index_int = int(index)
-                    if index_int < len(extract_value):
-                        return extract_value[index_int]
-                    raise ValueError(
-                        f"【{operation_type}】数组越界, "
-                        f"给定索引[{index_int}]不可大于数组长度[{len(extract_value)}]"
-                    )
-                except (ValueError, TypeError) as e:
-                    raise ValueError(f"【{operation_type}】参数[index]必须是数字类型, 错误描述: {e}") from e
-            return extract_value
-
-        if src == "response xml":
-            if not response_text:
-                raise ValueError(f"【{operation_type}】响应内容不是有效的XML数据")
-            if range_type == "all":
-                return response_text
-            if not expr:
-                raise ValueError(f"【{operation_type}】模式[SOME]下参数[expr]是必须的, 并且需要是有效的XPath表达式")
-            try:
-                response_xml = ET.fromstring(response_text)
-                elements = response_xml.findall(expr)
-                if not elements:
-                    raise ValueError(f"【{operation_type}】XPath表达式[{expr}]未匹配到元素")
-                if index is not None:
-                    try:
-                        index_int = int(index)
-                        if index_int < len(elements):
-                            element = elements[index_int]
-                            return element.text if element.text else ET.tostring(element, encoding="unicode")
-                        raise ValueError(
-                            f"【{operation_type}】数组越界, "
-                            f"给定索引[{index_int}]不可大于数组长度[{len(elements)}]"
-                        )
-                    except (ValueError, TypeError) as e:
-                        raise ValueError(f"【{operation_type}】参数[index]必须是数字类型, 错误描述: {e}") from e
-                element = elements[-1]
-                return element.text if element.text else ET.tostring(element, encoding="unicode")
-            except ET.ParseError as e:
-                raise ValueError(f"【{operation_type}】响应内容不是有效的XML格式, 错误描述: {e}") from e
-            except ValueError:
-                raise
-            except Exception as e:
-                raise ValueError(f"【{operation_type}】XPath表达式[{expr}]执行失败, 错误: {e}") from e
-
-        if src == "response text":
-            if not response_text:
-                raise ValueError(f"【{operation_type}】响应内容不是有效的Text数据")
-            if range_type == "all":
-                return response_text
-            if not expr:
-                raise ValueError(f"【{operation_type}】模式[SOME]下参数[expr]是必须的, 并且需要是有效的正则表达式")
-            try:
-                match = re.search(expr, response_text)
-                if match:
-                    return match.group(0)
-                raise ValueError(f"【{operation_type}】正则表达式[{expr}]未匹配到内容")
-            except re.error as e:
-                raise ValueError(f"【{operation_type}】正则表达式执行失败, 错误描述: {e}") from e
-
-        if src in ("response header", "response headers"):
-            if not response_headers:
-                raise ValueError(f"【{operation_type}】响应 Headers 为空")
-            if range_type == "all":
-                return response_headers
-            if not expr:
-                raise ValueError(f"【{operation_type}】模式[SOME]下参数[expr]是必须的, 并且需要是有效JSONPath表达式")
-            try:
-                return AutoTestToolServiceImpl.resolve_json_path(data=response_headers, expr=expr)
-            except Exception as e:
-                raise ValueError(str(e) or f"【{operation_type}】响应 Headers JSONPath匹配失败: {expr}") from e
-
-        if src in ("response cookie", "response cookies"):
-            if not response_cookies:
-                raise ValueError(f"【{operation_type}】响应 Cookies 为空")
-            if range_type == "all":
-                return response_cookies
-            if not expr:
-                raise ValueError(f"【{operation_type}】模式[SOME]下参数[expr]是必须的, 并且需要是有效JSONPath表达式")
-            try:
-                return AutoTestToolServiceImpl.resolve_json_path(data=response_cookies, expr=expr)
-            except Exception as e:
-                raise ValueError(str(e) or f"【{operation_type}】响应 Cookies JSONPath匹配失败: {expr}") from e
-
-        if src == "session_variables" or src == "变量池":
-            if not expr:
-                raise ValueError(f"【{operation_type}】模式[SOME]下参数[expr]是必须的, 并且需要是有效JSONPath表达式")
-            if session_variables_lookup is None:
-                raise ValueError(f"【{operation_type}】变量池未提供")
-            if not isinstance(session_variables_lookup, dict):
-                raise ValueError(
-                    f"【{operation_type}】变量池类型不被支持: {type(session_variables_lookup)}; "
-                    f"仅支持 Dict[str, Any] 并使用 JSONPath 取值"
-                )
+    @classmethod
+    def prepare_response_artifacts(
+            cls,
+            configs: List[Any],
+            response_text: Optional[str],
+            response_headers: Optional[Dict[str, Any]],
+            response_json: Optional[Union[list, dict]] = None,
+            response_cookies: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Optional[Any], Optional[Dict[str, Any]], Dict[str, str]]:
+        """
+        在提取/断言循环外一次性准备响应派生数据, 循环内各配置项共用, 避免按配置项重复解析
+
+        :param configs: 提取或断言配置列表(仅用于判断是否存在 response xml 来源)
+        :param response_text: 响应正文
+        :param response_headers: 响应头
+        :param response_json: 响应 JSON
+        :param response_cookies: 响应 Cookie
+        :return: (XML 根元素, 键名小写的响应头, 不可用数据源 -> 错误描述);
+                 无 XML 来源或解析失败时 XML 根元素为 None, 由 extract_from_source 按配置项重新解析并给出错误信息;
+                 不可用数据源的配置项无需调用 extract_from_source, 直接按错误描述记为失败
+        """
+        response_xml = None
+        if response_text and any(
+                isinstance(c, dict) and isinstance(c.get("source"), str) and _normalize_config_key(c["source"]) == "response xml"
+                for c in configs
+        ):
             try:
-                return AutoTestToolServiceImpl.resolve_json_path(data=session_variables_lookup, expr=expr)
-            except Exception as e:
-                raise ValueError(str(e) or f"【{operation_type}】变量池 JSONPath匹配失败: {expr}") from e
+                response_xml = _parse_response_xml(response_text)
+            except etree.ParseError:
+                response_xml = None
+        if response_headers:
+            response_headers = {str(k).lower(): v for k, v in response_headers.items()}
+        unavailable = {
+            "response json": response_json is None,
+            "response xml": not response_text,
+            "response text": not response_text,
+            "response headers": not response_headers,
+            "response header": not response_headers,
+            "response cookies": not response_cookies,
+            "response cookie": not response_cookies,
+        }
+        unavailable_sources: Dict[str, str] = {
+            src: _SOURCE_UNAVAILABLE_MESSAGES[_EXTRACT_SOURCE_CANONICAL.get(src, src)]
+            for src, is_unavailable in unavailable.items() if is_unavailable
+        }
+        return response_xml, response_headers, unavailable_sources
+
+    @staticmethod
+    def _iter_valid_configs(
+            configs: Any,
+            *,
+            operation_type: str,
+            list_name: str,
+            required: Tuple[str, ...],
+            required_hint: str,
+            log_callback: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        变量提取与断言验证共用的配置校验：列表类型、子项类型与必填字段不满足时记录日志并跳过
 
-        raise ValueError(f"【{operation_type}】数据源源类型 {source} 不被支持")
+        :param configs: 配置列表
+        :param operation_type: 日志前缀, 如 "变量提取"、"断言验证"
+        :param list_name: 配置列表的参数名, 用于日志
+        :param required: 子项必填字段
+        :param required_hint: 必填字段缺失时日志中的补充说明
+        :param log_callback: 可选日志回调
+        :return: 逐个产出有效的配置子项
+        """
+        if not isinstance(configs, list):
+            if log_callback:
+                log_callback(
+                    f"【{operation_type}】表达式列表解析失败: "
+                    f"参数[{list_name}]必须是[List[Dict[str, Any]]]类型, "
+                    f"但得到[{type(configs)}]类型"
+                )
+            return
+        for config in configs:
+            if not isinstance(config, dict):
+                if log_callback:
+                    log_callback(
+                        f"【{operation_type}】表达式子项解析无效(跳过): "
+                        f"参数[{list_name}]的子项必须是[Dict[str, Any]]类型, "
+                        f"但得到[{type(config)}]类型: {config}"
+                    )
+                continue
+            if not all(config.get(field) for field in required):
+                if log_callback:
+                    log_callback(
+                        f"【{operation_type}】表达式子项解析无效(跳过): "
+                        f"参数[{', '.join(required)}]是必须的, {required_hint}"
+                    )
+                continue
+            yield config
 
     @classmethod
     def run_extract_variables(
@@ -502,57 +723,61 @@ class AutoTestToolService:
         extract_results_list: List[Dict[str, Any]] = []
         if not extract_variables:
             return extract_results_dict, extract_results_list
-        if not isinstance(extract_variables, list):
-            if log_callback:
-                log_callback(
-                    f"【变量提取】表达式列表解析失败: "
-                    f"参数[extract_variables]必须是[List[Dict[str, Any]]]类型, "
-                    f"但得到[{type(extract_variables)}]类型"
-                )
-            return extract_results_dict, extract_results_list
-        for ext_config in extract_variables:
-            if not isinstance(ext_config, dict):
-                if log_callback:
-                    log_callback(
-                        f"【变量提取】表达式子项解析无效(跳过): "
-                        f"参数[extract_variables]的子项必须是[Dict[str, Any]]类型, "
-                        f"但得到[{type(ext_config)}]类型: {ext_config}"
-                    )
-                continue
-            name = ext_config.get("name")
-            expr = ext_config.get("expr")
-            source = ext_config.get("source")
+        response_xml, unavailable_sources = None, {}
+        # 同一次循环内相同取值配置的结果缓存: 去重键 -> (取值, 错误描述)
+        lookup_cache: Dict[tuple, Tuple[Any, str]] = {}
+        if isinstance(extract_variables, list):
+            response_xml, response_headers, unavailable_sources = cls.prepare_response_artifacts(
+                extract_variables, response_text, response_headers, response_json, response_cookies
+            )
+        for ext_config in cls._iter_valid_configs(
+                extract_variables,
+                operation_type="变量提取",
+                list_name="extract_variables",
+                required=("name", "expr", "source"),
+                required_hint="如需继续提取可添加[range, index]参数",
+                log_callback=log_callback,
+        ):
+            name = ext_config["name"]
+            expr = ext_config["expr"]
+            source = ext_config["source"]
             range_type = ext_config.get("range")
             index = ext_config.get("index")
-            if not name or not expr or not source:
-                if log_callback:
-                    log_callback(
-                        f"【变量提取】表达式子项解析无效(跳过): "
-                        f"参数[name, expr, source]是必须的, 如需继续提取可添加[range, index]参数"
-                    )
-                continue
             error_msg = ""
             extract_value = None
-            try:
-                extract_value = cls.extract_from_source(
-                    source=source,
-                    expr=expr,
-                    range_type=range_type,
-                    index=index,
-                    response_text=response_text,
-                    response_json=response_json,
-                    response_headers=response_headers,
-                    response_cookies=response_cookies,
-                    session_variables_lookup=session_variables_lookup,
-                    operation_type="变量提取",
-                )
-                if log_callback:
-                    log_callback(f"【变量提取】成功: {name}  <==>  {extract_value}")
-            except Exception as e:
-                error_msg = str(e)
-                if log_callback:
+            cache_key = _lookup_cache_key(source, expr, range_type, index)
+            unavailable_message = unavailable_sources.get(_normalize_config_key(source)) if isinstance(source, str) else None
+            if cache_key is not None and cache_key in lookup_cache:
+                extract_value, error_msg = lookup_cache[cache_key]
+            elif unavailable_message:
+                error_msg = f"【变量提取】{unavailable_message}"
+            else:
+                try:
+                    extract_value = cls.extract_from_source(
+                        source=source,
+                        expr=expr,
+                        range_type=range_type,
+                        index=index,
+                        response_text=response_text,
+                        response_json=response_json,
+                        response_headers=response_headers,
+                        response_cookies=response_cookies,
+                        session_variables_lookup=session_variables_lookup,
+                        operation_type="变量提取",
+                        response_xml=response_xml,
+                    )
+                except Exception as e:
+                    error_msg = str(e)
+                if cache_key is not None:
+                    lookup_cache[cache_key] = (extract_value, error_msg)
+            if log_callback:
+                if error_msg:
                     log_callback(f"【变量提取】失败: {name}, {error_msg}")
-            item = {
+                else:
+                    log_callback(f"【变量提取】成功: {name}  <==>  {_brief_log_value(extract_value)}")
+            success = not error_msg
+            # 结果需保持普通 dict: 步骤引擎直接写入明细并序列化入库, 调试接口原样返回
+            extract_results_list.append({
                 "name": name,
                 "source": source,
                 "range": range_type,
@@ -560,10 +785,9 @@ class AutoTestToolService:
                 "index": index,
                 "extract_value": extract_value,
                 "error": error_msg,
-                "success": error_msg == "",
-            }
-            extract_results_list.append(item)
-            if error_msg == "":
+                "success": success,
+            })
+            if success:
                 extract_results_dict[name] = extract_value
         return extract_results_dict, extract_results_list
 
@@ -594,84 +818,77 @@ class AutoTestToolService:
         validator_results: List[Dict[str, Any]] = []
         if not assert_validators:
             return validator_results
-        if not isinstance(assert_validators, list):
-            if log_callback:
-                log_callback(
-                    f"【断言验证】表达式列表解析失败: 参数[assert_validators]必须是[List[Dict[str, Any]]]类型, "
-                    f"但得到[{type(assert_validators)}]类型"
-                )
-            return validator_results
-        for validator_config in assert_validators:
-            if not isinstance(validator_config, dict):
-                if log_callback:
-                    log_callback(
-                        f"【断言验证】表达式子项解析无效(跳过): "
-                        f"参数[assert_validators]的子项必须是[Dict[str, Any]]类型, "
-                        f"但得到[{type(validator_config)}]类型: {validator_config}"
-                    )
-                continue
-            name = validator_config.get("name")
-            expr = validator_config.get("expr")
-            operation = validator_config.get("operation")
+        response_xml, unavailable_sources = None, {}
+        # 同一次循环内相同取值配置的结果缓存: 去重键 -> (取值, 错误描述)
+        lookup_cache: Dict[tuple, Tuple[Any, str]] = {}
+        if isinstance(assert_validators, list):
+            response_xml, response_headers, unavailable_sources = cls.prepare_response_artifacts(
+                assert_validators, response_text, response_headers, response_json, response_cookies
+            )
+        for validator_config in cls._iter_valid_configs(
+                assert_validators,
+                operation_type="断言验证",
+                list_name="assert_validators",
+                required=("name", "expr", "operation", "source"),
+                required_hint="非空断言时需添加[except_value]参数",
+                log_callback=log_callback,
+        ):
+            name = validator_config["name"]
+            expr = validator_config["expr"]
+            operation = validator_config["operation"]
             except_value = validator_config.get("except_value")
-            source = validator_config.get("source")
-            if not name or not expr or not operation or not source:
-                if log_callback:
-                    log_callback(
-                        f"【断言验证】表达式子项解析无效(跳过): "
-                        f"参数[name, expr, operation, source]是必须的, 非空断言时需添加[except_value]参数"
-                    )
-                continue
+            source = validator_config["source"]
             error_msg = ""
             success = False
             actual_value = None
-            try:
-                actual_value = cls.extract_from_source(
-                    source=source,
-                    expr=expr,
-                    range_type="SOME",
-                    index=None,
-                    response_text=response_text,
-                    response_json=response_json,
-                    response_headers=response_headers,
-                    response_cookies=response_cookies,
-                    session_variables_lookup=session_variables_lookup,
-                    operation_type="断言验证",
-                )
-            except Exception as e:
-                error_msg = str(e)
-                if log_callback:
-                    log_callback(f"【断言验证】比较失败: {name}, {error_msg}")
-                validator_results.append({
-                    "name": name,
-                    "source": source,
-                    "expr": expr,
-                    "operation": operation,
-                    "except_value": except_value,
-                    "actual_value": actual_value,
-                    "success": False,
-                    "error": error_msg,
-                })
-                continue
-            try:
-                success = cls.compare_assertion(actual=actual_value, operation=operation, expected=except_value)
-                if log_callback:
-                    expr_message: str = (
-                        f"\n\t数据源: [{source}], \n"
-                        f"\t表达式: [{expr}], \n"
-                        f"\t实际值: [{actual_value}], \n"
-                        f"\t操作符: [{operation}], \n"
-                        f"\t预期值: [{except_value}]\n\n"
+            cache_key = _lookup_cache_key(source, expr)
+            unavailable_message = unavailable_sources.get(_normalize_config_key(source)) if isinstance(source, str) else None
+            if cache_key is not None and cache_key in lookup_cache:
+                actual_value, error_msg = lookup_cache[cache_key]
+            elif unavailable_message:
+                error_msg = f"【断言验证】{unavailable_message}"
+            else:
+                try:
+                    actual_value = cls.extract_from_source(
+                        source=source,
+                        expr=expr,
+                        range_type="SOME",
+                        index=None,
+                        response_text=response_text,
+                        response_json=response_json,
+                        response_headers=response_headers,
+                        response_cookies=response_cookies,
+                        session_variables_lookup=session_variables_lookup,
+                        operation_type="断言验证",
+                        response_xml=response_xml,
                     )
-                    if success:
-                        log_callback(f"【断言验证】比较成功: {expr_message}")
-                    else:
-                        log_callback(f"【断言验证】比较失败: {expr_message}")
-            except Exception as e:
-                error_msg = str(e)
-                success = False
+                except Exception as e:
+                    error_msg = str(e)
+                if cache_key is not None:
+                    lookup_cache[cache_key] = (actual_value, error_msg)
+            if error_msg:
                 if log_callback:
-                    log_callback(f"【断言验证】比较异常, 错误描述: {e}: {name}, {error_msg}")
+                    log_callback(f"【断言验证】比较失败: {name}, {error_msg}")
+            else:
+                try:
+                    success = cls.compare_assertion(actual=actual_value, operation=operation, expected=except_value)
+                    if log_callback:
+                        expr_message: str = (
+                            f"\n\t数据源: [{source}], \n"
+                            f"\t表达式: [{expr}], \n"
+                            f"\t实际值: [{_brief_log_value(actual_value)}], \n"
+                            f"\t操作符: [{operation}], \n"
+                            f"\t预期值: [{except_value}]\n\n"
+                        )
+                        if success:
+                            log_callback(f"【断言验证】比较成功: {expr_message}")
+                        else:
+                            log_callback(f"【断言验证】比较失败: {expr_message}")
+                except Exception as e:
+                    error_msg = str(e)
+                    success = False
+                    if log_callback:
+                        log_callback(f"【断言验证】比较异常, 错误描述: {e}: {name}, {error_msg}")
             validator_results.append({
                 "name": name,
                 "source": source,
@@ -748,15 +965,17 @@ class AutoTestToolService:
                 path.append(step_code)
 
             # 检查步骤类型是否允许有子步骤
-            if step.children and len(step.children) > 0:
-                if step.step_type not in allowed_children_types:
+            children = step.children
+            if children:
+                step_type = step.step_type
+                if step_type not in allowed_children_types:
                     return False, (
                         f"步骤(step_id={step_id}, step_code={step_code or 'N/A'}, "
-                        f"step_type={step.step_type})不允许包含子步骤, 仅允许'循环结构'和'条件分支'类型的步骤包含子步骤"
+                        f"step_type={step_type})不允许包含子步骤, 仅允许'循环结构'和'条件分支'类型的步骤包含子步骤"
                     )
 
                 # 递归检查子步骤
-                for child in step.children:
+                for child in children:
                     child_is_valid, child_error_msg = check_step_recursive(child, visited_ids.copy(), path.copy())
                     if not child_is_valid:
                         return False, child_error_msg
@@ -783,9 +1002,8 @@ class AutoTestToolService:
 
         # 处理conditions：如果是数组, 取第一个并转为JSON字符串
         conditions = step.get("conditions")
-        if isinstance(conditions, list) and len(conditions) > 0:
-            condition_obj = conditions[0]
-            step["conditions"] = json.dumps(condition_obj, ensure_ascii=False)
+        if isinstance(conditions, list) and conditions:
+            step["conditions"] = json.dumps(conditions[0], ensure_ascii=False)
         elif conditions is None:
             step["conditions"] = None
 
@@ -794,11 +1012,13 @@ class AutoTestToolService:
         step.pop("case", None)
         step.pop("quote_case", None)
 
-        # 递归处理children和quote_steps
-        if "children" in step and isinstance(step["children"], list):
-            step["children"] = [cls.normalize_step(child) for child in step["children"]]
-        if "quote_steps" in step and isinstance(step["quote_steps"], list):
-            step["quote_steps"] = [cls.normalize_step(quote_step) for quote_step in step["quote_steps"]]
+        # 递归处理children和quote_steps(每个键只取一次值, 避免 in + 下标的重复查找)
+        children = step.get("children")
+        if isinstance(children, list):
+            step["children"] = [cls.normalize_step(child) for child in children]
+        quote_steps = step.get("quote_steps")
+        if isinstance(quote_steps, list):
+            step["quote_steps"] = [cls.normalize_step(quote_step) for quote_step in quote_steps]
 
         return step
 
@@ -810,19 +1030,30 @@ class AutoTestToolService:
         :param steps_list: 步骤列表, 每项可含 children、quote_steps
         :return: 合并后的变量列表
         """
-        variables = []
-        if not steps_list:
-            return variables
+        variables: List[Dict[str, Any]] = []
+        if steps_list:
+            cls._collect_session_variables(steps_list, variables)
+        return variables
+
+    @classmethod
+    def _collect_session_variables(cls, steps_list: List[Dict[str, Any]], out: List[Dict[str, Any]]) -> None:
+        """
+        collect_session_variables 的递归实现：直接追加到调用方传入的累加列表, 避免每层递归新建并拷贝列表
+
+        :param steps_list: 步骤列表, 每项可含 children、quote_steps
+        :param out: 累加结果列表(原地修改)
+        """
         for step in steps_list:
             session_variables = step.get("session_variables")
             if isinstance(session_variables, list):
-                variables.extend(session_variables)
+                out.extend(session_variables)
             # 递归处理children和quote_steps
-            children = step.get("children", []) or []
-            quote_steps = step.get("quote_steps", []) or []
-            variables.extend(cls.collect_session_variables(children))
-            variables.extend(cls.collect_session_variables(quote_steps))
-        return variables
+            children = step.get("children")
+            if children:
+                cls._collect_session_variables(children, out)
+            quote_steps = step.get("quote_steps")
+            if quote_steps:
+                cls._collect_session_variables(quote_steps, out)
 
     @classmethod
     def execute_func_string(cls, session_variables: List[Dict[str, Any]]):
@@ -851,7 +1082,7 @@ class AutoTestToolService:
             finished_variables: Optional[Any] = None,
     ) -> Any:
         """
-        递归解析 str/dict/list 中的 ${...} 占位符(实现见 AutoTestToolServiceImpl)
+        解析 str/dict/list 中的 ${...} 占位符(实现见 AutoTestToolServiceImpl)
         :param value:
         :param logger_object:
         :param is_core_engine:
@@ -869,6 +1100,25 @@ class AutoTestToolService:
 class AutoTestToolServiceImpl:
     """实现层：占位符解析、断言比较、GenerateUtils 调用等内部逻辑, 仅供 AutoTestToolService 使用"""
 
+    # 断言操作符 -> 比较函数(类级常量, 避免每次断言重新构造映射与闭包)
+    _ASSERTION_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+        "等于": lambda a, b: AutoTestToolServiceImpl._type_aware_equals(a, b),
+        "不等于": lambda a, b: not AutoTestToolServiceImpl._type_aware_equals(a, b),
+        "大于": lambda a, b: AutoTestToolServiceImpl._type_aware_compare(a, b, operator.gt),
+        "大于等于": lambda a, b: AutoTestToolServiceImpl._type_aware_compare(a, b, operator.ge),
+        "小于": lambda a, b: AutoTestToolServiceImpl._type_aware_compare(a, b, operator.lt),
+        "小于等于": lambda a, b: AutoTestToolServiceImpl._type_aware_compare(a, b, operator.le),
+        "长度等于": lambda a, b: (
+            lambda nb: len(str(a)) == int(nb) if nb is not None else False
+        )(AutoTestToolServiceImpl._normalize_value(b)),
+        "包含": lambda a, b: str(b) in str(a),
+        "不包含": lambda a, b: str(b) not in str(a),
+        "以...开始": lambda a, b: str(a).startswith(str(b)),
+        "以...结束": lambda a, b: str(a).endswith(str(b)),
+        "非空": lambda a, _: a is not None and a != "",
+        "为空": lambda a, _: a is None or a == "",
+    }
+
     @classmethod
     def key_value_list_to_dict(cls, items: List[Dict[str, Any]], *, skip_if_no_value: bool = False) -> Dict[str, Any]:
         """
@@ -920,7 +1170,7 @@ class AutoTestToolServiceImpl:
     @classmethod
     def _type_aware_equals(cls, actual: Any, expected: Any) -> bool:
         """
-        类型感知的相等比较：先直接比较, 若不等则对两值做 _normalize_value 后再比较
+        类型感知的相等比较：先直接比较, 若不等且并非同类型的非字符串值, 则对两值做 _normalize_value 后再比较
 
         :param actual: 实际值
         :param expected: 期望值
@@ -929,6 +1179,9 @@ class AutoTestToolServiceImpl:
         # 直接比较
         if actual == expected:
             return True
+        # 同类型非字符串值直接比较的结果即为最终结果, 标准化不会改变它们
+        if type(actual) is type(expected) and not isinstance(actual, str):
+            return False
         # 标准化后比较
         norm_actual = cls._normalize_value(actual)
         norm_expected = cls._normalize_value(expected)
@@ -963,22 +1216,7 @@ class AutoTestToolServiceImpl:
         :return: 断言是否通过
         :raises ValueError: 不支持的操作符或比较过程异常
         """
-        operator_symbol_mapping: Dict[str, Callable] = {
-            "等于": lambda a, b: cls._type_aware_equals(a, b),
-            "不等于": lambda a, b: not cls._type_aware_equals(a, b),
-            "大于": lambda a, b: cls._type_aware_compare(a, b, lambda x, y: x > y),
-            "大于等于": lambda a, b: cls._type_aware_compare(a, b, lambda x, y: x >= y),
-            "小于": lambda a, b: cls._type_aware_compare(a, b, lambda x, y: x < y),
-            "小于等于": lambda a, b: cls._type_aware_compare(a, b, lambda x, y: x <= y),
-            "长度等于": lambda a, b: (lambda nb: len(str(a)) == int(nb) if nb is not None else False)(cls._normalize_value(b)),
-            "包含": lambda a, b: str(b) in str(a),
-            "不包含": lambda a, b: str(b) not in str(a),
-            "以...开始": lambda a, b: str(a).startswith(str(b)),
-            "以...结束": lambda a, b: str(a).endswith(str(b)),
-            "非空": lambda a, _: a is not None and a != "",
-            "为空": lambda a, _: a is None or a == "",
-        }
-        comparator: Optional[Callable] = operator_symbol_mapping.get(operation)
+        comparator: Optional[Callable] = cls._ASSERTION_OPERATORS.get(operation)
         if comparator is None:
             raise ValueError(f"【断言表达式】操作符[{operation}]不被支持")
         try:
@@ -1004,8 +1242,19 @@ class AutoTestToolServiceImpl:
         if data is None:
             raise ValueError(f"【JSONPath表达式】数据源不允许为空")
 
+        # 简单字段路径按字典逐级取值, 任一层不是字典或键不存在时回退到完整 JSONPath(由其给出错误信息)
+        keys = _simple_json_path_keys(expr)
+        if keys is not None:
+            node = data
+            for key in keys:
+                if not isinstance(node, dict) or key not in node:
+                    break
+                node = node[key]
+            else:
+                return node
+
         try:
-            json_path_expr = jsonpath_parse(expr)
+            json_path_expr = _compile_json_path(expr)
         except Exception as e:
             raise ValueError(f"【JSONPath表达式】执行失败, {e}") from e
 
@@ -1549,20 +1798,20 @@ class AutoTestToolServiceImpl:
     @classmethod
     def resolve_placeholders(cls, value: Any, logger_object: Callable, is_core_engine: bool = False, finished_variables: Optional[Any] = None) -> Any:
         """
-        递归解析 str / dict / list 中的 ${...} 占位符
+        解析 str / dict / list 中的 ${...} 占位符(显式栈迭代遍历, 不受嵌套深度的递归限制)
 
         【字符串】
         - 单占位符：变量或 GenerateUtils 函数(花括号内同时含括号时按函数处理)
         - 多占位符：见类注释「实现步骤」；支持如 (${a}+10)*${b}/${c} 等(全部占位符解析成功且
           值均可视为数字时, 对合并后的表达式安全求值)
 
-        【字典】递归每个 value(key 不替换, 与历史行为一致)
+        【字典】解析每个 value(key 不替换, 与历史行为一致)
 
-        【列表】若元素为含 key/value 的变量项 dict, 只解析 value 字段；否则递归元素
+        【列表】若元素为含 key/value 的变量项 dict, 只解析 value 字段；否则解析元素
 
         【其它类型】原样返回
 
-        解析失败：对应占位符保留原文；外层异常时记录日志并返回原 value
+        解析失败：对应占位符保留原文；遍历异常时记录日志并返回原 value
 
         :param value: 待解析对象
         :param logger_object: 日志回调, 签名为 (str) -> None
@@ -1578,60 +1827,206 @@ class AutoTestToolServiceImpl:
                     is_core_engine=is_core_engine,
                     finished_variables=finished_variables
                 )
-
-            if isinstance(value, dict):
-                try:
-                    return {
-                        k: cls.resolve_placeholders(
-                            value=v,
-                            logger_object=logger_object,
-                            is_core_engine=is_core_engine,
-                            finished_variables=finished_variables
-                        )
-                        for k, v in value.items()
-                    }
-                except Exception as e:
-                    logger_object(
-                        f"【占位填充】解析字典中的占位符时发生异常, 键: {list(value.keys())}, "
-                        f"错误描述: {e}, \n"
-                        f"错误类型: {type(e).__name__}, \n"
-                        f"错误时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}, \n"
-                        f"错误回溯: {traceback.format_exc()}\n"
+            if not isinstance(value, (dict, list)):
+                return value
+
+            # 栈元素: (父容器, 键或下标, 原值), 解析结果写回父容器的新副本中
+            # 子节点逆序入栈, 保证出栈顺序与原始顺序一致(日志输出顺序与递归实现相同)
+            root: List[Any] = [value]
+            stack: List[Tuple[Any, Any, Any]] = [(root, 0, value)]
+            while stack:
+                parent, key, node = stack.pop()
+                if isinstance(node, str):
+                    # 不含占位符的字符串(绝大多数)已随容器拷贝保留原值, 无需进入解析流程
+                    if "${" not in node:
+                        continue
+                    parent[key] = cls._resolve_string_placeholders(
+                        content=node,
+                        logger_object=logger_object,
+                        is_core_engine=is_core_engine,
+                        finished_variables=finished_variables
                     )
-                    return value
-
-            if isinstance(value, list):
-                # 处理列表格式的变量(每个元素包含key、value、desc)
-                result = []
-                for item in value:
-                    if isinstance(item, dict) and "key" in item and "value" in item:
-                        # 列表格式的变量项, 只解析value字段
-                        resolved_item = dict(item)
-                        resolved_item["value"] = cls.resolve_placeholders(
-                            value=item.get("value"),
-                            logger_object=logger_object,
-                            is_core_engine=is_core_engine,
-                            finished_variables=finished_variables
-                        )
-                        result.append(resolved_item)
-                    else:
-                        # 普通列表项, 递归解析
-                        result.append(
-                            cls.resolve_placeholders(
-                                value=item,
-                                logger_object=logger_object,
-                                is_core_engine=is_core_engine,
-                                finished_variables=finished_variables
-                            )
-                        )
-                return result
-            return value
+                elif isinstance(node, dict):
+                    new_dict: Dict[str, Any] = dict(node)
+                    parent[key] = new_dict
+                    for k, v in reversed(list(node.items())):
+                        if isinstance(v, (str, dict, list)):
+                            stack.append((new_dict, k, v))
+                elif isinstance(node, list):
+                    new_list: List[Any] = list(node)
+                    parent[key] = new_list
+                    for index in range(len(node) - 1, -1, -1):
+                        item = node[index]
+                        if isinstance(item, dict) and "key" in item and "value" in item:
+                            # 列表格式的变量项(每个元素包含key、value、desc), 只解析value字段
+                            resolved_item = dict(item)
+                            new_list[index] = resolved_item
+                            stack.append((resolved_item, "value", item["value"]))
+                        elif isinstance(item, (str, dict, list)):
+                            stack.append((new_list, index, item))
+            return root[0]
         except Exception as e:
             logger_object(
-                f"【占位填充】解析列表中的占位符时发生异常, 保留原值, "
+                f"【占位填充】解析占位符时发生异常, 保留原值, "
                 f"错误描述: {e}, \n"
                 f"错误类型: {type(e).__name__}, \n"
                 f"错误时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}, \n"
                 f"错误回溯: {traceback.format_exc()}\n"
             )
             return value
+
+
+def _select_by_index(values: List[Any], index: Any, operation_type: str) -> Any:
+    """
+    按 index 从提取结果数组中取值, 先做类型判断再转换, 常见的整数/数字字符串下标不走异常分支
+
+    :param values: 提取结果数组
+    :param index: 下标(整数、整数值浮点数或数字字符串, 支持负数)
+    :param operation_type: 错误信息前缀
+    :return: 对应下标的值
+    :raises ValueError: 下标不是数字或数组越界时
+    """
+    if isinstance(index, int):
+        index_int = index
+    elif isinstance(index, float) and index.is_integer():
+        index_int = int(index)
+    elif isinstance(index, str) and (digits := index.strip())[digits.startswith("-"):].isdecimal():
+        index_int = int(digits)
+    else:
+        raise ValueError(f"【{operation_type}】参数[index]必须是数字类型, 但得到[{index}]")
+    if -len(values) <= index_int < len(values):
+        return values[index_int]
+    raise ValueError(
+        f"【{operation_type}】数组越界, "
+        f"给定索引[{index_int}]不可大于数组长度[{len(values)}]"
+    )
+
+
+def _extract_from_response_json(expr, range_type, index, operation_type, *, response_json, **_) -> Any:
+    """从响应 JSON 中按 JSONPath 提取, 结果为数组且给定 index 时取对应下标"""
+    if response_json is None:
+        raise ValueError(f"【{operation_type}】{_SOURCE_UNAVAILABLE_MESSAGES['response json']}")
+    if range_type == "all":
+        return response_json
+    if not expr:
+        raise ValueError(f"【{operation_type}】模式[SOME]下参数[expr]是必须的, 并且需要是有效的JSONPath表达式")
+    try:
+        extract_value = AutoTestToolServiceImpl.resolve_json_path(data=response_json, expr=expr)
+    except Exception as e:
+        raise ValueError(str(e)) from e
+    if isinstance(extract_value, list) and index is not None:
+        return _select_by_index(extract_value, index, operation_type)
+    return extract_value
+
+
+def _extract_from_response_xml(expr, range_type, index, operation_type, *, response_text, response_xml=None, **_) -> Any:
+    """从响应 XML 中按 XPath 提取, 给定 index 时取对应下标, 否则取最后一个匹配项"""
+    if not response_text:
+        raise ValueError(f"【{operation_type}】{_SOURCE_UNAVAILABLE_MESSAGES['response xml']}")
+    if range_type == "all":
+        return response_text
+    if not expr:
+        raise ValueError(f"【{operation_type}】模式[SOME]下参数[expr]是必须的, 并且需要是有效的XPath表达式")
+    try:
+        if response_xml is None:
+            response_xml = _parse_response_xml(response_text)
+        elements = _find_xml_nodes(response_xml, expr)
+        if not elements:
+            raise ValueError(f"【{operation_type}】XPath表达式[{expr}]未匹配到元素")
+        if index is not None:
+            return _xml_node_value(_select_by_index(elements, index, operation_type))
+        return _xml_node_value(elements[-1])
+    except etree.ParseError as e:
+        raise ValueError(f"【{operation_type}】响应内容不是有效的XML格式, 错误描述: {e}") from e
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"【{operation_type}】XPath表达式[{expr}]执行失败, 错误: {e}") from e
+
+
+def _extract_from_response_text(expr, range_type, index, operation_type, *, response_text, **_) -> Any:
+    """从响应正文中按正则提取首个匹配"""
+    if not response_text:
+        raise ValueError(f"【{operation_type}】{_SOURCE_UNAVAILABLE_MESSAGES['response text']}")
+    if range_type == "all":
+        return response_text
+    if not expr:
+        raise ValueError(f"【{operation_type}】模式[SOME]下参数[expr]是必须的, 并且需要是有效的正则表达式")
+    try:
+        match = _compile_regex(expr).search(response_text)
+        if match:
+            return match.group(0)
+        raise ValueError(f"【{operation_type}】正则表达式[{expr}]未匹配到内容")
+    except re.error as e:
+        raise ValueError(f"【{operation_type}】正则表达式执行失败, 错误描述: {e}") from e
+
+
+def _extract_from_response_headers(expr, range_type, index, operation_type, *, response_headers, **_) -> Any:
+    """从响应头中提取, 单键表达式(忽略大小写)直接取值, 其余按 JSONPath 提取"""
+    if not response_headers:
+        raise ValueError(f"【{operation_type}】{_SOURCE_UNAVAILABLE_MESSAGES['response headers']}")
+    if range_type == "all":
+        return response_headers
+    if not expr:
+        raise ValueError(f"【{operation_type}】模式[SOME]下参数[expr]是必须的, 并且需要是有效JSONPath表达式")
+    value = _lookup_simple_key(response_headers, expr, ignore_case=True)
+    if value is not _MISSING:
+        return value
+    try:
+        return AutoTestToolServiceImpl.resolve_json_path(data=response_headers, expr=expr)
+    except Exception as e:
+        raise ValueError(str(e) or f"【{operation_type}】响应 Headers JSONPath匹配失败: {expr}") from e
+
+
+def _extract_from_response_cookies(expr, range_type, index, operation_type, *, response_cookies, **_) -> Any:
+    """从响应 Cookie 中提取, 单键表达式直接取值, 其余按 JSONPath 提取"""
+    if not response_cookies:
+        raise ValueError(f"【{operation_type}】{_SOURCE_UNAVAILABLE_MESSAGES['response cookies']}")
+    if range_type == "all":
+        return response_cookies
+    if not expr:
+        raise ValueError(f"【{operation_type}】模式[SOME]下参数[expr]是必须的, 并且需要是有效JSONPath表达式")
+    value = _lookup_simple_key(response_cookies, expr, ignore_case=False)
+    if value is not _MISSING:
+        return value
+    try:
+        return AutoTestToolServiceImpl.resolve_json_path(data=response_cookies, expr=expr)
+    except Exception as e:
+        raise ValueError(str(e) or f"【{operation_type}】响应 Cookies JSONPath匹配失败: {expr}") from e
+
+
+def _extract_from_session_variables(expr, range_type, index, operation_type, *, session_variables_lookup, **_) -> Any:
+    """从变量池中按 JSONPath 提取"""
+    if not expr:
+        raise ValueError(f"【{operation_type}】模式[SOME]下参数[expr]是必须的, 并且需要是有效JSONPath表达式")
+    if session_variables_lookup is None:
+        raise ValueError(f"【{operation_type}】变量池未提供")
+    if not isinstance(session_variables_lookup, dict):
+        raise ValueError(
+            f"【{operation_type}】变量池类型不被支持: {type(session_variables_lookup)}; "
+            f"仅支持 Dict[str, Any] 并使用 JSONPath 取值"
+        )
+    try:
+        return AutoTestToolServiceImpl.resolve_json_path(data=session_variables_lookup, expr=expr)
+    except Exception as e:
+        raise ValueError(str(e) or f"【{operation_type}】变量池 JSONPath匹配失败: {expr}") from e
+
+
+# 数据源类型别名 -> 规范名称
+_EXTRACT_SOURCE_CANONICAL: Dict[str, str] = {
+    "response header": "response headers",
+    "response cookie": "response cookies",
+}
+
+# 数据源类型(已去空白并小写) -> 提取函数, extract_from_source 按此表单次查表分发
+_EXTRACT_SOURCE_HANDLERS: Dict[str, Callable[..., Any]] = {
+    "response json": _extract_from_response_json,
+    "response xml": _extract_from_response_xml,
+    "response text": _extract_from_response_text,
+    "response header": _extract_from_response_headers,
+    "response headers": _extract_from_response_headers,
+    "response cookie": _extract_from_response_cookies,
+    "response cookies": _extract_from_response_cookies,
+    "session_variables": _extract_from_session_variables,
+    "变量池": _extract_from_session_variables,
+}
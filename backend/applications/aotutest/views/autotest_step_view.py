@@ -7,15 +7,20 @@
 @DateTime: 2025/4/28
 """
 
+import asyncio
 import json
+import re
 import time
 import traceback
 import uuid
+from collections import defaultdict
+from itertools import chain
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Set, Union
+from typing import List, Dict, Any, Optional, Set, Union, Tuple, Callable
 
 import httpx
-from fastapi import APIRouter, Body, Query
+import orjson
+from fastapi import APIRouter, Body, Query, Request
 from tortoise.expressions import Q
 from tortoise.transactions import in_transaction
 
@@ -37,9 +42,9 @@ from backend.applications.aotutest.services.autotest_case_crud import AUTOTEST_A
 from backend.applications.aotutest.services.autotest_detail_crud import AUTOTEST_API_DETAIL_CRUD
 from backend.applications.aotutest.services.autotest_report_crud import AUTOTEST_API_REPORT_CRUD
 from backend.applications.aotutest.services.autotest_step_crud import AUTOTEST_API_STEP_CRUD
-from backend.applications.aotutest.services.autotest_step_engine import AutoTestStepExecutionEngine
+from backend.applications.aotutest.services.autotest_step_engine import AutoTestStepExecutionEngine, StepExecutionResult
 from backend.applications.aotutest.services.autotest_tool_service import AutoTestToolService
-from backend.common import AioTcpClient, TcpFrameMode, AsyncTcpUtils
+from backend.common import AioTcpClient, TcpFrameMode, AsyncTcpUtils, sync_to_async
 from backend.configure import LOGGER
 from backend.core.exceptions import (
     NotFoundException,
@@ -52,6 +57,7 @@ from backend.core.exceptions import (
 from backend.core.responses import (
     BadReqResponse,
     SuccessResponse,
+    SuccessStreamResponse,
     FailureResponse,
     NotFoundResponse,
     ParameterResponse,
@@ -62,6 +68,134 @@ from backend.enums import AutoTestReportType, AutoTestReqArgsType, AutoTestStepT
 
 autotest_step = APIRouter()
 
+# 步骤实例 to_dict 时统一排除/重命名的字段(模块级常量, 避免每次请求重复构造)
+_STEP_EXCLUDE_FIELDS = frozenset({
+    "state",
+    "created_user", "updated_user",
+    "created_time", "updated_time",
+    "reserve_1", "reserve_2", "reserve_3"
+})
+_STEP_REPLACE_FIELDS = {"id": "step_id"}
+_STEP_FIELD_ALIASES = {v: k for k, v in _STEP_REPLACE_FIELDS.items()}
+
+# 请求地址协议头校验(忽略大小写), 仅匹配前缀, 避免对整段URL做 lower() 拷贝
+_HTTP_SCHEME_RE = re.compile(r"^https?://", re.IGNORECASE)
+
+# 调试日志时间戳缓存: [秒级时间戳, 已格式化字符串], 同一秒内的日志复用同一个字符串
+_LOG_TIMESTAMP_CACHE: List[Any] = [0, ""]
+
+
+def _log_timestamp() -> str:
+    """返回当前时间的 "%Y-%m-%d %H:%M:%S" 字符串, 仅在跨秒时重新格式化"""
+    second = int(time.time())
+    if _LOG_TIMESTAMP_CACHE[0] != second:
+        _LOG_TIMESTAMP_CACHE[1] = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+        _LOG_TIMESTAMP_CACHE[0] = second
+    return _LOG_TIMESTAMP_CACHE[1]
+
+
+def _merge_debug_variables(
+        defined_variables: List[Dict[str, Any]],
+        session_variables: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    单次遍历合并调试用的变量池: key -> 变量项, 同名时 session_variables 覆盖 defined_variables
+    结果需为真实 dict(提取/断言中按 isinstance(dict) 校验并用 JSONPath 取值), 因此不使用 ChainMap
+    """
+    return {
+        item["key"]: item
+        for item in chain(defined_variables, session_variables)
+        if isinstance(item, dict) and item.get("key")
+    }
+
+
+async def _run_debug_extract_and_assert(
+        extract_variables: List[Dict[str, Any]],
+        assert_validators: List[Dict[str, Any]],
+        log_callback: Callable[[str], None],
+        **response_kwargs: Any,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    调试接口的变量提取与断言验证, 存在配置时整体放到线程中执行, 大响应的 JSONPath/XPath/正则计算不阻塞事件循环
+    提取与断言在同一线程内顺序执行, 日志顺序与原先一致
+
+    :param extract_variables: 变量提取配置列表
+    :param assert_validators: 断言配置列表
+    :param log_callback: 日志回调
+    :param response_kwargs: 透传给 run_extract_variables/run_assert_validators 的响应数据与变量池
+    :return: (变量提取结果列表, 断言结果列表)
+    """
+
+    def run_checks() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        _, extract_results = AutoTestToolService.run_extract_variables(
+            extract_variables=extract_variables,
+            log_callback=log_callback,
+            **response_kwargs,
+        )
+        validator_results = AutoTestToolService.run_assert_validators(
+            assert_validators=assert_validators,
+            log_callback=log_callback,
+            **response_kwargs,
+        )
+        return extract_results, validator_results
+
+    if not extract_variables and not assert_validators:
+        return [], []
+    return await sync_to_async(run_checks)
+
+
+# HTTP 调试请求体构建函数, 入参统一为 (request_text, request_body, form_data, form_files, urlencoded),
+# 返回 (data_payload, json_payload, file_payload)
+_PayloadTuple = Tuple[Optional[Any], Optional[Any], Optional[Any]]
+
+
+def _build_auto_payload(request_text, request_body, form_data, form_files, urlencoded) -> _PayloadTuple:
+    """未配置参数类型时保持兼容：优先 raw -> form-data -> urlencoded 作为 data，若有 request_body 则作为 json"""
+    data_payload: Optional[Any] = None
+    json_payload: Optional[Any] = None
+    file_payload: Optional[Any] = None
+    if request_text:
+        data_payload = request_text
+    elif form_data or form_files:
+        data_payload = form_data
+        file_payload = form_files if form_files else None
+    elif urlencoded:
+        data_payload = urlencoded
+    if request_body and not data_payload:
+        json_payload = request_body
+    return data_payload, json_payload, file_payload
+
+
+def _build_empty_payload(request_text, request_body, form_data, form_files, urlencoded) -> _PayloadTuple:
+    """无请求体或仅查询参数"""
+    return None, None, None
+
+
+def _build_raw_payload(request_text, request_body, form_data, form_files, urlencoded) -> _PayloadTuple:
+    return request_text, None, None
+
+
+def _build_json_payload(request_text, request_body, form_data, form_files, urlencoded) -> _PayloadTuple:
+    return None, request_body, None
+
+
+def _build_form_data_payload(request_text, request_body, form_data, form_files, urlencoded) -> _PayloadTuple:
+    return form_data, None, form_files if form_files else None
+
+
+def _build_urlencoded_payload(request_text, request_body, form_data, form_files, urlencoded) -> _PayloadTuple:
+    return urlencoded, None, None
+
+
+_REQ_ARGS_PAYLOAD_BUILDERS: Dict[Optional[AutoTestReqArgsType], Callable[..., _PayloadTuple]] = {
+    AutoTestReqArgsType.NONE: _build_empty_payload,
+    AutoTestReqArgsType.PARAMS: _build_empty_payload,
+    AutoTestReqArgsType.RAW: _build_raw_payload,
+    AutoTestReqArgsType.JSON: _build_json_payload,
+    AutoTestReqArgsType.FORM_DATA: _build_form_data_payload,
+    AutoTestReqArgsType.X_WWW_FORM_URLENCODED: _build_urlencoded_payload,
+}
+
 
 @autotest_step.post("/create", summary="API自动化测试-新增步骤")
 async def create_step(
@@ -70,22 +204,17 @@ async def create_step(
     try:
         instance = await AUTOTEST_API_STEP_CRUD.create_step(step_in)
         data = await instance.to_dict(
-            exclude_fields={
-                "state",
-                "created_user", "updated_user",
-                "created_time", "updated_time",
-                "reserve_1", "reserve_2", "reserve_3"
-            },
-            replace_fields={"id": "step_id"}
+            exclude_fields=_STEP_EXCLUDE_FIELDS,
+            replace_fields=_STEP_REPLACE_FIELDS
         )
-        LOGGER.info(f"新增步骤成功, 结果明细: {data}")
+        LOGGER.info("新增步骤成功, 结果明细: {}", data)
         return SuccessResponse(message="新增成功", data=data, total=1)
     except (NotFoundException, ParameterException) as e:
         return ParameterResponse(message=str(e.message))
     except (DataAlreadyExistsException, DataBaseStorageException) as e:
         return DataBaseStorageResponse(message=str(e.message))
     except Exception as e:
-        LOGGER.error(f"新增步骤失败，异常描述: {e}\n{traceback.format_exc()}")
+        LOGGER.exception(f"新增步骤失败，异常描述: {e}")
         return FailureResponse(message=f"新增失败, 异常描述: {e}")
 
 
@@ -97,22 +226,17 @@ async def delete_step(
     try:
         instance = await AUTOTEST_API_STEP_CRUD.delete_step(step_id=step_id, step_code=step_code)
         data = await instance.to_dict(
-            exclude_fields={
-                "state",
-                "created_user", "updated_user",
-                "created_time", "updated_time",
-                "reserve_1", "reserve_2", "reserve_3"
-            },
-            replace_fields={"id": "step_id"}
+            exclude_fields=_STEP_EXCLUDE_FIELDS,
+            replace_fields=_STEP_REPLACE_FIELDS
         )
-        LOGGER.info(f"按id或code删除步骤成功, 结果明细: {data}")
+        LOGGER.info("按id或code删除步骤成功, 结果明细: {}", data)
         return SuccessResponse(message="删除成功", data=data, total=1)
     except (NotFoundException, ParameterException) as e:
         return ParameterResponse(message=str(e.message))
     except (DataAlreadyExistsException, DataBaseStorageException) as e:
         return DataBaseStorageResponse(message=str(e.message))
     except Exception as e:
-        LOGGER.error(f"按id或code删除步骤失败，异常描述: {e}\n{traceback.format_exc()}")
+        LOGGER.exception(f"按id或code删除步骤失败，异常描述: {e}")
         return FailureResponse(message=f"删除失败，异常描述: {str(e)}")
 
 
@@ -123,22 +247,17 @@ async def update_step(
     try:
         instance = await AUTOTEST_API_STEP_CRUD.update_step(step_in)
         data = await instance.to_dict(
-            exclude_fields={
-                "state",
-                "created_user", "updated_user",
-                "created_time", "updated_time",
-                "reserve_1", "reserve_2", "reserve_3"
-            },
-            replace_fields={"id": "step_id"}
+            exclude_fields=_STEP_EXCLUDE_FIELDS,
+            replace_fields=_STEP_REPLACE_FIELDS
         )
-        LOGGER.info(f"按id或code更新步骤成功, 结果明细: {data}")
+        LOGGER.info("按id或code更新步骤成功, 结果明细: {}", data)
         return SuccessResponse(message="更新成功", data=data, total=1)
     except (NotFoundException, ParameterException) as e:
         return ParameterResponse(message=str(e.message))
     except (DataAlreadyExistsException, DataBaseStorageException) as e:
         return DataBaseStorageResponse(message=str(e.message))
     except Exception as e:
-        LOGGER.error(f"按id或code更新步骤失败，异常描述: {e}\n{traceback.format_exc()}")
+        LOGGER.exception(f"按id或code更新步骤失败，异常描述: {e}")
         return FailureResponse(message=f"修改失败，异常描述: {e}")
 
 
@@ -153,20 +272,15 @@ async def get_step(
         else:
             instance = await AUTOTEST_API_STEP_CRUD.get_by_code(step_code=step_code, on_error=True)
         data = await instance.to_dict(
-            exclude_fields={
-                "state",
-                "created_user", "updated_user",
-                "created_time", "updated_time",
-                "reserve_1", "reserve_2", "reserve_3"
-            },
-            replace_fields={"id": "step_id"}
+            exclude_fields=_STEP_EXCLUDE_FIELDS,
+            replace_fields=_STEP_REPLACE_FIELDS
         )
-        LOGGER.info(f"按id或code查询步骤成功, 结果明细: {data}")
+        LOGGER.info("按id或code查询步骤成功, 结果明细: {}", data)
         return SuccessResponse(message="查询成功", data=data, total=1)
     except (NotFoundException, ParameterException) as e:
         return ParameterResponse(message=str(e.message))
     except Exception as e:
-        LOGGER.error(f"按id或code查询步骤失败，异常描述: {e}\n{traceback.format_exc()}")
+        LOGGER.exception(f"按id或code查询步骤失败，异常描述: {e}")
         return FailureResponse(message=f"查询失败，异常描述: {str(e)}")
 
 
@@ -194,29 +308,36 @@ async def search_steps(
         if step_in.quote_case_id:
             q &= Q(quote_case_id=step_in.quote_case_id)
         q &= Q(state=step_in.state)
+        # 指定返回字段时走 values() 快速路径, 输出字段名与 to_dict 保持一致(id -> step_id)
+        value_fields: Dict[str, str] = {}
+        for field in step_in.fields or ():
+            model_field: str = _STEP_FIELD_ALIASES.get(field, field)
+            if model_field not in _STEP_EXCLUDE_FIELDS:
+                value_fields[_STEP_REPLACE_FIELDS.get(model_field, model_field)] = model_field
         total, instances = await AUTOTEST_API_STEP_CRUD.select_steps(
             search=q,
             page=step_in.page,
             page_size=step_in.page_size,
-            order=step_in.order
+            order=step_in.order,
+            fields=value_fields
         )
-        data = [
-            await obj.to_dict(
-                exclude_fields={
-                    "state",
-                    "created_user", "updated_user",
-                    "created_time", "updated_time",
-                    "reserve_1", "reserve_2", "reserve_3"
-                },
-                replace_fields={"id": "step_id"}
-            ) for obj in instances
-        ]
+        if value_fields:
+            data = instances
+        else:
+            # 并发执行所有 to_dict 操作（核心：用gather批量处理异步任务）
+            data = await asyncio.gather(*[
+                obj.to_dict(
+                    exclude_fields=_STEP_EXCLUDE_FIELDS,
+                    replace_fields=_STEP_REPLACE_FIELDS
+                )
+                for obj in instances
+            ])
         LOGGER.info(f"按条件查询步骤成功, 结果数量: {total}")
         return SuccessResponse(message="查询成功", data=data, total=total)
     except ParameterException as e:
         return ParameterResponse(message=str(e.message))
     except Exception as e:
-        LOGGER.error(f"按条件查询步骤失败，异常描述: {e}\n{traceback.format_exc()}")
+        LOGGER.exception(f"按条件查询步骤失败，异常描述: {e}")
         return FailureResponse(message=f"查询失败，异常描述: {str(e)}")
 
 
@@ -228,12 +349,12 @@ async def get_step_tree(
     try:
         tree_data = await AUTOTEST_API_STEP_CRUD.get_by_case_id(case_id=case_id, case_code=case_code)
         step_counter: Dict[str, Any] = tree_data.pop(-1)
-        LOGGER.info(f"按id或code查询步骤树成功, 结果明细: {step_counter}")
+        LOGGER.info("按id或code查询步骤树成功, 结果明细: {}", step_counter)
         return SuccessResponse(message="查询成功", data=tree_data, total=step_counter["total_steps"])
     except (NotFoundException, ParameterException) as e:
         return ParameterResponse(message=str(e.message))
     except Exception as e:
-        LOGGER.error(f"按id或code查询步骤树失败，异常描述: {e}\n{traceback.format_exc()}")
+        LOGGER.exception(f"按id或code查询步骤树失败，异常描述: {e}")
         return FailureResponse(message=f"查询失败，异常描述: {str(e)}")
 
 
@@ -258,7 +379,7 @@ async def copy_step_tree(
     except (NotFoundException, ParameterException) as e:
         return ParameterResponse(message=str(e.message))
     except Exception as e:
-        LOGGER.error(f"复制用例步骤树失败，异常描述: {e}\n{traceback.format_exc()}")
+        LOGGER.exception(f"复制用例步骤树失败，异常描述: {e}")
         return FailureResponse(message=f"复制失败，异常描述: {str(e)}")
 
 
@@ -309,10 +430,10 @@ async def batch_update_steps_tree(
                     updated_case_count: int = case_result['updated_count']
                     success_case_detail: List[Dict[str, Any]] = case_result['success_detail']
                     LOGGER.info(
-                        f"用例处理完成："
-                        f"新增用例: {created_case_count}个, "
-                        f"更新用例: {updated_case_count}个, "
-                        f"成功明细: {success_case_detail}"
+                        "用例处理完成：新增用例: {}个, 更新用例: {}个, 成功明细: {}",
+                        created_case_count,
+                        updated_case_count,
+                        success_case_detail,
                     )
 
                     # 获取处理成功的用例ID，用于关联步骤
@@ -339,18 +460,27 @@ async def batch_update_steps_tree(
                 success_step_detail: List[Dict[str, Any]] = step_result['success_detail']
                 # 2.3 删除多余步骤
                 if process_step_count:
+                    # 一次查询取回所有相关用例的现存步骤, 按 case_id 分组后计算多余步骤, 最后一次性软删除
+                    actual_step_rows = await AUTOTEST_API_STEP_CRUD.model.filter(
+                        case_id__in=list(process_step_count.keys()), state__not=1
+                    ).values_list("case_id", "step_code")
+                    actual_step_codes: Dict[int, Set[str]] = defaultdict(set)
+                    for row_case_id, row_step_code in actual_step_rows:
+                        actual_step_codes[row_case_id].add(row_step_code)
+                    all_missing_step_codes: Set[str] = set()
                     for case_id, step_codes in process_step_count.items():
-                        actual_step_codes = await AUTOTEST_API_STEP_CRUD.model.filter(
-                            case_id=case_id, state__not=1
-                        ).values_list("step_code", flat=True)
-                        missing_step_codes: set = set(actual_step_codes) - step_codes
+                        missing_step_codes: Set[str] = actual_step_codes.get(case_id, set()) - step_codes
                         if missing_step_codes:
-                            deleted_step_count += len(missing_step_codes)
+                            all_missing_step_codes |= missing_step_codes
                             LOGGER.warning(
                                 f"删除更新后多余步骤: "
                                 f"步骤(case_id={case_id}, step_code__in={list(missing_step_codes)})已被清理"
                             )
-                            await AUTOTEST_API_STEP_CRUD.model.filter(step_code__in=missing_step_codes).delete(state=1)
+                    if all_missing_step_codes:
+                        deleted_step_count = len(all_missing_step_codes)
+                        await AUTOTEST_API_STEP_CRUD.model.filter(
+                            step_code__in=list(all_missing_step_codes)
+                        ).update(state=1)
                 # 2.4 步骤全部删除：当 steps 为空且用例已存在时，软删除该用例下所有步骤
                 elif success_case_detail and len(success_case_detail) > 0:
                     successful_case_id: Optional[int] = success_case_detail[0].get("case_id")
@@ -363,11 +493,11 @@ async def batch_update_steps_tree(
                                 f"步骤已全部删除: 用例(case_id={successful_case_id})下 {deleted_step_count} 个步骤已被软删除"
                             )
                 LOGGER.info(
-                    f"步骤处理完成："
-                    f"新增步骤: {created_step_count}个, "
-                    f"更新步骤: {updated_step_count}个, "
-                    f"删除步骤: {deleted_step_count}个, "
-                    f"成功明细: {success_step_detail}"
+                    "步骤处理完成：新增步骤: {}个, 更新步骤: {}个, 删除步骤: {}个, 成功明细: {}",
+                    created_step_count,
+                    updated_step_count,
+                    deleted_step_count,
+                    success_step_detail,
                 )
                 # 6. 构建返回结果
                 return SuccessResponse(
@@ -382,11 +512,10 @@ async def batch_update_steps_tree(
             return FailureResponse(message=e.message)
         except Exception as e:
             # 事务会自动回滚
-            LOGGER.error(
+            LOGGER.exception(
                 f"发生未知错误，事务已回滚, "
                 f"错误类型: {type(e).__name__}, "
-                f"错误描述: {e}, \n"
-                f"错误回溯: {traceback.format_exc()}"
+                f"错误描述: {e}"
             )
             raise
     except NotFoundException as e:
@@ -398,12 +527,13 @@ async def batch_update_steps_tree(
     except DataAlreadyExistsException as e:
         return DataAlreadyExistsResponse(message=str(e.message))
     except Exception as e:
-        LOGGER.error(f"更新用例及步骤树异常，异常描述: {e}\n{traceback.format_exc()}")
+        LOGGER.exception(f"更新用例及步骤树异常，异常描述: {e}")
         return FailureResponse(message=f"更新用例及步骤树异常", data=str(e))
 
 
 @autotest_step.post("/http_debugging", summary="API自动化测试-HTTP请求调试")
 async def debug_http_request(
+        request: Request,
         step_data: AutoTestHttpDebugRequest = Body(..., description="HTTP请求步骤数据")
 ):
     try:
@@ -447,23 +577,16 @@ async def debug_http_request(
             assert_validators = []
 
         # 将列表格式的 defined_variables\session_variables 转换为字典格式（用于变量查找）
-        merge_all_variables: Dict[str, Any] = {}
-        for item in defined_variables:
-            if isinstance(item, dict) and item.get("key"):
-                merge_all_variables[item["key"]] = item
-        for item in session_variables:
-            if isinstance(item, dict) and item.get("key"):
-                merge_all_variables[item["key"]] = item
+        merge_all_variables: Dict[str, Any] = _merge_debug_variables(defined_variables, session_variables)
         initial_variables = list(merge_all_variables.values())
 
         # 处理请求主机域名
-        if request_url and not request_url.lower().startswith("http"):
+        if request_url and not _HTTP_SCHEME_RE.match(request_url):
             try:
                 from backend.applications.aotutest.services.autotest_env_crud import AUTOTEST_API_ENV_ENUM_CRUD
-                env_instance: AutoTestApiEnvEnumInfo = await AUTOTEST_API_ENV_ENUM_CRUD.get_by_conditions(
-                    only_one=True,
-                    on_error=False,
-                    conditions={"project_id": request_project_id, "env_name": env_name},
+                env_instance: AutoTestApiEnvEnumInfo = await AUTOTEST_API_ENV_ENUM_CRUD.get_by_project_env_cached(
+                    project_id=request_project_id,
+                    env_name=env_name,
                 )
                 if not env_instance:
                     return FailureResponse(
@@ -481,13 +604,12 @@ async def debug_http_request(
                     request_url = f"{execute_env_host}:{execute_env_port}/{request_url}"
 
             except Exception as e:
-                LOGGER.error(f"HTTP请求调试失败, 异常描述: {e}\n{traceback.format_exc()}")
+                LOGGER.exception(f"HTTP请求调试失败, 异常描述: {e}")
                 return FailureResponse(f"HTTP请求调试异常, 错误描述: {e}")
 
         # 日志辅助函数：添加时间戳和步骤名称
         def format_log(message: str) -> str:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            return f"[{timestamp}] [{step_name}] {message}"
+            return f"[{_log_timestamp()}] [{step_name}] {message}"
 
         # 记录执行日志，用于前端反馈
         logs = [
@@ -495,52 +617,24 @@ async def debug_http_request(
             format_log(f"参数替换开始: "),
         ]
 
-        # 解析请求参数（列表格式）及 request_body、request_text 中的占位符
+        # 解析请求参数（列表格式）中的占位符并同时转换为字典格式（用于HTTP请求）
         finished_variables = AutoTestToolService.resolve_placeholders(initial_variables, logs.append, False, finished_variables={})
-        headers_list = AutoTestToolService.resolve_placeholders(request_header, logs.append, False, finished_variables=finished_variables)
-        params_list = AutoTestToolService.resolve_placeholders(request_params, logs.append, False, finished_variables=finished_variables)
-        form_data_list = AutoTestToolService.resolve_placeholders(request_form_data, logs.append, False, finished_variables=finished_variables)
-        urlencoded_list = AutoTestToolService.resolve_placeholders(request_form_urlencoded, logs.append, False, finished_variables=finished_variables)
-        form_files_list = AutoTestToolService.resolve_placeholders(request_form_file, logs.append, False, finished_variables=finished_variables)
+        headers = AutoTestToolService.resolve_list_to_dict_for_http(request_header, logs.append, finished_variables)
+        params = AutoTestToolService.resolve_list_to_dict_for_http(request_params, logs.append, finished_variables)
+        form_data = AutoTestToolService.resolve_list_to_dict_for_http(request_form_data, logs.append, finished_variables)
+        urlencoded = AutoTestToolService.resolve_list_to_dict_for_http(request_form_urlencoded, logs.append, finished_variables)
+        form_files = AutoTestToolService.resolve_list_to_dict_for_http(request_form_file, logs.append, finished_variables)
+        # 解析 request_body、request_text 中的占位符
         if request_body is not None:
             request_body = AutoTestToolService.resolve_placeholders(request_body, logs.append, False, finished_variables=finished_variables)
         if request_text is not None:
             request_text = AutoTestToolService.resolve_placeholders(request_text, logs.append, False, finished_variables=finished_variables)
 
-        # 将列表格式转换为字典格式（用于HTTP请求）
-        headers = AutoTestToolService.convert_list_to_dict_for_http(headers_list)
-        params = AutoTestToolService.convert_list_to_dict_for_http(params_list)
-        form_data = AutoTestToolService.convert_list_to_dict_for_http(form_data_list)
-        urlencoded = AutoTestToolService.convert_list_to_dict_for_http(urlencoded_list)
-        form_files = AutoTestToolService.convert_list_to_dict_for_http(form_files_list)
-
-        # 处理请求体
-        data_payload: Optional[Any] = None
-        json_payload: Optional[Any] = None
-        file_payload: Optional[Any] = None
-        if request_args_type is None:
-            # 未配置时保持兼容：优先 raw -> form-data -> urlencoded 作为 data，若有 request_body 则作为 json
-            if request_text:
-                data_payload = request_text
-            elif form_data or form_files:
-                data_payload = form_data
-                file_payload = form_files if form_files else None
-            elif urlencoded:
-                data_payload = urlencoded
-            if request_body and not data_payload:
-                json_payload = request_body
-        elif request_args_type == AutoTestReqArgsType.NONE or request_args_type == AutoTestReqArgsType.PARAMS:
-            # 无请求体或仅查询参数
-            pass
-        elif request_args_type == AutoTestReqArgsType.RAW:
-            data_payload = request_text
-        elif request_args_type == AutoTestReqArgsType.JSON:
-            json_payload = request_body
-        elif request_args_type == AutoTestReqArgsType.FORM_DATA:
-            data_payload = form_data
-            file_payload = form_files if form_files else None
-        elif request_args_type == AutoTestReqArgsType.X_WWW_FORM_URLENCODED:
-            data_payload = urlencoded
+        # 处理请求体：按请求参数类型查表构建 (data, json, files)
+        build_payload = _REQ_ARGS_PAYLOAD_BUILDERS.get(request_args_type, _build_auto_payload)
+        data_payload, json_payload, file_payload = build_payload(
+            request_text, request_body, form_data, form_files, urlencoded
+        )
 
         # 构建请求参数
         logs.append(format_log("参数替换结束"))
@@ -562,28 +656,28 @@ async def debug_http_request(
         # 记录开始时间
         start_time = time.time()
 
-        # 发送HTTP请求
-        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0, connect=10.0)) as client:
-            try:
-                response = await client.request(
-                    method=request_method,
-                    url=request_url,
-                    **request_kwargs
-                )
-            except httpx.TimeoutException:
-                return FailureResponse(message="请求超时，请检查URL是否可访问或网络连接是否正常")
-            except httpx.ConnectError as e:
-                return FailureResponse(message=f"连接失败: {str(e)}")
-            except httpx.RequestError as e:
-                return FailureResponse(message=f"请求失败: {str(e)}")
-            except Exception as e:
-                error_message: str = (
-                    f"【HTTP请求调试】请求服务器发生未知错误, "
-                    f"错误类型: {type(e).__name__}, "
-                    f"错误描述: {e}"
-                )
-                LOGGER.error(f"{error_message}\n{traceback.format_exc()}")
-                return FailureResponse(message=f"HTTP请求调试异常", data=error_message)
+        # 发送HTTP请求（复用应用级共享客户端, 见 register_http_client）
+        client: httpx.AsyncClient = request.app.state.http_client
+        try:
+            response = await client.request(
+                method=request_method,
+                url=request_url,
+                **request_kwargs
+            )
+        except httpx.TimeoutException:
+            return FailureResponse(message="请求超时，请检查URL是否可访问或网络连接是否正常")
+        except httpx.ConnectError as e:
+            return FailureResponse(message=f"连接失败: {str(e)}")
+        except httpx.RequestError as e:
+            return FailureResponse(message=f"请求失败: {str(e)}")
+        except Exception as e:
+            error_message: str = (
+                f"【HTTP请求调试】请求服务器发生未知错误, "
+                f"错误类型: {type(e).__name__}, "
+                f"错误描述: {e}"
+            )
+            LOGGER.exception(f"{error_message}")
+            return FailureResponse(message=f"HTTP请求调试异常", data=error_message)
 
         # 计算耗时
         duration = int((time.time() - start_time) * 1000)  # 转换为毫秒
@@ -595,42 +689,29 @@ async def debug_http_request(
         response_text = response.text
         response_headers = dict(response.headers)
         try:
-            # 尝试解析为JSON
+            # 尝试解析为JSON(使用标准库 json, 与步骤引擎一致: 保留超过 64 位整数的精度, 兼容 BOM/UTF-16 与 NaN)
             response_json = response.json()
             response_data = response_json
-        except (ValueError, json.JSONDecodeError):
+        except ValueError:
             response_data = response_text
 
         # 解析Cookies
-        response_cookies = {}
-        if response.cookies:
-            for cookie in response.cookies.jar:
-                response_cookies[cookie.name] = cookie.value
+        response_cookies = {cookie.name: cookie.value for cookie in response.cookies.jar} if response.cookies else {}
 
         # 计算响应大小
         response_size = len(response.content)
         size_str = f"{response_size / 1024:.2f}KB" if response_size > 1024 else f"{response_size}B"
 
-        # 处理数据提取（使用与步骤引擎共用的工具方法）
-        _, extract_results = AutoTestToolService.run_extract_variables(
-            extract_variables=extract_variables or [],
-            response_text=response_text,
-            response_json=response_json,
-            response_headers=response_headers,
-            response_cookies=response_cookies,
-            session_variables_lookup=merge_all_variables,
-            log_callback=lambda msg: logs.append(format_log(msg)),
-        )
-
-        # 处理断言验证（使用与步骤引擎共用的工具方法）
-        validator_results = AutoTestToolService.run_assert_validators(
-            assert_validators=assert_validators or [],
+        # 处理数据提取与断言验证（使用与步骤引擎共用的工具方法）
+        extract_results, validator_results = await _run_debug_extract_and_assert(
+            extract_variables or [],
+            assert_validators or [],
+            lambda msg: logs.append(format_log(msg)),
             response_text=response_text,
             response_json=response_json,
             response_headers=response_headers,
             response_cookies=response_cookies,
             session_variables_lookup=merge_all_variables,
-            log_callback=lambda msg: logs.append(format_log(msg)),
         )
 
         # 构建返回数据（包含处理后的请求信息，用于前端展示实际发送的报文）
@@ -655,7 +736,7 @@ async def debug_http_request(
             actual_body = {**actual_body, "__files": file_payload}
         result_data = {
             "status": response.status_code,
-            "headers": dict(response.headers),
+            "headers": response_headers,
             "cookies": response_cookies,
             "data": response_data,
             "duration": duration,
@@ -677,7 +758,7 @@ async def debug_http_request(
 
         return SuccessResponse(message="HTTP调试请求成功", data=result_data)
     except Exception as e:
-        LOGGER.error(f"HTTP请求调试失败，异常描述: {e}\n{traceback.format_exc()}")
+        LOGGER.exception(f"HTTP请求调试失败，异常描述: {e}")
         return FailureResponse(message=f"HTTP请求调试失败，异常描述: {e}")
 
 
@@ -709,19 +790,12 @@ async def debug_tcp_request(
             assert_validators = []
 
         # 合并变量池（同 HTTP 调试）
-        merge_all_variables: Dict[str, Any] = {}
-        for item in defined_variables:
-            if isinstance(item, dict) and item.get("key"):
-                merge_all_variables[item["key"]] = item
-        for item in session_variables:
-            if isinstance(item, dict) and item.get("key"):
-                merge_all_variables[item["key"]] = item
+        merge_all_variables: Dict[str, Any] = _merge_debug_variables(defined_variables, session_variables)
         initial_variables = list(merge_all_variables.values())
 
         # 日志辅助函数
         def format_log(message: str) -> str:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            return f"[{timestamp}] [{step_name}] {message}"
+            return f"[{_log_timestamp()}] [{step_name}] {message}"
 
         logs = [format_log("TCP请求调试开始:"), format_log("参数替换开始:")]
         finished_variables = AutoTestToolService.resolve_placeholders(
@@ -752,10 +826,9 @@ async def debug_tcp_request(
         if (not host) and env_name and request_project_id:
             try:
                 from backend.applications.aotutest.services.autotest_env_crud import AUTOTEST_API_ENV_ENUM_CRUD
-                env_instance: AutoTestApiEnvEnumInfo = await AUTOTEST_API_ENV_ENUM_CRUD.get_by_conditions(
-                    only_one=True,
-                    on_error=False,
-                    conditions={"project_id": request_project_id, "env_name": env_name},
+                env_instance: AutoTestApiEnvEnumInfo = await AUTOTEST_API_ENV_ENUM_CRUD.get_by_project_env_cached(
+                    project_id=request_project_id,
+                    env_name=env_name,
                 )
                 if not env_instance:
                     return FailureResponse(
@@ -767,7 +840,7 @@ async def debug_tcp_request(
             except Exception as e:
                 error_message: str = f"解析请求信息(host={host}, port={port})失败, 终止调试: {e}"
                 logs.append(format_log(error_message))
-                LOGGER.error(f"{error_message}\n{traceback.format_exc()}")
+                LOGGER.exception(f"{error_message}")
                 return FailureResponse(message=error_message)
 
         if not host or not port:
@@ -786,7 +859,7 @@ async def debug_tcp_request(
                 )
                 raw_bytes = await utils.bytes_resp()
             except ReqInvalidException as e:
-                LOGGER.error(f"{e.message}\n{traceback.format_exc()}")
+                LOGGER.exception(f"{e.message}")
                 return FailureResponse(message="TCP请求调试异常", data=str(e.message))
             except Exception as e:
                 error_message: str = (
@@ -794,7 +867,7 @@ async def debug_tcp_request(
                     f"错误类型: {type(e).__name__},"
                     f"错误描述: {e}"
                 )
-                LOGGER.error(f"{error_message}\n{traceback.format_exc()}")
+                LOGGER.exception(f"{error_message}")
                 return FailureResponse(message="TCP请求调试异常", data=error_message)
 
         # 解析响应：优先 JSON，否则当作 text
@@ -804,30 +877,23 @@ async def debug_tcp_request(
         response_text: str = raw_bytes.decode("utf-8", errors="ignore")
         response_data: Optional[Union[str, Dict[str, Any]]] = response_text
         try:
+            # 使用标准库 json, 与步骤引擎一致: 保留超过 64 位整数的精度并接受 NaN
             response_json = json.loads(response_text)
             response_data = response_json
-        except Exception:
+        except ValueError:
             LOGGER.warning(f"响应体转换JSON格式失败, 保留原样")
             response_json = None
 
         # 变量提取 / 断言（同 HTTP 调试）
-        _, extract_results = AutoTestToolService.run_extract_variables(
-            extract_variables=extract_variables or [],
-            response_text=response_text,
-            response_json=response_json,
-            response_headers=None,
-            response_cookies=None,
-            session_variables_lookup=merge_all_variables,
-            log_callback=lambda msg: logs.append(format_log(msg)),
-        )
-        validator_results = AutoTestToolService.run_assert_validators(
-            assert_validators=assert_validators or [],
+        extract_results, validator_results = await _run_debug_extract_and_assert(
+            extract_variables or [],
+            assert_validators or [],
+            lambda msg: logs.append(format_log(msg)),
             response_text=response_text,
             response_json=response_json,
             response_headers=None,
             response_cookies=None,
             session_variables_lookup=merge_all_variables,
-            log_callback=lambda msg: logs.append(format_log(msg)),
         )
 
         size = len(raw_bytes)
@@ -854,7 +920,7 @@ async def debug_tcp_request(
         LOGGER.info(f"TCP请求调试完成: 耗时: {duration}ms")
         return SuccessResponse(message="TCP调试请求成功", data=result_data)
     except Exception as e:
-        LOGGER.error(f"TCP请求调试失败，异常描述: {e}\n{traceback.format_exc()}")
+        LOGGER.exception(f"TCP请求调试失败，异常描述: {e}")
         return FailureResponse(message=f"TCP请求调试失败，异常描述: {e}")
 
 
@@ -968,7 +1034,7 @@ async def debug_python_code(
             except StepExecutionError as e:
                 # 构建失败响应
                 debugging_return["error"] = str(e)
-                LOGGER.error(f"【Python代码调试】失败, 错误回溯: {traceback.format_exc()}")
+                LOGGER.exception("【Python代码调试】失败")
                 return SuccessResponse(message="Python代码调试失败", data=debugging_result, total=1)
 
     except Exception as e:
@@ -978,10 +1044,37 @@ async def debug_python_code(
             "错误时间": f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
             "错误回溯": f"{traceback.format_exc()}",
         }
-        LOGGER.error(f"【Python代码调试】异常: {e}\n{traceback.format_exc()}")
+        LOGGER.exception(f"【Python代码调试】异常: {e}")
         return FailureResponse(message=f"Python代码调试异常", data=response_data)
 
 
+def _serialize_step_result(r: StepExecutionResult) -> Dict[str, Any]:
+    """
+    序列化步骤执行结果(仅保留调试响应所需字段), 子步骤递归序列化
+
+    :param r: 步骤执行结果
+    :return: 可直接由 orjson 序列化的字典
+    """
+    step_type = r.step_type
+    children = r.children
+    return {
+        "case_id": r.case_id,
+        "step_id": r.step_id,
+        "step_no": r.step_no,
+        "step_code": r.step_code,
+        "step_name": r.step_name,
+        "step_type": step_type.value if step_type else None,
+        "success": r.success,
+        "message": r.message,
+        "error": r.error,
+        "elapsed": r.elapsed,
+        "extract_variables": r.extract_variables,
+        "assert_validators": r.assert_validators,
+        "response": r.response,
+        "children": [_serialize_step_result(c) for c in children] if children else [],
+    }
+
+
 @autotest_step.post("/execute_or_debugging", summary="API自动化测试-执行或调试步骤树")
 async def execute_step_tree(
         request: AutoTestStepTreeExecute = Body(..., description="步骤树数据")
@@ -1012,25 +1105,6 @@ async def execute_step_tree(
         if not is_run_mode and not is_debug_mode:
             return BadReqResponse(message="必须提供case_id参数，运行模式不传递steps，调试模式需要传递steps")
 
-        # 序列化执行结果
-        def serialize_result(r: Any) -> Dict[str, Any]:
-            return {
-                "case_id": r.case_id,
-                "step_id": r.step_id,
-                "step_no": r.step_no,
-                "step_code": r.step_code,
-                "step_name": r.step_name,
-                "step_type": r.step_type.value if r.step_type else None,
-                "success": r.success,
-                "message": r.message,
-                "error": r.error,
-                "elapsed": r.elapsed,
-                "extract_variables": r.extract_variables,
-                "assert_validators": r.assert_validators,
-                "response": r.response,
-                "children": [serialize_result(c) for c in r.children],
-            }
-
         # ========== 运行模式 ==========
         if is_run_mode:
             try:
@@ -1095,20 +1169,17 @@ async def execute_step_tree(
                     f"错误类型: {type(e).__name__}, "
                     f"错误详情: {e}"
                 )
-                LOGGER.error(f"{error_message}\n{traceback.format_exc()}")
+                LOGGER.exception(f"{error_message}")
                 return FailureResponse(message=f"执行步骤过程中发生异常，事务已回滚: {str(e)}")
 
         # ========== 调试模式 ==========
         else:
-            # 1. 将Pydantic模型转换为字典
-            steps_dict = []
-            for step in steps:
-                if hasattr(step, 'model_dump'):
-                    steps_dict.append(step.model_dump())
-                elif isinstance(step, dict):
-                    steps_dict.append(step)
-                else:
-                    steps_dict.append(dict(step))
+            # 1. 将Pydantic模型转换为字典(只导出请求中实际传入的字段, 未传字段在执行引擎中均按 .get 取值, 缺省即为 None)
+            steps_dict = [
+                step.model_dump(mode="python", exclude_unset=True) if hasattr(step, "model_dump")
+                else (step if isinstance(step, dict) else dict(step))
+                for step in steps
+            ]
 
             tree_data = steps_dict
 
@@ -1137,17 +1208,16 @@ async def execute_step_tree(
             # initial_variables 和 all_session_variables 都是列表格式，每个元素包含 key、value、desc
             all_session_variables = AutoTestToolService.collect_session_variables(tree_data)
             # 合并两个列表，如果存在相同的key，使用 all_session_variables 中的值（后收集的优先）
-            merged_variables = {}
-            # 先添加 initial_variables
-            if isinstance(initial_variables, list):
-                for item in initial_variables:
-                    if isinstance(item, dict) and "key" in item:
-                        merged_variables[item.get("key")] = item
-            # 再添加 all_session_variables（会覆盖相同的key）
-            if isinstance(all_session_variables, list):
-                for item in all_session_variables:
-                    if isinstance(item, dict) and "key" in item:
-                        merged_variables[item.get("key")] = item
+            if not isinstance(initial_variables, list):
+                initial_variables = []
+            if not isinstance(all_session_variables, list):
+                all_session_variables = []
+            # 单次遍历合并: 先 initial_variables 后 all_session_variables, 相同 key 由后者覆盖
+            merged_variables = {
+                item["key"]: item
+                for item in chain(initial_variables, all_session_variables)
+                if isinstance(item, dict) and "key" in item
+            }
             try:
                 # 转换回列表格式
                 initial_variables = list(merged_variables.values())
@@ -1182,9 +1252,10 @@ async def execute_step_tree(
                 try:
                     async with in_transaction():
                         report_instance = await AUTOTEST_API_REPORT_CRUD.create_report(report_in=defer_create_report)
-                        for detail_create in (pending_create_details or []):
-                            detail_schema = detail_create.model_copy(update={"report_code": report_instance.report_code})
-                            await AUTOTEST_API_DETAIL_CRUD.create_detail(detail_in=detail_schema)
+                        await AUTOTEST_API_DETAIL_CRUD.bulk_create_details(
+                            details_in=pending_create_details or [],
+                            report_code=report_instance.report_code,
+                        )
                         case_state = statistics.get("failed_steps", 0) == 0
                         case_last_time = defer_create_report.case_ed_time
                         await AUTOTEST_API_CASE_CRUD.update_case(AutoTestApiCaseUpdate(
@@ -1193,24 +1264,19 @@ async def execute_step_tree(
                             case_last_time=case_last_time,
                         ))
                 except Exception as e:
-                    LOGGER.error(f"执行或调试步骤树(调试模式)时发生未知异常，错误描述: {e}\n{traceback.format_exc()}")
+                    LOGGER.exception(f"执行或调试步骤树(调试模式)时发生未知异常，错误描述: {e}")
 
             # 7. 获取最终会话变量（从执行引擎返回）
             # session_variables 和 initial_variables 都是列表格式，每个元素包含 key、value、desc
             # 合并两个列表，如果存在相同的key，使用 session_variables 中的值（后执行的优先）
-            final_session_variables = {}
-            # 先添加 initial_variables
-            if isinstance(initial_variables, list):
-                for item in initial_variables:
-                    if isinstance(item, dict) and "key" in item:
-                        final_session_variables[item.get("key")] = item
-            # 再添加 session_variables（会覆盖相同的key）
-            if isinstance(session_variables, list):
-                for item in session_variables:
-                    if isinstance(item, dict) and "key" in item:
-                        final_session_variables[item.get("key")] = item
-            # 转换回列表格式
-            final_session_variables = list(final_session_variables.values())
+            if not isinstance(session_variables, list):
+                session_variables = []
+            # 单次遍历合并: 先 initial_variables 后 session_variables, 相同 key 由后者覆盖, 再转换回列表格式
+            final_session_variables = list({
+                item["key"]: item
+                for item in chain(initial_variables, session_variables)
+                if isinstance(item, dict) and "key" in item
+            }.values())
 
             # 8. 返回调试模式的详细结果
             total_steps: int = statistics.get("total_steps", 0)
@@ -1223,20 +1289,25 @@ async def execute_step_tree(
                 "passed_ratio": passed_ratio,
                 "success_steps": success_steps,
                 "success": failed_steps == 0,
-                "results": [serialize_result(r) for r in results],
-                "logs": {str(k): v for k, v in logs.items()},
+                "logs": logs,
                 "session_variables": final_session_variables,
                 "saved_to_database": True
             }
-            return SuccessResponse(
+            # 步骤结果(含请求/响应体)体量最大, 逐步骤序列化后流式输出, 其余字段随响应头一并输出
+            return SuccessStreamResponse(
                 message=f"调试完成, 共{total_steps}步骤, 成功{success_steps}步, 失败{failed_steps}步, 成功率: {passed_ratio}%",
                 data=result_data,
-                total=1
+                stream_field="results",
+                stream_items=results,
+                serializer=_serialize_step_result,
+                total=1,
+                # logs 的键可能为非字符串(如步骤编号), 由 orjson 直接转为字符串键, 无需重建字典
+                json_option=orjson.OPT_NON_STR_KEYS,
             )
     except (NotFoundException, ParameterException) as e:
         return ParameterResponse(message=str(e.message))
     except Exception as e:
-        LOGGER.error(f"执行或调试步骤树失败，异常描述: {e}\n{traceback.format_exc()}")
+        LOGGER.exception(f"执行或调试步骤树失败，异常描述: {e}")
         return FailureResponse(message=f"执行或调试步骤树失败, 异常描述: {e}")
 
 
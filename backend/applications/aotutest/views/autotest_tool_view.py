@@ -6,6 +6,7 @@
 @Module  : autotest_tool_view
 @DateTime: 2026/1/17 16:13
 """
+import functools
 import inspect
 import traceback
 from typing import Any, Dict, List
@@ -66,12 +67,13 @@ FUNC_LIST: List[Dict[str, Any]] = [
 ]
 
 
+@functools.lru_cache(maxsize=1)
 def _build_func_list_with_desc() -> List[Dict[str, Any]]:
-    """为 FUNC_LIST 中每项补全 desc（从 GenerateUtils 反射）。"""
+    """为 FUNC_LIST 中每项补全 desc（从 GenerateUtils 反射）；结果进程内不变，仅首次调用时构建。"""
     result: List[Dict[str, Any]] = []
     for item in FUNC_LIST:
         name = item["name"]
-        func_name = name.split("(")[0].strip() if "(" in name else name
+        func_name = name.split("(", 1)[0].strip()
         desc = item.get("desc") or _get_func_desc(func_name)
         result.append({"name": name, "desc": desc})
     return result
@@ -15,11 +15,13 @@ from tortoise.exceptions import DBConnectionError
 
 from backend.core.initializations import (
     register_database,
+    register_http_client,
     register_exceptions,
     register_middlewares,
     register_routers,
     init_database_table,
 )
+from backend.core.middlewares import start_audit_writer, stop_audit_writer
 from backend.core.responses import SuccessResponse
 
 try:
@@ -37,6 +39,8 @@ async def lifespan(app: FastAPI):
     except DBConnectionError as e:
         raise RuntimeError(f"数据库连接失败, 请检查主机地址是否可达: {e}")
     await init_database_table(app)
+    await register_http_client(app)
+    await start_audit_writer()
 
     for route in app.routes:
         if isinstance(route, APIRoute):
@@ -45,6 +49,8 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    await stop_audit_writer()
+    await app.state.http_client.aclose()
     await Tortoise.close_connections()
 
 
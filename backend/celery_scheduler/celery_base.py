@@ -8,25 +8,50 @@
 """
 from __future__ import annotations
 
+import asyncio
+import functools
+import importlib
 import logging
 import threading
+import time
 import traceback
+import weakref
 from contextvars import ContextVar
 from datetime import datetime
-from typing import Dict, Any, Union, Coroutine, Awaitable, Iterator, Tuple
+from types import MappingProxyType
+from typing import Dict, Any, Union, Coroutine, Awaitable, Iterator, Tuple, Mapping, Callable
 from typing import List, Optional
 
 from tortoise import Tortoise, connections
-from tortoise.exceptions import DBConnectionError
-from tortoise.expressions import Q
+from tortoise.exceptions import DBConnectionError, OperationalError
+from tortoise.queryset import QuerySet
 
 from backend.configure import PROJECT_CONFIG, LOGGER
 
 # 全局变量，标记数据库是否已初始化
 _tortoise_orm_initialized = False
+# 线程锁仅保护 _init_async_locks 的读写（不跨 await 持有）；初始化临界区由所在 loop 的 asyncio.Lock 保护，等待时不阻塞 loop
 _init_threading_safe_lock = threading.Lock()
+# id(loop) -> (loop 弱引用, 锁)：弱引用用于识别 loop 已关闭/回收（id 可能被新 loop 复用）的过期条目并清理
+_init_async_locks: Dict[int, Tuple[weakref.ReferenceType, asyncio.Lock]] = {}
+# 最近一次连接可用性检查（SELECT 1）成功的单调时钟时间；间隔 TTL 内的重复调用跳过检查，省去每个任务一次的数据库往返
+_connection_checked_at: float = 0.0
+_CONNECTION_CHECK_TTL: float = 30.0
 logger = logging.getLogger(__name__)
 
+# Tortoise 初始化配置：进程内只构建一次，prefork 子进程经 fork 继承，无需每次 init 重新组装
+_TORTOISE_ORM_CONFIG: Dict[str, Any] = {
+    "connections": PROJECT_CONFIG.DATABASE_CONNECTIONS,
+    "apps": {
+        "models": {
+            "models": PROJECT_CONFIG.APPLICATIONS_MODELS,
+            "default_connection": "default"
+        }
+    },
+    "use_tz": False,
+    "timezone": "Asia/Shanghai",
+}
+
 
 def reset_tortoise_orm_state() -> None:
     """
@@ -36,6 +61,31 @@ def reset_tortoise_orm_state() -> None:
     """
     global _tortoise_orm_initialized
     _tortoise_orm_initialized = False
+    invalidate_tortoise_orm_connection_check()
+
+
+def preload_tortoise_models() -> None:
+    """
+    预先导入 Tortoise 配置中的全部模型模块，供 Celery worker_init 在 prefork 父进程 fork 前调用。
+    子进程通过 fork 继承已导入的模块（写时复制共享），首次 init_tortoise_orm() 发现模型时直接命中
+    sys.modules，不必在每个子进程里各自导入一遍；连接池仍由子进程在自己的 loop 中创建。
+    """
+    for module in PROJECT_CONFIG.APPLICATIONS_MODELS:
+        importlib.import_module(module)
+
+
+def invalidate_tortoise_orm_connection_check() -> None:
+    """
+    使连接可用性检查的 TTL 缓存失效，下一次 init_tortoise_orm() 会立即执行 SELECT 1。
+    在任务执行过程中观察到数据库连接类异常时调用，以便尽快发现失效的连接池。
+    """
+    global _connection_checked_at
+    _connection_checked_at = 0.0
+
+
+def is_db_connection_error(exc: Optional[BaseException]) -> bool:
+    """判断异常是否为数据库连接/执行层面的异常（需要重新检查连接可用性）。"""
+    return isinstance(exc, (DBConnectionError, OperationalError))
 
 
 def run_async(func: Union[Coroutine, Awaitable]) -> Any:
@@ -49,6 +99,62 @@ def run_async(func: Union[Coroutine, Awaitable]) -> Any:
     return AsyncEventLoopContextIOPool.run_in_pool(func)
 
 
+def _get_init_async_lock() -> asyncio.Lock:
+    """
+    获取当前 running loop 专属的初始化锁（按 loop 缓存，首次获取时创建）。
+    不用 WeakKeyDictionary：asyncio.Lock 使用后会强引用所属 loop，作为值时 loop 永远不会被回收；
+    改为按 id 存弱引用，取锁时顺带清理 loop 已关闭或已回收的条目，避免泄漏及 id 复用时拿到旧 loop 的锁。
+    """
+    loop = asyncio.get_running_loop()
+    with _init_threading_safe_lock:
+        entry = _init_async_locks.get(id(loop))
+        if entry is not None and entry[0]() is loop:
+            return entry[1]
+        for key, (loop_ref, _) in list(_init_async_locks.items()):
+            stale_loop = loop_ref()
+            if stale_loop is None or stale_loop.is_closed():
+                del _init_async_locks[key]
+        lock = asyncio.Lock()
+        _init_async_locks[id(loop)] = (weakref.ref(loop), lock)
+    return lock
+
+
+async def _check_tortoise_orm_connection() -> bool:
+    """
+    检查已初始化的 Tortoise 连接是否可用（SELECT 1）。
+    距上次检查成功不足 _CONNECTION_CHECK_TTL 秒时直接视为可用；
+    不可用时关闭现有连接并返回 False，由调用方重新初始化。
+    """
+    global _connection_checked_at
+    if time.monotonic() - _connection_checked_at < _CONNECTION_CHECK_TTL:
+        return True
+    try:
+        # 尝试获取连接来验证连接是否可用
+        conn = connections.get("default")
+        if conn and hasattr(conn, '_pool') and conn._pool:
+            try:
+                # 连接池存在，尝试执行一个简单查询来验证连接
+                await conn.execute_query("SELECT 1")
+                _connection_checked_at = time.monotonic()
+                return True
+            except Exception:
+                # 连接可能已断开，需要重新初始化
+                LOGGER.warning("数据库连接已断开，将重新初始化")
+                try:
+                    await Tortoise.close_connections()
+                except:
+                    pass
+    except Exception as e:
+        LOGGER.warning(f"数据库连接检查失败，将重新初始化: {str(e)}")
+        try:
+            # 关闭现有连接
+            await Tortoise.close_connections()
+        except:
+            pass
+    # 连接池不存在或不可用，需要初始化
+    return False
+
+
 async def init_tortoise_orm() -> None:
     """
     在「当前 running loop」所在线程中初始化 Tortoise（创建连接池）。
@@ -56,59 +162,27 @@ async def init_tortoise_orm() -> None:
     这样 Tortoise/aiomysql 绑定的 loop 与后续 _create_task_record、业务任务使用的 loop 一致；
     若在其它 loop 或线程中 init，会触发 "Task got Future attached to a different loop"。
     若已初始化则仅做连接可用性检查（SELECT 1）。
+    采用双重检查：已初始化且连接可用时不加锁直接返回；否则进入 loop 级 asyncio.Lock 临界区后再次检查，再执行初始化。
     """
-    global _tortoise_orm_initialized
+    global _tortoise_orm_initialized, _connection_checked_at
 
-    # 使用线程锁保护初始化过程
-    with _init_threading_safe_lock:
-        # 如果已经初始化，检查连接是否可用
-        if _tortoise_orm_initialized:
-            try:
-                # 尝试获取连接来验证连接是否可用
-                conn = connections.get("default")
-                if conn and hasattr(conn, '_pool') and conn._pool:
-                    try:
-                        # 连接池存在，尝试执行一个简单查询来验证连接
-                        await conn.execute_query("SELECT 1")
-                        return
-                    except Exception:
-                        # 连接可能已断开，需要重新初始化
-                        LOGGER.warning("数据库连接已断开，将重新初始化")
-                        _tortoise_orm_initialized = False
-                        try:
-                            await Tortoise.close_connections()
-                        except:
-                            pass
-                else:
-                    # 连接池不存在，需要初始化
-                    _tortoise_orm_initialized = False
-            except Exception as e:
-                LOGGER.warning(f"数据库连接检查失败，将重新初始化: {str(e)}")
-                _tortoise_orm_initialized = False
-                try:
-                    # 关闭现有连接
-                    await Tortoise.close_connections()
-                except:
-                    pass
+    # 快速路径：已初始化且连接可用，无需加锁
+    if _tortoise_orm_initialized:
+        if await _check_tortoise_orm_connection():
+            return
+        _tortoise_orm_initialized = False
 
-        # 初始化数据库配置
-        config: Dict[str, Any] = {
-            "connections": PROJECT_CONFIG.DATABASE_CONNECTIONS,
-            "apps": {
-                "models": {
-                    "models": PROJECT_CONFIG.APPLICATIONS_MODELS,
-                    "default_connection": "default"
-                }
-            },
-            "use_tz": False,
-            "timezone": "Asia/Shanghai",
-        }
+    async with _get_init_async_lock():
+        # 再次检查：等待锁期间可能已由其它协程完成（重新）初始化
+        if _tortoise_orm_initialized and await _check_tortoise_orm_connection():
+            return
 
         try:
             # 初始化 Tortoise ORM
             # 注意：如果已经初始化过，Tortoise.init 会重新初始化
-            await Tortoise.init(config=config)
+            await Tortoise.init(config=_TORTOISE_ORM_CONFIG)
             _tortoise_orm_initialized = True
+            _connection_checked_at = time.monotonic()
             LOGGER.info("Tortoise ORM 数据库连接初始化成功")
         except DBConnectionError as e:
             LOGGER.error(f"数据库连接失败: {str(e)}")
@@ -139,7 +213,16 @@ def ensure_tortoise_orm_initialized():
 
 def get_trace_id():
     """从 Worker 上下文获取 trace_id，用于日志定位。"""
-    return getattr(LOCAL_CONTEXT_VAR, "trace_id", None) or ""
+    return _TRACE_ID_VAR.get() or ""
+
+
+def set_trace_id(trace_id: Optional[str]) -> None:
+    """
+    写入当前上下文的 trace_id。
+    投递到池 loop 的协程经 run_coroutine_threadsafe 复制调用线程的上下文，因此需在投递前写入，
+    池内协程通过 get_trace_id() 即可读到，且各协程互不覆盖。
+    """
+    _TRACE_ID_VAR.set(trace_id)
 
 
 def get_step_crud():
@@ -171,21 +254,177 @@ def get_scheduler_value(scheduler: Any) -> Optional[str]:
     return str(scheduler).strip().lower() or None
 
 
+# 扫描到期任务时仅需读取的字段（check_task_expired 与下发所用），避免每轮扫描拉取 task_kwargs/task_notify 等大字段
+_SCHEDULED_TASK_FIELDS: Tuple[str, ...] = (
+    "id",
+    "task_scheduler",
+    "task_crontabs_expr",
+    "task_interval_expr",
+    "task_datetime_expr",
+    "last_execute_time",
+    "created_time",
+)
+
+
+@functools.lru_cache(maxsize=16)
+def get_scheduled_tasks_queryset(task_type: str) -> QuerySet:
+    """
+    按任务类型缓存扫描用的 QuerySet 原型，避免每轮扫描重复构造过滤条件。
+    原型本身从不直接 await，每次通过 .all() 克隆出新的 QuerySet 执行，不会在两次扫描之间保留结果。
+
+    :param task_type: 任务类型
+    :return: 未执行的 QuerySet 原型
+    """
+    Model = get_task_model()
+    return Model.filter(
+        state=0,
+        task_enabled=True,
+        task_scheduler__isnull=False,
+        task_type=task_type,
+    ).only(*_SCHEDULED_TASK_FIELDS)
+
+
 async def get_scheduled_tasks(task_type: str) -> List[Any]:
     """
     拉取未删除、已启用且配置了调度的任务列表，按 task_type 过滤，避免非自动化任务被下发到 run_autotest_task。
 
     :param task_type: 任务类型。
     传 "autotest"（默认）时只返回自动化测试任务
+    :return: 仅加载 _SCHEDULED_TASK_FIELDS 字段的任务实例列表（只读，不可直接 save）
     """
     if not task_type:
         return []
-    Model = get_task_model()
-    q = Q(state=0) & Q(task_enabled=True) & ~Q(task_scheduler__isnull=True) & Q(task_type=task_type)
-    tasks = await Model.filter(q).all()
+    tasks = await get_scheduled_tasks_queryset(task_type).all()
     return list(tasks)
 
 
+@functools.lru_cache(maxsize=1024)
+def get_cron_next_run(expr: str, base: datetime) -> datetime:
+    """
+    计算 Cron 表达式在基准时间之后的下一次触发时间。
+    结果只取决于 (expr, base)，而 base 为任务最后执行时间，在两次执行之间保持不变，
+    因此缓存后每轮扫描无需重复解析表达式；表达式或最后执行时间变化时自然使用新的缓存键。
+
+    :param expr: Cron 表达式
+    :param base: 基准时间（naive datetime）
+    :return: 下一次触发时间
+    """
+    from croniter import croniter
+    return croniter(expr, base).get_next(datetime)
+
+
+@functools.lru_cache(maxsize=1024)
+def validate_cron_expr(expr: str) -> bool:
+    """
+    校验 Cron 表达式是否合法，结果按表达式缓存（非法表达式抛出异常，不进入缓存）。
+
+    :param expr: Cron 表达式
+    :return: 合法时返回 True
+    :raises Exception: 表达式不合法时由 croniter 抛出
+    """
+    from croniter import croniter
+    croniter(expr)
+    return True
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_datetime_expr(expr: str) -> datetime:
+    """
+    解析 "%Y-%m-%d %H:%M:%S" 格式的定时表达式。
+    标准定长格式按位切片直接构造 datetime，绕开 strptime 的格式解析；其余写法（如月日不补零）回退到 strptime。
+
+    :param expr: 时间表达式
+    :return: 解析后的 naive datetime
+    :raises ValueError: 表达式不合法时
+    """
+    if (
+            len(expr) == 19
+            and expr[4] == expr[7] == "-" and expr[10] == " " and expr[13] == expr[16] == ":"
+            and (expr[0:4] + expr[5:7] + expr[8:10] + expr[11:13] + expr[14:16] + expr[17:19]).isdecimal()
+    ):
+        return datetime(
+            int(expr[0:4]), int(expr[5:7]), int(expr[8:10]),
+            int(expr[11:13]), int(expr[14:16]), int(expr[17:19]),
+        )
+    return datetime.strptime(expr, "%Y-%m-%d %H:%M:%S")
+
+
+def _log_trigger_expr_error(kind: str, task: Any, e: Exception) -> None:
+    """
+    记录任务触发器表达式解析失败。
+    配置错误的任务每轮扫描都会重复失败，错误回溯仅在 DEBUG 级别开启时才格式化输出。
+
+    :param kind: 触发器类型（Cron/Datetime）
+    :param task: 任务模型实例
+    :param e: 解析时抛出的异常
+    """
+    message: str = (
+        f"【Krun-Celery-Worker】<==> 【trace_id={get_trace_id()}】任务触发器{kind}表达式解析失败: "
+        f"task_id={getattr(task, 'id', None)}, "
+        f"错误类型: {type(e).__name__}, "
+        f"错误描述: {e}"
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        message += f", \n错误回溯: {traceback.format_exc()}"
+    logger.warning(message)
+
+
+def _is_cron_task_expired(task: Any, now: datetime, last_run: Optional[datetime]) -> bool:
+    """Cron 调度：基准时间（最后执行时间）之后的下一次触发时间已到。"""
+    expr = (getattr(task, "task_crontabs_expr", None) or "").strip()
+    if not expr:
+        return False
+    try:
+        if last_run is None:
+            # 无基准时间时以当前时间为基准，下一次触发时间必然晚于当前时间，不会到期；
+            # 只按表达式校验（缓存键稳定），不以每轮变化的 now 作为缓存键
+            validate_cron_expr(expr)
+            return False
+        base = last_run
+        if getattr(base, "tzinfo", None):
+            base = base.replace(tzinfo=None)
+        next_run = get_cron_next_run(expr, base)
+        return next_run <= now
+    except Exception as e:
+        _log_trigger_expr_error("Cron", task, e)
+        return False
+
+
+def _is_interval_task_expired(task: Any, now: datetime, last_run: Optional[datetime]) -> bool:
+    """Interval 调度：距最后执行时间已超过间隔秒数。"""
+    seconds = getattr(task, "task_interval_expr", None) or 0
+    if seconds <= 0:
+        return False
+    if not last_run:
+        return True
+    diff = now - last_run
+    delta = diff.total_seconds() if hasattr(diff, "total_seconds") else diff.seconds
+    return delta >= seconds
+
+
+def _is_datetime_task_expired(task: Any, now: datetime, last_run: Optional[datetime]) -> bool:
+    """Datetime 调度：已到指定时间且在该时间之后尚未执行过。"""
+    expr = (task.task_datetime_expr or "").strip()
+    if not expr:
+        return False
+    try:
+        target = parse_datetime_expr(expr)
+        if last_run and last_run >= target:
+            return False
+        return now >= target
+    except Exception as e:
+        _log_trigger_expr_error("Datetime", task, e)
+        return False
+
+
+# 调度类型 -> 到期判断函数
+_TASK_EXPIRED_HANDLERS: Dict[str, Callable[[Any, datetime, Optional[datetime]], bool]] = {
+    "cron": _is_cron_task_expired,
+    "interval": _is_interval_task_expired,
+    "datetime": _is_datetime_task_expired,
+}
+
+
 async def check_task_expired(task: Any) -> bool:
     """
     判断任务是否已到执行时间。
@@ -194,8 +433,8 @@ async def check_task_expired(task: Any) -> bool:
     :return: 是否到期
     """
     scheduler = getattr(task, "task_scheduler", None)
-    scheduler_str = get_scheduler_value(scheduler)
-    if not scheduler_str:
+    handler = _TASK_EXPIRED_HANDLERS.get(get_scheduler_value(scheduler))
+    if handler is None:
         return False
 
     now = datetime.now()
@@ -204,58 +443,23 @@ async def check_task_expired(task: Any) -> bool:
     if last_run and getattr(last_run, "tzinfo", None):
         last_run = last_run.replace(tzinfo=None) if last_run.tzinfo else last_run
 
-    if scheduler_str == "cron":
-        expr = (getattr(task, "task_crontabs_expr", None) or "").strip()
-        if not expr:
-            return False
-        try:
-            from croniter import croniter
-            base = last_run or now
-            if getattr(base, "tzinfo", None):
-                base = base.replace(tzinfo=None)
-            it = croniter(expr, base)
-            next_run = it.get_next(datetime)
-            return next_run <= now
-        except Exception as e:
-            logger.warning(
-                f"【Krun-Celery-Worker】<==> 【trace_id={get_trace_id()}】任务触发器Cron表达式解析失败: "
-                f" task_id={getattr(task, 'id', None)}",
-                f"错误类型: {type(e).__name__}, "
-                f"错误描述: {e}, \n"
-                f"错误回溯: {traceback.format_exc()}"
-            )
-            return False
+    return handler(task, now, last_run)
 
-    if scheduler_str == "interval":
-        seconds = getattr(task, "task_interval_expr", None) or 0
-        if seconds <= 0:
-            return False
-        if not last_run:
-            return True
-        diff = now - last_run
-        delta = diff.total_seconds() if hasattr(diff, "total_seconds") else diff.seconds
-        return delta >= seconds
-
-    if scheduler_str == "datetime":
-        expr = (task.task_datetime_expr or "").strip()
-        if not expr:
-            return False
-        try:
-            target = datetime.strptime(expr, "%Y-%m-%d %H:%M:%S")
-            if last_run and last_run >= target:
-                return False
-            return now >= target
-        except Exception as e:
-            logger.warning(
-                f"【Krun-Celery-Worker】<==> 【trace_id={get_trace_id()}】任务触发器Datetime表达式解析失败: "
-                f" task_id={task.id}",
-                f"错误类型: {type(e).__name__}, "
-                f"错误描述: {e}, \n"
-                f"错误回溯: {traceback.format_exc()}"
-            )
-            return False
 
-    return False
+async def check_tasks_expired(tasks: List[Any]) -> List[Union[bool, BaseException]]:
+    """
+    批量判断任务是否已到执行时间，结果与 tasks 一一对应。
+
+    :param tasks: 任务模型实例列表
+    :return: 每个任务的到期判断结果；单个任务判断抛出异常时对应位置为该异常对象，不影响其余任务
+    """
+    return await asyncio.gather(*(check_task_expired(task) for task in tasks), return_exceptions=True)
+
+
+# 上下文未写入任何值时的共享只读默认存储，避免每次读取都新建空字典
+_EMPTY_LOCAL_STORAGE: Mapping[str, Any] = MappingProxyType({})
+# trace_id 读写最频繁（每条日志都会读取），单独使用一个 ContextVar，读写都不经过字典复制
+_TRACE_ID_VAR: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
 
 
 class LocalContextVar:
@@ -266,33 +470,37 @@ class LocalContextVar:
     __slots__ = ("_storage",)
 
     def __init__(self) -> None:
-        object.__setattr__(self, "_storage", ContextVar("local_storage"))
+        object.__setattr__(self, "_storage", ContextVar("local_storage", default=_EMPTY_LOCAL_STORAGE))
 
     def __iter__(self) -> Iterator[Tuple[int, Any]]:
-        return iter(self._storage.get({}).items())
+        trace_id = _TRACE_ID_VAR.get()
+        items = self._storage.get().items()
+        return iter([("trace_id", trace_id), *items] if trace_id is not None else items)
 
     def __release_local__(self) -> None:
-        self._storage.set({})
+        _TRACE_ID_VAR.set(None)
+        self._storage.set(_EMPTY_LOCAL_STORAGE)
 
     def __getattr__(self, name: str) -> Any:
-        values = self._storage.get({})
-        try:
-            return values[name]
-        except KeyError:
-            return None
+        if name == "trace_id":
+            return _TRACE_ID_VAR.get()
+        return self._storage.get().get(name)
 
     def __setattr__(self, name: str, value: Any) -> None:
-        values = self._storage.get({}).copy()
-        values[name] = value
-        self._storage.set(values)
+        if name == "trace_id":
+            _TRACE_ID_VAR.set(value)
+            return
+        # 写时复制：ContextVar 中的字典可能被其它上下文共享，不可原地修改
+        values = self._storage.get()
+        self._storage.set({**values, name: value} if values else {name: value})
 
     def __delattr__(self, name: str) -> None:
-        values = self._storage.get({}).copy()
-        try:
-            del values[name]
-            self._storage.set(values)
-        except KeyError:
-            ...
+        if name == "trace_id":
+            _TRACE_ID_VAR.set(None)
+            return
+        values = self._storage.get()
+        if name in values:
+            self._storage.set({key: value for key, value in values.items() if key != name})
 
 
 LOCAL_CONTEXT_VAR = LocalContextVar()
@@ -56,29 +56,54 @@ release 连接时就会报：Task got Future (Pool._wakeup) attached to a differ
 """
 import asyncio
 import logging
-import traceback
-import uuid
+import sys
 from abc import ABC
 from datetime import datetime
+from secrets import token_hex
 from typing import Dict, Any, Optional
 
 from celery import Celery
 from celery import Task
 from celery._state import _task_stack
-from celery.signals import setup_logging, task_prerun, worker_process_init
+from celery.signals import setup_logging, task_prerun, worker_init, worker_process_init
 from celery.worker.request import Request
 
+from backend.applications.aotutest.models.autotest_model import AutoTestApiTaskInfo
+from backend.applications.aotutest.services.autotest_record_crud import AUTOTEST_API_RECORD_CRUD
 from backend.common import AsyncEventLoopContextIOPool
 from backend.configure import LOGGER, CELERY_CONFIG
 from backend.configure.logging_config import InterceptHandler
+from backend.enums import AutoTestTaskStatus, AutoTestTaskScheduler
 from .celery_base import (
     ensure_tortoise_orm_initialized,
+    get_trace_id,
     init_tortoise_orm,
+    invalidate_tortoise_orm_connection_check,
+    is_db_connection_error,
+    preload_tortoise_models,
     reset_tortoise_orm_state,
-    LOCAL_CONTEXT_VAR,
+    set_trace_id,
 )
 
 _async_event_loop_pool = None
+# 扫描任务只初始化 Tortoise、不读写执行记录；驻留后与 Celery 注册的任务名比较可走身份比较快路径
+_SCAN_TASK_NAME = sys.intern("backend.celery_scheduler.tasks.task_autotest_case.scan_and_dispatch_autotest_tasks")
+# 调度方式取值到枚举的映射，写执行记录时以字典查找代替逐次构造枚举
+_SCHEDULER_BY_VALUE: Dict[str, AutoTestTaskScheduler] = {m.value: m for m in AutoTestTaskScheduler}
+# 写执行记录时需从业务任务表补全 task_name/task_kwargs/task_scheduler 的 Celery 任务名
+_RUN_AUTOTEST_TASK_NAMES = frozenset({
+    sys.intern("backend.celery_scheduler.tasks.task_autotest_case.run_autotest_task"),
+})
+
+
+@worker_init.connect
+def _preload_tortoise_models_before_fork(**kwargs):
+    """
+    Worker 主进程启动（fork 子进程之前）：预先导入全部模型模块，子进程 fork 后直接继承，
+    缩短每个子进程首个任务里 init_tortoise_orm() 的冷启动耗时。
+    """
+    preload_tortoise_models()
+    LOGGER.debug("【Krun-Celery-Worker】worker_init: 已预加载 Tortoise 模型模块")
 
 
 @worker_process_init.connect
@@ -109,12 +134,12 @@ def get_async_event_loop_pool():
 
 
 async def _ensure_tortoise_then_create_task_record(
-        trace_id: str,
         celery_id: str,
         celery_node: str,
         celery_trace_id: str,
         task_id: str,
         celery_task_name: str,
+        celery_start_time: datetime,
 ):
     """
     在同一协程内先 init Tortoise 再写执行记录，保证「连接池创建」与「使用连接池写记录」在
@@ -124,45 +149,52 @@ async def _ensure_tortoise_then_create_task_record(
     """
     await init_tortoise_orm()
     await _create_task_record(
-        trace_id=trace_id,
         celery_id=celery_id,
         celery_node=celery_node,
         celery_trace_id=celery_trace_id,
         task_id=task_id,
         celery_task_name=celery_task_name,
+        celery_start_time=celery_start_time,
     )
 
 
 async def _create_task_record(
-        trace_id: str,
         celery_id: str,
         celery_node: str,
         celery_trace_id: str,
         task_id: str,
         celery_task_name: str,
+        celery_start_time: datetime,
 ):
     """
     创建任务执行记录（状态 RUNNING），由 _ensure_tortoise_then_create_task_record 或事件循环池调用。
+    trace_id 不再逐层传参，由投递前写入的上下文经 run_coroutine_threadsafe 带入，直接 get_trace_id() 读取。
     :param celery_id: 对应 celery_id
     :param celery_node: 调度节点（Celery 任务完全限定名，如 run_autotest_task）
     :param celery_trace_id: 对应 celery_trace_id（调度回溯ID）
     :param task_id: 对应 task_id（任务信息表主键，来自 __task_id，可为空）
     :param celery_task_name: Celery 任务完全限定名，用于判断是否从业务任务表取 task_name/case_ids
+    :param celery_start_time: 开始时间，由 task_prerun 生成并保留在 task.request 上，结束时据此计算耗时
     """
-    from backend.applications.aotutest.models.autotest_model import AutoTestApiTaskInfo
-    from backend.applications.aotutest.services.autotest_record_crud import AUTOTEST_API_RECORD_CRUD
-    from backend.enums import AutoTestTaskStatus, AutoTestTaskScheduler
     task_name: Optional[str] = None
     task_kwargs: Dict[str, Any] = {}
     celery_scheduler: Optional[str] = None
     # task_id 来自 apply_async(..., __task_id=task_id)；未传 __task_id 时此处为 None，不查任务表，record 无 task_id/task_name。
-    if task_id is not None and celery_task_name and "run_autotest_task" in celery_task_name:
-        task_instance = await AutoTestApiTaskInfo.filter(id=task_id).first()
-        if task_instance:
-            task_name = getattr(task_instance, "task_name", None)
-            task_kwargs = getattr(task_instance, "task_kwargs", None) or {}
-            celery_scheduler = AutoTestTaskScheduler(task_instance.task_scheduler) if isinstance(
-                task_instance.task_scheduler, str) else task_instance.task_scheduler
+    if task_id is not None and celery_task_name in _RUN_AUTOTEST_TASK_NAMES:
+        # 仅读取写记录所需的三列，返回字典而非完整模型实例
+        task_values = await AutoTestApiTaskInfo.filter(id=task_id).first().values(
+            "task_name", "task_kwargs", "task_scheduler"
+        )
+        if task_values:
+            task_name = task_values.get("task_name")
+            task_kwargs = task_values.get("task_kwargs") or {}
+            task_scheduler = task_values.get("task_scheduler")
+            celery_scheduler = task_scheduler
+            if isinstance(task_scheduler, str):
+                celery_scheduler = _SCHEDULER_BY_VALUE.get(task_scheduler)
+                if celery_scheduler is None:
+                    # 未知取值仍交给枚举构造，保持原有的 ValueError 校验
+                    celery_scheduler = AutoTestTaskScheduler(task_scheduler)
     data: Dict[str, Any] = {
         "task_id": task_id,
         "task_name": task_name,
@@ -172,31 +204,31 @@ async def _create_task_record(
         "celery_trace_id": celery_trace_id,
         "celery_status": AutoTestTaskStatus.RUNNING,
         "celery_scheduler": celery_scheduler,
-        "celery_start_time": datetime.now(),
+        "celery_start_time": celery_start_time,
     }
     await AUTOTEST_API_RECORD_CRUD.create_record(data)
-    LOGGER.info(f"【Krun-Celery-Worker】【trace_id={trace_id}】更新执行记录成功, 已更新[celery_id={celery_id}]记录")
+    LOGGER.info(f"【Krun-Celery-Worker】【trace_id={get_trace_id()}】更新执行记录成功, 已更新[celery_id={celery_id}]记录")
 
 
 async def _update_task_record_on_end(
-        trace_id: str,
         celery_id: str,
         success: bool,
         result_or_error: str,
         traceback_str: str = None,
+        celery_start_time: Optional[datetime] = None,
 ):
     """
     将任务执行记录更新为终态（SUCCESS/FAILURE），由 on_success/on_failure 通过事件循环池调用。
+    trace_id 从投递时复制的上下文中读取。
 
     :param celery_id: Celery 任务 ID
     :param success: 是否成功
     :param result_or_error: 结果或错误摘要
     :param traceback_str: 失败时的堆栈（可选）
+    :param celery_start_time: 写入 RUNNING 记录时的开始时间（可选），用于计算耗时而无需回查记录
     """
     if not celery_id:
         return
-    from backend.applications.aotutest.services.autotest_record_crud import AUTOTEST_API_RECORD_CRUD
-    from backend.enums import AutoTestTaskStatus
 
     now = datetime.now()
     status_enum = AutoTestTaskStatus.SUCCESS if success else AutoTestTaskStatus.FAILURE
@@ -207,17 +239,15 @@ async def _update_task_record_on_end(
         "task_summary": summary,
         "task_error": None if success else (traceback_str or summary),
     }
-    record = await AUTOTEST_API_RECORD_CRUD.get_by_celery_id(celery_id=celery_id)
-    if not record:
+    updated = await AUTOTEST_API_RECORD_CRUD.finish_record_by_celery_id(
+        celery_id=celery_id,
+        data=data,
+        celery_start_time=celery_start_time,
+    )
+    trace_id = get_trace_id()
+    if not updated:
         LOGGER.error(f"【Krun-Celery-Worker】【trace_id={trace_id}】更新执行记录失败, 未找到[celery_id={celery_id}]记录")
         return
-    if record.celery_start_time:
-        start = record.celery_start_time
-        if getattr(start, "tzinfo", None) is not None:
-            start = start.replace(tzinfo=None)
-        delta = now - start
-        data["celery_duration"] = f"{delta.total_seconds():.2f}s"
-    await AUTOTEST_API_RECORD_CRUD.update_record_by_celery_id(celery_id=celery_id, data=data)
     LOGGER.info(f"【Krun-Celery-Worker】【trace_id={trace_id}】更新执行记录成功, 已更新[celery_id={celery_id}]记录")
 
 
@@ -232,13 +262,15 @@ def receiver_task_pre_run(task: Task, *args, **kwargs):
         # 来自 apply_async(..., __task_id=...)，随 Celery 消息传到 Worker 的 request.properties。
         task_id = task.request.properties.get("__task_id", None)
         trace_id = task.request.headers.get("trace_id", None)
+        if trace_id:
+            # prefork 下 TaskRequest 在主进程构造，子进程的上下文需在此写入，投递到池的协程才能读到
+            set_trace_id(trace_id)
         LOGGER.info(
             f"【Krun-Celery-Worker】【trace_id={trace_id}】任务提交完成: "
             f"task_id=[{task_id}], "
             f"task_name=[{task.name}], "
             f"celery_id=[{task.request.id}], "
         )
-        _SCAN_TASK_NAME = "backend.celery_scheduler.tasks.task_autotest_case.scan_and_dispatch_autotest_tasks"
         if task.name == _SCAN_TASK_NAME:
             # 扫描任务：只做 Tortoise 初始化（一次 run(init_tortoise_orm())），不写执行记录
             ensure_tortoise_orm_initialized()
@@ -251,32 +283,32 @@ def receiver_task_pre_run(task: Task, *args, **kwargs):
                 else:
                     celery_trace_id_val = ""
                 celery_node_val = (task.name or "").strip() or ""
+                # 同一 request 对象会一直保留到 on_success/on_failure，结束时直接取用开始时间
+                celery_start_time = task.request.celery_start_time = datetime.now()
                 get_async_event_loop_pool().run(
                     _ensure_tortoise_then_create_task_record(
-                        trace_id=trace_id,
                         task_id=task_id,
                         celery_id=task.request.id,
                         celery_node=celery_node_val,
                         celery_trace_id=celery_trace_id_val,
                         celery_task_name=task.name,
+                        celery_start_time=celery_start_time,
                     )
                 )
             except Exception as e:
-                LOGGER.error(
+                LOGGER.exception(
                     f"【Krun-Celery-Worker】【trace_id={trace_id}】创建执行记录失败:"
                     f"task_id=[{task.request.id}], "
                     f"错误类型: {type(e).__name__}, "
-                    f"错误描述: {e}, \n"
-                    f"错误回溯: {traceback.format_exc()}"
+                    f"错误描述: {e}"
                 )
     except Exception as e:
         trace_id = task.request.headers.get("trace_id", None)
-        LOGGER.error(
+        LOGGER.exception(
             f"【Krun-Celery-Worker】【trace_id={trace_id}】定时任务挂载异常: "
             f"task_id=[{task.request.id}], "
             f"错误类型: {type(e).__name__}, "
-            f"错误描述: {e}, \n"
-            f"错误回溯: {traceback.format_exc()}"
+            f"错误描述: {e}"
         )
 
 
@@ -294,9 +326,24 @@ class TaskRequest(Request):
         self.set_trace_id()
 
     def set_trace_id(self):
-        """将 trace_id 写入 LOCAL_CONTEXT_VAR，与发送端保持一致。"""
-        trace_id = self.request_dict.get("trace_id", str(uuid.uuid4()))
-        LOCAL_CONTEXT_VAR.trace_id = trace_id
+        """将 trace_id 写入上下文，与发送端保持一致。"""
+        set_trace_id(self.request_dict.get("trace_id") or token_hex(16))
+
+
+def _with_trace_id_header(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    为下发参数补齐 headers.trace_id：调用方已携带时原样保留（apply_async 转调 send_task 时即直接跳过），
+    否则沿用当前上下文的 trace_id（任务内下发的子任务与父任务同链路）；上下文没有时为本次下发生成新的，
+    且不写回上下文：beat 等长期存活的线程不在任务/请求作用域内，写回会使此后每次下发共用同一个 trace_id。
+    与调用方传入的其它 headers 合并，不整体覆盖。
+
+    :param options: apply_async/send_task 的关键字参数，原地补齐后返回
+    :return: options
+    """
+    headers = options.get("headers") or {}
+    if not headers.get("trace_id"):
+        options["headers"] = {**headers, "trace_id": get_trace_id() or token_hex(16)}
+    return options
 
 
 def create_celery():
@@ -311,16 +358,7 @@ def create_celery():
 
         def send_task(self, *args, **kwargs):
             """发送任务时注入 trace_id 到 headers。"""
-            headers = {
-                "headers": {
-                    "trace_id": LOCAL_CONTEXT_VAR.trace_id or str(uuid.uuid4())
-                }
-            }
-            if kwargs:
-                kwargs.update(headers)
-            else:
-                kwargs = headers
-            return super().send_task(*args, **kwargs)
+            return super().send_task(*args, **_with_trace_id_header(kwargs))
 
     class ContextTask(Task, ABC):
         """自定义 Task：支持异步 run、apply_async 注入 trace_id，结束时更新任务记录。"""
@@ -334,58 +372,54 @@ def create_celery():
                         link=None, link_error=None, shadow=None, **options):
             """下发时注入 trace_id、__task_id（业务任务主键），供 Worker task_prerun 写 record 用。"""
 
-            __task_id = options.get("__task_id", None)
-
-            headers = {
-                "headers": {
-                    "trace_id": LOCAL_CONTEXT_VAR.trace_id or str(uuid.uuid4())
-                },
-                "__task_id": __task_id,
-            }
-
-            if options:
-                options.update(headers)
-            else:
-                options = headers
+            options.setdefault("__task_id", None)
+            _with_trace_id_header(options)
 
             return super(ContextTask, self).apply_async(
                 args, kwargs, task_id, producer, link, link_error, shadow, **options
             )
 
+        def current_trace_id(self) -> Optional[str]:
+            """
+            获取当前任务的 trace_id：__call__ 已从 request.headers 解析并写入上下文，回调中直接读取；
+            任务体未执行（如 task_prerun 阶段失败）时再回退到 request.headers。
+            """
+            return get_trace_id() or (self.request.headers or {}).get("trace_id", None)
+
         def handel_task_record(self, success: bool, result_or_error: str, traceback_str: str = None):
             """在同步回调中通过事件循环池更新任务记录为 SUCCESS/FAILURE，扫描任务不更新。"""
-            trace_id = self.request.headers.get("trace_id", None)
-            _SCAN_TASK_NAME = "backend.celery_scheduler.tasks.task_autotest_case.scan_and_dispatch_autotest_tasks"
+            trace_id = self.current_trace_id()
             if self.request.id and self.name != _SCAN_TASK_NAME:
+                # 回调可能早于 __call__ 触发（如 task_prerun 阶段失败），确保池内协程读到同一 trace_id
+                set_trace_id(trace_id)
                 try:
                     get_async_event_loop_pool().run(
                         _update_task_record_on_end(
-                            trace_id=trace_id,
                             celery_id=self.request.id,
                             success=success,
                             result_or_error=result_or_error or "",
                             traceback_str=traceback_str,
+                            celery_start_time=getattr(self.request, "celery_start_time", None),
                         )
                     )
                 except Exception as e:
-                    LOGGER.error(
+                    LOGGER.exception(
                         f"【Krun-Celery-Worker】【trace_id={trace_id}】更新执行记录异常: "
                         f"task_id=[{self.request.id}], "
                         f"错误类型: {type(e).__name__}, "
-                        f"错误描述: {str(e)}, \n"
-                        f"错误回溯: {traceback.format_exc()}"
+                        f"错误描述: {str(e)}"
                     )
 
         def on_success(self, retval, task_id, args, kwargs):
             """Celery-Worker 任务执行成功时回调，更新执行记录为: SUCCESS"""
-            trace_id = self.request.headers.get("trace_id", None)
+            trace_id = self.current_trace_id()
             LOGGER.info(f"【Krun-Celery-Worker】【trace_id={trace_id}】任务执行成功: task_id=[{task_id}]")
             self.handel_task_record(True, str(retval) if retval is not None else "")
             return super(ContextTask, self).on_success(retval, task_id, args, kwargs)
 
         def on_failure(self, exc, task_id, args, kwargs, einfo):
             """Celery-Worker 任务执行失败时回调，更新执行记录为: FAILURE"""
-            trace_id = self.request.headers.get("trace_id", None)
+            trace_id = self.current_trace_id()
             LOGGER.error(
                 f"【Krun-Celery-Worker】【trace_id={trace_id}】任务执行失败: "
                 f"task_id=[{task_id}], "
@@ -393,7 +427,10 @@ def create_celery():
                 f"错误描述: {str(exc)}, \n"
                 f"错误回溯: {einfo.traceback}"
             )
-            self.handel_task_record(False, str(exc) if exc else "", getattr(einfo, "traceback", None) or "")
+            if is_db_connection_error(exc):
+                # 数据库异常：下次初始化时立即检查连接，而不是等待 TTL 到期
+                invalidate_tortoise_orm_connection_check()
+            self.handel_task_record(False, str(exc) if exc else "", einfo.traceback)
             return super(ContextTask, self).on_failure(exc, task_id, args, kwargs, einfo)
 
         def __call__(self, *args, **kwargs):
@@ -406,12 +443,9 @@ def create_celery():
                 ensure_tortoise_orm_initialized()
 
                 trace_id = self.request.headers.get("trace_id", None)
-                if trace_id:
-                    LOCAL_CONTEXT_VAR.trace_id = trace_id
-                else:
-                    LOCAL_CONTEXT_VAR.trace_id = LOCAL_CONTEXT_VAR.trace_id or str(uuid.uuid4())
+                set_trace_id(trace_id or get_trace_id() or token_hex(16))
             except Exception:
-                LOCAL_CONTEXT_VAR.trace_id = LOCAL_CONTEXT_VAR.trace_id or str(uuid.uuid4())
+                set_trace_id(get_trace_id() or token_hex(16))
 
             # 推送任务到堆栈
             _task_stack.push(self)
@@ -445,6 +479,4 @@ celery = create_celery()
 #   celery -A backend.celery_scheduler.celery_worker beat -l INFO
 
 if __name__ == '__main__':
-    import sys
-
     celery.start(argv=sys.argv[1:])
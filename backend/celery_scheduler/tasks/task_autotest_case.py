@@ -21,7 +21,7 @@ from backend.celery_scheduler.celery_base import (
     get_report_type_enum,
     get_scheduler_value,
     get_scheduled_tasks,
-    check_task_expired,
+    check_tasks_expired,
 )
 from backend.celery_scheduler.celery_worker import celery
 from backend.configure import LOGGER
@@ -104,10 +104,13 @@ async def _scan_and_dispatch_impl() -> Dict[str, Any]:
     """扫描到期任务并逐个下发 run_autotest_task。"""
     trace_id: str = get_trace_id()
     tasks = await get_scheduled_tasks(task_type="autotest")
+    expired_results = await check_tasks_expired(tasks)
     dispatched = 0
-    for task in tasks:
+    for task, expired in zip(tasks, expired_results):
         try:
-            if await check_task_expired(task):
+            if isinstance(expired, BaseException):
+                raise expired
+            if expired:
                 run_autotest_task.apply_async(
                     args=[task.id],
                     __task_id=task.id,
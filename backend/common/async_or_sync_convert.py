@@ -8,58 +8,62 @@
 """
 from __future__ import annotations
 
-import asyncio
 import asyncio as aio
-import inspect
-import sys
+import contextvars
+import functools
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Union, Coroutine, Any, Type, Awaitable, Optional
 
+try:
+    # uvloop 仅支持 POSIX 平台，Windows 等环境回退到标准库事件循环
+    import uvloop
+except ImportError:
+    uvloop = None
+
 AnyCallable = Callable[..., Any]
 AnyException = Union[Exception, Type[Exception]]
 AnyCoroutine = Coroutine[Any, Any, Any]
 
-PY39_VERSION = sys.version_info[:2] >= (3, 9)
-
 
 async def sync_to_async(func, *args, **kwargs):
     """
     将同步函数转换为异步函数
+    统一提交到 AsyncEventLoopContextIOPool 持有的有界线程池执行，并沿用当前上下文变量（同 asyncio.to_thread）。
 
     :param func: 同步函数
     :param args: 位置参数
     :param kwargs: 关键字参数
     :return: 异步执行的结果
     """
-    if PY39_VERSION:
-        return await asyncio.to_thread(func, *args, **kwargs)
-    else:
-        pool = AsyncEventLoopContextIOPool.singleton
-        if not pool:
-            pool = AsyncEventLoopContextIOPool()
-        return await pool.loop.run_in_executor(
-            None, lambda: func(*args, **kwargs)
-        )
+    loop = aio.get_running_loop()
+    func_call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(AsyncEventLoopContextIOPool.get_executor(), func_call)
+
+
+async def _await_awaitable(awaitable: Awaitable) -> Any:
+    """将任意 awaitable 包装为协程对象，供 asyncio.run / run_coroutine_threadsafe 使用"""
+    return await awaitable
 
 
 def async_to_sync(coroutine: Awaitable, *args, **kwargs):
     """
     将异步协程转换为同步执行
+    进程内已存在 AsyncEventLoopContextIOPool 时直接投递到池的常驻 loop 执行（与 Tortoise 同一 loop），
+    否则使用 asyncio.run 执行，不再每次手动创建、设置并关闭事件循环。
 
     :param coroutine: 异步协程
     :param args: 位置参数
     :param kwargs: 关键字参数
     :return: 异步协程执行的结果
     """
-
-    async def inner_async_function(*args, **kwargs):
-        return await coroutine
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    result = loop.run_until_complete(inner_async_function(*args, **kwargs))
-    loop.close()
-    return result
+    if not aio.iscoroutine(coroutine):
+        coroutine = _await_awaitable(coroutine)
+    pool = AsyncEventLoopContextIOPool.singleton
+    # 池线程内阻塞等待自身 loop 会死锁，此时交由 asyncio.run 报错（已有运行中的 loop）
+    if pool is not None and threading.current_thread() is not pool.loop_runner:
+        return pool.run(coroutine)
+    return aio.run(coroutine)
 
 
 class AsyncEventLoopContextIOPool:
@@ -79,6 +83,10 @@ class AsyncEventLoopContextIOPool:
     loop: aio.AbstractEventLoop
     loop_runner: threading.Thread
     singleton: Optional["AsyncEventLoopContextIOPool"] = None
+    # sync_to_async 使用的进程级共享线程池，按需创建，避免突发调用时无界地创建线程
+    executor_max_workers: int = 8
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
 
     def __new__(cls, *args: Any, **kwargs: Any) -> "AsyncEventLoopContextIOPool":
         """
@@ -93,22 +101,34 @@ class AsyncEventLoopContextIOPool:
         初始化异步 IO 池
         创建一个新的事件循环并在独立线程中运行
         """
+        # 单例再次构造时 __init__ 仍会被调用：已有可用 loop 则直接复用，不重复检测、不重复建 loop 与线程
+        if getattr(self, "loop", None) is not None and not self.loop.is_closed():
+            return
+
         try:
             # 检查是否已有运行中的事件循环
             aio.get_running_loop()
-            raise SystemError("此线程中已存在一个正在运行的循环！")
         except RuntimeError:
             pass
+        else:
+            raise SystemError("此线程中已存在一个正在运行的循环！")
 
         # 设置池的限制
         self.limit = 1
 
-        # 创建新的事件循环
-        self.loop = aio.new_event_loop()
+        # 创建新的事件循环：优先使用 uvloop（libuv 实现，回调调度与网络 IO 更快），不可用时回退到标准库
+        self.loop = uvloop.new_event_loop() if uvloop is not None else aio.new_event_loop()
+
+        # 池线程：必须在「跑协程的线程」里也 set_event_loop，否则 Tortoise/aiomysql 在池线程里
+        # 用 get_event_loop() 会拿到别的 loop，导致 Pool._wakeup 等 Future 绑定到错误 loop，引发
+        # "Task got Future attached to a different loop"；由线程入口先设置再 run_forever，无需跨线程握手等待
+        def _runner(loop: aio.AbstractEventLoop = self.loop) -> None:
+            aio.set_event_loop(loop)
+            loop.run_forever()
 
         # 在独立线程中运行事件循环
         self.loop_runner = threading.Thread(
-            target=self.loop.run_forever,
+            target=_runner,
             name="celery-worker-async-loop",
             daemon=True,
         )
@@ -118,62 +138,43 @@ class AsyncEventLoopContextIOPool:
         # 主线程：设置当前线程的事件循环（供主线程侧 get_event_loop 使用）
         aio.set_event_loop(self.loop)
 
-        # 池线程：必须在「跑协程的线程」里也 set_event_loop，否则 Tortoise/aiomysql 在池线程里
-        # 用 get_event_loop() 会拿到别的 loop，导致 Pool._wakeup 等 Future 绑定到错误 loop，引发
-        # "Task got Future attached to a different loop"
-        _done = threading.Event()
-
-        def _set_loop_in_pool_thread():
-            aio.set_event_loop(self.loop)
-            _done.set()
-
-        self.loop.call_soon_threadsafe(_set_loop_in_pool_thread)
-        _done.wait(timeout=2.0)
-
-    def run(self, task_function: Union[AnyCallable, AnyCoroutine], *args: Any, **kwargs: Any) -> Any:
+    def run(self, coroutine: AnyCoroutine) -> Any:
         """
-        在池线程的 event loop 中执行 task_function（协程或可调用），主线程阻塞直到完成。
+        在池线程的 event loop 中执行协程，主线程阻塞直到完成。
         调用方（如 task_prerun、ContextTask.__call__）在同步上下文中调用，通过 run_coroutine_threadsafe
         把协程投递到 self.loop，保证所有 async 逻辑（含 Tortoise）都在同一 loop 上执行。
-        """
-        # 若是 async 函数，先调用得到协程
-        if inspect.iscoroutinefunction(task_function):
-            task_function = task_function(*args, **kwargs)
-
-        # 如果是普通函数，使用 asyncio.to_thread 转换为协程
-        if callable(task_function) and not bool(inspect.iscoroutine(task_function) or aio.isfuture(task_function)):
-            task_function = aio.to_thread(task_function, *args, **kwargs)
-
-        # 如果不可等待，直接返回
-        if not inspect.isawaitable(task_function):
-            return task_function
-
-        try:
-            # 在事件循环中运行协程
-            result: aio.Future = aio.run_coroutine_threadsafe(task_function, self.loop)
-        except TypeError:
-            return task_function
-
-        # 检查是否有异常
-        if error := result.exception():
-            raise error
 
-        # 递归处理结果（可能返回另一个可等待对象）
-        return self.run(result.result())
+        :param coroutine: 协程对象（调用方先调用 async 函数得到协程再传入）
+        :return: 协程的返回值；协程抛出的异常由 Future.result() 原样抛出
+        """
+        return aio.run_coroutine_threadsafe(coroutine, self.loop).result()
 
     @classmethod
-    def run_in_pool(cls, task_function: Union[AnyCallable, AnyCoroutine], *args: Any, **kwargs: Any) -> Any:
+    def run_in_pool(cls, coroutine: AnyCoroutine) -> Any:
         """
-        类方法：在池中运行任务
-        :param task_function: 要执行的函数或协程
-        :param args: 位置参数
-        :param kwargs: 关键字参数
-        :return: 任务的执行结果
+        类方法：在池中运行协程
+        :param coroutine: 要执行的协程对象
+        :return: 协程的执行结果
         """
         if not (worker_pool := cls.singleton):
             worker_pool = cls()
 
-        return worker_pool.run(task_function, *args, **kwargs)
+        return worker_pool.run(coroutine)
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        """
+        获取 sync_to_async 共享的有界线程池（双重检查加锁，惰性创建）
+        :return: ThreadPoolExecutor 实例
+        """
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=cls.executor_max_workers,
+                        thread_name_prefix="krun-sync2async",
+                    )
+        return cls._executor
 
     @classmethod
     def reset_process_state(cls) -> None:
@@ -184,9 +185,14 @@ class AsyncEventLoopContextIOPool:
         清空后子进程首次 run_in_pool 会新建池、新建 loop_runner 线程，并在该线程中 init Tortoise。
         """
         cls.singleton = None
+        # 线程池的工作线程同样不会复制到子进程
+        cls._executor = None
 
     async def shutdown(self) -> None:
         """关闭 worker 池"""
+        executor, type(self)._executor = type(self)._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
         if self.loop.is_running():
             self.loop.stop()
             await self.loop.shutdown_asyncgens()
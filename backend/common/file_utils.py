@@ -6,15 +6,15 @@
 @Module  : file_utils.py
 @DateTime: 2025/1/14 12:28
 """
-import glob
+import functools
 import mimetypes
 import os
 import shutil
-import threading
+import stat
 import zipfile
 from datetime import datetime
 from pathlib import Path
-from typing import Union, Optional
+from typing import Union, Optional, List
 
 import yaml
 
@@ -23,33 +23,65 @@ from backend.core.exceptions import (
 )
 
 
-class FileUtils:
+# 模块导入时一次性加载系统 MIME 类型表，避免首次 get_file_info 调用时才解析 mime.types
+mimetypes.init()
+_guess_type = mimetypes.guess_type
+
+# get_file_size 支持的换算单位及其对应的 2 的幂次（1 KB = 1 << 10 字节），模块级常量避免每次调用重建字典
+_FILE_SIZE_UNIT_SHIFT = {
+    'B': 0,
+    'KB': 10,
+    'MB': 20,
+    'GB': 30,
+    'TB': 40,
+    'PB': 50,
+}
+
+
+def _scandir_visible(abspath: Union[str, Path]) -> List[os.DirEntry]:
     """
-    FileUtils类提供了一系列用于文件和目录操作的静态方法，采用单例模式确保在整个应用程序中只有一个实例。
+    单次 os.scandir 列出目录下的非隐藏项，与 glob.glob(os.path.join(abspath, "*")) 的结果范围一致。
+    DirEntry 缓存了 readdir 返回的类型信息，is_dir()/is_file() 对非符号链接无需再次 stat。
+
+    :param abspath: 目录的绝对路径，可以是字符串或 Path 对象
+    :return: DirEntry 列表；路径不存在、不是目录或无权限时返回空列表（与 glob 行为一致）
     """
-    __slots__ = []
-    # 用于存储该类的唯一实例
-    __private_instance = None
-    __private_initialized = False
-    __private_lock = threading.Lock()
+    try:
+        with os.scandir(abspath) as it:
+            return [entry for entry in it if not entry.name.startswith(".")]
+    except OSError:
+        return []
 
-    def __new__(cls, *args, **kwargs):
-        """
-        创建并返回类的唯一实例。
 
-        使用单例模式，在整个应用程序的生命周期内仅创建一个 `FileUtils` 实例。
-        在多线程环境下，通过 `threading.Lock` 确保线程安全。
+@functools.lru_cache(maxsize=4096)
+def _cached_isfile(path: str) -> bool:
+    """
+    带缓存的 os.path.isfile，仅在调用方显式传入 use_cache=True 时使用。
+    不存在的路径同样会被缓存（负结果缓存），重复探测同一个缺失路径时不再触发 stat。
+
+    :param path: 文件的绝对路径字符串
+    :return: 如果是文件返回 True，否则返回 False
+    """
+    return os.path.isfile(path)
 
-        :param args: 位置参数
-        :param kwargs: 关键字参数
-        :return: `FileUtils` 类的实例
-        """
-        if not cls.__private_instance and not cls.__private_initialized:
-            with cls.__private_lock:
-                if not cls.__private_instance and not cls.__private_initialized:
-                    cls.__private_instance = super().__new__(cls)
-                    cls.__private_initialized = True
-        return cls.__private_instance
+
+@functools.lru_cache(maxsize=4096)
+def _cached_isdir(path: str) -> bool:
+    """
+    带缓存的 os.path.isdir，语义同 _cached_isfile。
+
+    :param path: 目录的绝对路径字符串
+    :return: 如果是目录返回 True，否则返回 False
+    """
+    return os.path.isdir(path)
+
+
+class FileUtils:
+    """
+    FileUtils类提供了一系列用于文件和目录操作的静态方法，全部为无状态的 @staticmethod，
+    直接通过类调用（FileUtils.is_file(...)），无需创建实例。
+    """
+    __slots__ = []
 
     @staticmethod
     def str_to_path(abspath: Union[str, Path]):
@@ -60,61 +92,91 @@ class FileUtils:
         :return: 转换后的 Path 对象
         :raises TypeRejectException: 如果输入的路径不是字符串或 Path 对象类型
         """
-        if not isinstance(abspath, (str, Path)):
-            raise TypeRejectException()
+        # 已是 Path 对象时直接返回，不重复构造（最常见的情况放在最前）
+        if isinstance(abspath, Path):
+            return abspath
 
         if isinstance(abspath, str):
-            abspath: Path = Path(abspath)
+            return Path(abspath)
 
-        return abspath
+        raise TypeRejectException()
 
-    def is_file(self, abspath: Union[str, Path]) -> bool:
+    @staticmethod
+    def invalidate_path_cache() -> None:
+        """
+        清空 is_file/is_dir 的路径缓存。FileUtils 内部的增删改方法会自动调用；
+        绕过 FileUtils 直接修改文件系统的调用方，在之后使用 use_cache=True 前需手动调用。
+        lru_cache 不支持按键淘汰，因此整体清空。
+        """
+        _cached_isfile.cache_clear()
+        _cached_isdir.cache_clear()
+
+    @staticmethod
+    def is_file(abspath: Union[str, Path], use_cache: bool = False) -> bool:
         """
         检查指定路径是否为文件。
 
         :param abspath: 输入的绝对路径，可以是字符串或 Path 对象
+        :param use_cache: 是否使用进程内路径缓存（默认关闭），适用于短时间内反复探测同一批路径的场景
         :return: 如果是文件返回 True，否则返回 False
         """
-        abspath = self.str_to_path(abspath=abspath)
-        return abspath.is_file()
+        if not isinstance(abspath, (str, Path)):
+            raise TypeRejectException()
+        if use_cache:
+            return _cached_isfile(os.fspath(abspath))
+        # os.path.isfile 直接接受 str/Path，无需构造 Path 对象（Windows 下基于 GetFileAttributesW，不打开文件）
+        return os.path.isfile(abspath)
 
-    def is_dir(self, abspath: Union[str, Path]) -> bool:
+    @staticmethod
+    def is_dir(abspath: Union[str, Path], use_cache: bool = False) -> bool:
         """
         检查指定路径是否为目录。
 
         :param abspath: 输入的绝对路径，可以是字符串或 Path 对象
+        :param use_cache: 是否使用进程内路径缓存（默认关闭），语义同 is_file
         :return: 如果是目录返回 True，否则返回 False
         """
-        abspath = self.str_to_path(abspath=abspath)
-        return abspath.is_dir()
+        if not isinstance(abspath, (str, Path)):
+            raise TypeRejectException()
+        if use_cache:
+            return _cached_isdir(os.fspath(abspath))
+        return os.path.isdir(abspath)
 
-    def delete_file(self, abspath: Union[str, Path]) -> bool:
+    @staticmethod
+    def delete_file(abspath: Union[str, Path]) -> bool:
         """
         删除指定路径的文件。
 
         :param abspath: 要删除的文件的绝对路径，可以是字符串或 Path 对象
         :return: 如果文件成功删除返回 True，否则返回 False
         """
-        abspath = self.str_to_path(abspath=abspath)
-        if abspath.exists() and abspath.is_file():
+        if not isinstance(abspath, (str, Path)):
+            raise TypeRejectException()
+        # isfile 已隐含存在性判断，一次 stat 即可
+        if os.path.isfile(abspath):
             os.remove(abspath)
+            FileUtils.invalidate_path_cache()
             return True
         return False
 
-    def delete_directory(self, abspath: Union[str, Path]) -> bool:
+    @staticmethod
+    def delete_directory(abspath: Union[str, Path]) -> bool:
         """
         删除指定路径的目录及其所有内容。
 
         :param abspath: 要删除的目录的绝对路径，可以是字符串或 Path 对象
         :return: 如果目录成功删除返回 True，否则返回 False
         """
-        abspath = self.str_to_path(abspath=abspath)
-        if abspath.exists() and abspath.is_dir():
+        abspath = FileUtils.str_to_path(abspath=abspath)
+        # is_dir 已隐含存在性判断，一次 stat 即可
+        if abspath.is_dir():
             shutil.rmtree(abspath)
+            FileUtils.invalidate_path_cache()
             return True
         return False
 
-    def create_file(self, abspath: Union[str, Path], safe: bool = True) -> bool:
+    @staticmethod
+    def create_file(abspath: Union[str, Path], safe: bool = True) -> bool:
         """
         创建一个新文件。
 
@@ -122,24 +184,26 @@ class FileUtils:
         :param safe: 如果为 True，且文件已存在则不覆盖；如果为 False，且文件已存在则删除并重新创建
         :return: 如果文件成功创建返回 True，否则返回 False
         """
-        abspath = self.str_to_path(abspath=abspath)
+        abspath = FileUtils.str_to_path(abspath=abspath)
 
         def create(path):
             with open(path, 'w') as file:
                 file.write('')
+            FileUtils.invalidate_path_cache()
 
         if not abspath.exists():
             create(path=abspath)
             return True
 
         if safe is False and abspath.is_file():
-            self.delete_file(abspath=abspath)
+            FileUtils.delete_file(abspath=abspath)
             create(path=abspath)
             return True
 
         return False
 
-    def create_directory(self, abspath: Union[str, Path], safe: bool = True) -> bool:
+    @staticmethod
+    def create_directory(abspath: Union[str, Path], safe: bool = True) -> bool:
         """
         创建一个新目录。
 
@@ -147,15 +211,17 @@ class FileUtils:
         :param safe: 如果为 True，且目录已存在则不覆盖；如果为 False，且目录已存在则删除并重新创建
         :return: 如果目录成功创建返回 True，否则返回 False
         """
-        abspath = self.str_to_path(abspath=abspath)
+        abspath = FileUtils.str_to_path(abspath=abspath)
 
         if not abspath.exists():
             abspath.mkdir()
+            FileUtils.invalidate_path_cache()
             return True
 
         if safe is False and abspath.is_dir():
-            self.delete_directory(abspath=abspath)
+            FileUtils.delete_directory(abspath=abspath)
             abspath.mkdir()
+            FileUtils.invalidate_path_cache()
             return True
 
         return False
@@ -175,25 +241,20 @@ class FileUtils:
         :param exclude_endswith: 排除以该字符串结尾的目录名。默认为 None。
         :return: 满足条件的目录列表，如果 return_full_path 为 True，则返回完整路径，否则返回目录的基本名称。
         """
-        # 获取指定路径下所有的目录
-        dirs = [d for d in glob.glob(os.path.join(abspath, "*")) if os.path.isdir(d)]
-
-        # 过滤目录名
-        if startswith:
-            dirs = [d for d in dirs if os.path.basename(d).startswith(startswith)]
-        if endswith:
-            dirs = [d for d in dirs if os.path.basename(d).endswith(endswith)]
-
-        # 排除目录名
-        if exclude_startswith:
-            dirs = [d for d in dirs if not os.path.basename(d).startswith(exclude_startswith)]
-        if exclude_endswith:
-            dirs = [d for d in dirs if not os.path.basename(d).endswith(exclude_endswith)]
-
-        if return_full_path:
-            return dirs
-
-        return [os.path.basename(d) for d in dirs]
+        # 单次遍历：所有过滤/排除条件在同一个判断中完成，不生成中间列表
+        dirs = []
+        for entry in _scandir_visible(abspath):
+            name = entry.name
+            if (
+                    (startswith and not name.startswith(startswith))
+                    or (endswith and not name.endswith(endswith))
+                    or (exclude_startswith and name.startswith(exclude_startswith))
+                    or (exclude_endswith and name.endswith(exclude_endswith))
+                    or not entry.is_dir()
+            ):
+                continue
+            dirs.append(entry.path if return_full_path else name)
+        return dirs
 
     @staticmethod
     def get_all_files(abspath: Union[str, Path],
@@ -219,32 +280,29 @@ class FileUtils:
         :param exclude_extension: 排除具有该扩展名的文件。默认为 None。
         :return: 满足条件的文件列表，如果 return_full_path 为 True，则返回完整路径；如果 return_precut_path 为 True，则返回带有额外前缀的文件名；否则返回文件的基本名称。
         """
-        # 获取指定路径下所有的目录
-        files = [file for file in glob.glob(os.path.join(abspath, "*")) if os.path.isfile(file)]
-
-        # 过滤文件名
-        if startswith:
-            files = [file for file in files if os.path.basename(file).startswith(startswith)]
-        if endswith:
-            files = [file for file in files if os.path.splitext(os.path.basename(file))[0].endswith(endswith)]
-        if extension:
-            files = [file for file in files if file.endswith(extension)]
-
-        # 排除文件名
-        if exclude_startswith:
-            files = [file for file in files if not os.path.basename(file).startswith(exclude_startswith)]
-        if exclude_endswith:
-            files = [file for file in files if
-                     not os.path.splitext(os.path.basename(file))[0].endswith(exclude_endswith)]
-        if exclude_extension:
-            files = [file for file in files if not file.endswith(exclude_extension)]
-
-        if return_full_path:
-            return files
-        elif return_precut_path:
-            return [return_precut_path + os.path.splitext(os.path.basename(file))[0] for file in files]
-
-        return [os.path.basename(file) for file in files]
+        # 单次遍历：所有过滤/排除条件在同一个判断中完成，文件名与去扩展名后的名称各只计算一次
+        files = []
+        for entry in _scandir_visible(abspath):
+            name = entry.name
+            if (
+                    (startswith and not name.startswith(startswith))
+                    or (extension and not name.endswith(extension))
+                    or (exclude_startswith and name.startswith(exclude_startswith))
+                    or (exclude_extension and name.endswith(exclude_extension))
+            ):
+                continue
+            stem = os.path.splitext(name)[0]
+            if (endswith and not stem.endswith(endswith)) or (exclude_endswith and stem.endswith(exclude_endswith)):
+                continue
+            if not entry.is_file():
+                continue
+            if return_full_path:
+                files.append(entry.path)
+            elif return_precut_path:
+                files.append(return_precut_path + stem)
+            else:
+                files.append(name)
+        return files
 
     @staticmethod
     def get_file_info(abspath: Union[str, bytes, Path], filename: str = None) -> Union[bytes, tuple]:
@@ -256,57 +314,55 @@ class FileUtils:
         :return: 如果输入是文件路径，返回 (文件名, 文件字节内容, MIME 类型) 的元组；如果输入是字节数据，返回 (文件名, 字节数据, MIME 类型) 的元组；其他情况抛出 NotImplementedException
         """
         if isinstance(abspath, (str, Path)):
-            filename = os.path.basename(str(abspath))
+            filename = os.path.basename(abspath)
             with open(file=abspath, mode="rb") as file:
                 file_bytes = file.read()
 
-            mime_type = mimetypes.guess_type(abspath)[0]
+            # MIME 类型只取决于扩展名，按文件名判断即可
+            mime_type = _guess_type(filename)[0]
             return filename, file_bytes, mime_type
 
         elif isinstance(abspath, bytes):
             if not filename:
                 raise ValueError("文件名称在传递字节数据时为必填")
 
-            mime_type = mimetypes.guess_type(filename)[0]
+            mime_type = _guess_type(filename)[0]
             return filename, abspath, mime_type
 
         else:
             raise NotImplementedException(message="未实现非文件路径或字节以外的功能")
 
-    def get_file_size(self, abspath: Union[str, Path], unit: str = 'B') -> float:
+    @staticmethod
+    def get_file_size(abspath: Union[str, Path], unit: str = 'B') -> float:
         """
         获取指定文件的大小，并将其转换为指定的单位。
 
         :param abspath: 文件的绝对路径，可以是字符串或 Path 对象
-        :param unit: 要转换的目标单位，可选值包括 'B'（字节）、'KB'（千字节）、'MB'（兆字节）、'GB'（吉字节）等
+        :param unit: 要转换的目标单位，可选值包括 'B'（字节）、'KB'（千字节）、'MB'（兆字节）、'GB'（吉字节）、'TB'、'PB'
         :return: 转换为指定单位后的文件大小，保留两位小数，四舍五入
         :raises NotFoundException: 如果文件不存在
         :raises NotImplementedException: 如果指定的单位不在支持的转换单位列表中
         """
-        abspath = self.str_to_path(abspath=abspath)
-        if not abspath.exists():
+        abspath = FileUtils.str_to_path(abspath=abspath)
+        # 一次 stat 同时完成存在性判断与大小读取
+        try:
+            file_size_bytes = os.stat(abspath).st_size
+        except (FileNotFoundError, NotADirectoryError):
             raise NotFoundException(message=f"文件或目录不存在: {abspath}")
 
-        file_size_bytes = os.path.getsize(abspath)
-
-        # 定义单位转换的映射
-        unit_mapping = {
-            'B': 1,
-            'KB': 1024,
-            'MB': 1024 * 1024,
-            'GB': 1024 * 1024 * 1024,
-            # 可以根据需要添加更多单位
-        }
-
-        if unit not in unit_mapping:
-            raise NotImplementedException(message=f"给定换算单位无效，必须是其中之一: {', '.join(unit_mapping.keys())}")
+        shift = _FILE_SIZE_UNIT_SHIFT.get(unit)
+        if shift is None:
+            raise NotImplementedException(
+                message=f"给定换算单位无效，必须是其中之一: {', '.join(_FILE_SIZE_UNIT_SHIFT.keys())}"
+            )
 
         # 转换文件大小到指定单位
-        file_size_unit = round(file_size_bytes / unit_mapping[unit], 2)
+        file_size_unit = round(file_size_bytes / (1 << shift), 2)
 
         return file_size_unit
 
-    def get_last_modified_time(self, abspath: Union[str, Path]) -> datetime:
+    @staticmethod
+    def get_last_modified_time(abspath: Union[str, Path]) -> datetime:
         """
         获取指定文件的最后修改时间。
 
@@ -314,13 +370,15 @@ class FileUtils:
         :return: 文件的最后修改时间
         :raises NotFoundException: 如果文件不存在
         """
-        abspath = self.str_to_path(abspath=abspath)
-        if not abspath.exists():
+        abspath = FileUtils.str_to_path(abspath=abspath)
+        # 一次 stat 同时完成存在性判断与修改时间读取
+        try:
+            return datetime.fromtimestamp(os.stat(abspath).st_mtime)
+        except (FileNotFoundError, NotADirectoryError):
             raise NotFoundException(message=f"文件或目录不存在: {abspath}")
 
-        return datetime.fromtimestamp(os.path.getmtime(abspath))
-
-    def get_last_file_name(self, abspath: Union[str, Path]) -> str:
+    @staticmethod
+    def get_last_file_name(abspath: Union[str, Path]) -> str:
         """
         获取指定目录中最后创建的文件的名称。
 
@@ -328,20 +386,30 @@ class FileUtils:
         :return: 最后创建的文件的名称
         :raises NotFoundException: 如果目录不存在或目录中没有文件
         """
-        abspath = self.str_to_path(abspath=abspath)
-        if not abspath.exists():
+        abspath = FileUtils.str_to_path(abspath=abspath)
+        try:
+            entries = os.scandir(abspath)
+        except FileNotFoundError:
             raise NotFoundException(message=f"目录不存在: {abspath}")
 
-        # 获取目录中的所有文件
-        files = [f for f in os.listdir(abspath) if os.path.isfile(os.path.join(abspath, f))]
-        if not files:
+        # 单次遍历目录，每个文件只 stat 一次，记录创建时间最晚的文件
+        last_file_name = None
+        last_file_time = 0.0
+        with entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                file_time = entry.stat().st_ctime
+                if last_file_name is None or file_time > last_file_time:
+                    last_file_time = file_time
+                    last_file_name = entry.name
+
+        if last_file_name is None:
             raise NotFoundException(message=f"目录中不存在文件: {abspath}")
-
-        # 按创建时间排序，取最后创建的文件
-        last_file_name = max(files, key=lambda f: os.path.getctime(os.path.join(abspath, f)))
         return last_file_name
 
-    def get_last_dir_name(self, abspath: Union[str, Path]) -> str:
+    @staticmethod
+    def get_last_dir_name(abspath: Union[str, Path]) -> str:
         """
         获取指定目录中最后创建的目录的名称。
 
@@ -352,16 +420,17 @@ class FileUtils:
         last_dir_time = 0
 
         # 遍历指定目录下的所子目录
-        abspath = self.str_to_path(abspath=abspath)
-        for entry in os.scandir(abspath):
-            if entry.is_dir(follow_symlinks=False):
-                # 获取目录的创建时间
-                dir_time = entry.stat().st_ctime
-
-                # 比较时间，如果当前目录创建时间晚于之前记录的，则更新记录
-                if dir_time > last_dir_time:
-                    last_dir_time = dir_time
-                    last_dir_name = entry.name
+        abspath = FileUtils.str_to_path(abspath=abspath)
+        with os.scandir(abspath) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    # 获取目录的创建时间
+                    dir_time = entry.stat(follow_symlinks=False).st_ctime
+
+                    # 比较时间，如果当前目录创建时间晚于之前记录的，则更新记录
+                    if dir_time > last_dir_time:
+                        last_dir_time = dir_time
+                        last_dir_name = entry.name
 
         return last_dir_name
 
@@ -372,21 +441,28 @@ class FileUtils:
 
         :param src_abspath: 源文件或目录的绝对路径，可以是字符串或 Path 对象
         :param dst_abspath: 目标文件或目录的绝对路径，可以是字符串或 Path 对象
-        :return: 如果复制成功返回 True，否则返回 False
+        :return: 如果复制成功返回 True；源路径不存在或既不是文件也不是目录时返回 False
+        :raises OSError: 复制过程中出现的 I/O 异常（如权限不足、磁盘已满）
         """
-        if not os.path.exists(src_abspath):
-            return False
+        # 一次 stat 同时完成存在性与类型判断；复制过程中的 I/O 异常直接抛出，便于定位问题
         try:
-            if os.path.isdir(src_abspath):
-                shutil.copytree(src=src_abspath, dst=dst_abspath, dirs_exist_ok=True)
-                return True
-            if os.path.isfile(src_abspath):
-                shutil.copy(src=src_abspath, dst=dst_abspath)
-                return True
-            return False
-        except Exception as e:
+            mode = os.stat(src_abspath).st_mode
+        except FileNotFoundError:
             return False
 
+        if stat.S_ISDIR(mode):
+            shutil.copytree(src=src_abspath, dst=dst_abspath, dirs_exist_ok=True)
+            FileUtils.invalidate_path_cache()
+            return True
+        if stat.S_ISREG(mode):
+            # 与 shutil.copy 一样支持目标为目录，但只复制内容（copyfile 在 Linux 上走 sendfile 零拷贝），不再额外复制权限位
+            if os.path.isdir(dst_abspath):
+                dst_abspath = os.path.join(dst_abspath, os.path.basename(src_abspath))
+            shutil.copyfile(src=src_abspath, dst=dst_abspath)
+            FileUtils.invalidate_path_cache()
+            return True
+        return False
+
     @staticmethod
     def move_directory(src_abspath: Union[str, Path], dst_abspath: Union[str, Path]) -> bool:
         """
@@ -410,48 +486,67 @@ class FileUtils:
             raise ParameterException(message=f"目标目录下存在同名文件: {dst_abspath}")
 
         shutil.move(src=src_abspath, dst=dst_abspath)
+        FileUtils.invalidate_path_cache()
         return True
 
     @staticmethod
-    def zip_files(zip_file_name: str, zip_dir_path: str) -> str:
+    def zip_files(zip_file_name: str, zip_dir_path: str,
+                  compression: int = zipfile.ZIP_DEFLATED, compresslevel: Optional[int] = 1) -> str:
         """
         压缩指定目录下的所有文件到一个 zip 文件。
 
         :param zip_file_name: 压缩文件的名称
         :param zip_dir_path: 要压缩的目录的路径
+        :param compression: 压缩算法，默认 ZIP_DEFLATED；传 zipfile.ZIP_STORED 则仅打包不压缩
+        :param compresslevel: 压缩级别，默认 1（最快），以少量 CPU 换取明显更小的压缩包，减少后续传输字节数
         :return: 压缩文件的名称
         """
         parent_name = os.path.dirname(zip_dir_path)
-        # 压缩文件最后需要close，为了方便我们直接用with
-        with zipfile.ZipFile(file=zip_file_name, mode="w", compression=zipfile.ZIP_STORED) as zip:
-            for root, dirs, files in os.walk(zip_dir_path):
-                for file in files:
-                    if str(file).startswith("~$"):
-                        continue
-                    filepath = os.path.join(root, file)
-                    writepath = os.path.relpath(filepath, parent_name)
-                    zip.write(filepath, writepath)
-            zip.close()
+        # 压缩文件最后需要close，为了方便我们直接用with（退出时自动关闭）
+        with zipfile.ZipFile(file=zip_file_name, mode="w", compression=compression, compresslevel=compresslevel) as zip:
+            # 以显式栈 + os.scandir 遍历目录树，目录/文件判断复用 DirEntry 缓存的类型信息；
+            # 与 os.walk 默认行为一致：不进入符号链接目录，无法读取的目录直接跳过
+            stack = [zip_dir_path]
+            while stack:
+                try:
+                    entries = os.scandir(stack.pop())
+                except OSError:
+                    continue
+                with entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                stack.append(entry.path)
+                            continue
+                        if entry.name.startswith("~$"):
+                            continue
+                        zip.write(entry.path, os.path.relpath(entry.path, parent_name))
         return zip_file_name
 
-    def read_file(self, file_path: str, file_type: str) -> str:
+    @staticmethod
+    def read_file(file_path: str, file_type: str) -> str:
         with open(file_path, 'r') as file:
             if file_type == 'yml':
                 content = yaml.safe_load(file)
             else:
-                content = file.readlines()
+                # 一次读取整个文件，不再按行拆分成大量字符串对象
+                content = file.read()
         return content
 
-    def read_files(self, path: str, file_type: str) -> str:
-        list_file = [item for item in os.listdir(path) if item.endswith(f'.{file_type}')]
-        documentation = []
+    @staticmethod
+    def read_files(path: str, file_type: str) -> str:
+        suffix = f'.{file_type}'
+        with os.scandir(path) as entries:
+            # 只保留普通文件：同名后缀的目录会在读取时报错，直接在遍历时排除
+            list_file = [entry.name for entry in entries if entry.name.endswith(suffix) and entry.is_file()]
         if len(list_file) == 1:
-            file_path = f"{path}/{list_file[0]}"
-            response = self.read_file(file_path, file_type)
+            file_path = os.path.join(path, list_file[0])
+            response = FileUtils.read_file(file_path, file_type)
             return response
+        if file_type == 'yml' and list_file:
+            # yml 按文件解析为对象，多个文件无法拼接为单一结果，明确拒绝而不是在拼接时抛出 TypeError
+            raise ParameterException(message=f"目录中存在多个 yml 文件，无法合并读取: {path}")
         else:
-            for item in list_file:
-                file_path = f"{path}/{item}"
-                file = self.read_file(file_path, file_type)
-                documentation += file
+            # 每个文件整体读取一次，最后按文件拼接
+            documentation = [FileUtils.read_file(os.path.join(path, item), file_type) for item in list_file]
             return '\n'.join(documentation)
@@ -9,14 +9,43 @@
 import random
 import string
 import threading
+import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Literal, Union
+from functools import lru_cache
+from itertools import accumulate, chain, repeat
+from typing import Optional, Literal, Union, Tuple, List
 
 from dateutil.relativedelta import relativedelta
 from faker import Faker
 from xpinyin import Pinyin
 
+# generate_string 使用的字符表，模块导入时构建一次，避免每次调用按 length 倍数拼接临时字符串
+_DIGITS = string.digits
+_LETTERS = string.ascii_letters
+# 常用汉字（CJK 统一表意文字 U+4E00 ~ U+9FBF）
+_CJK = "".join(map(chr, range(0x4e00, 0x9fc0)))
+_ALPHABETS = (_DIGITS, _LETTERS, _CJK)
+
+
+@lru_cache(maxsize=None)
+def _string_population(digit: bool, char: bool, chinese: bool) -> Tuple[str, Optional[List[float]]]:
+    """
+    按启用的字符表构建 generate_string 的抽样字符池与累计权重，每种组合只构建一次。
+    各字符表字符数相差悬殊（汉字约 2 万、数字仅 10 个），直接在合并池中均匀抽样会几乎只出汉字，
+    因此每个字符取 1/表长 的权重，使每个启用的字符表各占相同比例。
+
+    :param digit: 是否包含数字
+    :param char: 是否包含英文字母
+    :param chinese: 是否包含汉字
+    :return: (字符池, 累计权重)，仅启用一种字符表时累计权重为 None（均匀抽样）
+    """
+    pools = [pool for pool, enabled in zip(_ALPHABETS, (digit, char, chinese)) if enabled] or [_DIGITS]
+    if len(pools) == 1:
+        return pools[0], None
+    cum_weights = list(accumulate(chain.from_iterable(repeat(1 / len(pool), len(pool)) for pool in pools)))
+    return "".join(pools), cum_weights
+
 
 class GenerateUtils:
     """数据生成工具类（单例），提供随机字符串、时间、姓名、地址等生成方法，供占位符与测试数据使用。"""
@@ -37,19 +66,35 @@ class GenerateUtils:
         :param kwargs: 关键字参数（未使用）。
         :returns: GenerateUtils 类的唯一实例。
         """
-        if not cls.__private_instance and not cls.__private_initialized:
+        if not cls.__private_instance:
             with cls.__private_lock:
-                if not cls.__private_instance and not cls.__private_initialized:
+                if not cls.__private_instance:
                     cls.__private_instance = super().__new__(cls)
-                    cls.__private_initialized = True
 
         return cls.__private_instance
 
     def __init__(self, *args, **kwargs):
-        """初始化 Faker 与 Pinyin 实例及日期时间格式映射。"""
+        """
+        初始化 Faker 与 Pinyin 实例及日期时间格式映射。
+
+        单例每次 GenerateUtils() 都会再次触发 __init__，Faker 加载 provider 开销很大，
+        因此仅首次真正初始化，完成后才置位 __private_initialized，初始化失败时下次调用会重试。
+        """
+        if self.__private_initialized:
+            return
+        with self.__private_lock:
+            if self.__private_initialized:
+                return
+            self.__init_state(*args, **kwargs)
+            type(self).__private_initialized = True
+
+    def __init_state(self, *args, **kwargs):
+        """构建 Faker、Pinyin 实例及日期时间格式映射（仅由 __init__ 在首次初始化时调用）。"""
         super().__init__(*args, **kwargs)
         self.faker_cn = Faker(locale="zh_CN")
         self.faker_en = Faker(locale="en_US")
+        # generates 按 funclocale 选择 Faker 实例
+        self._fakers: dict = {"cn": self.faker_cn, "en": self.faker_en}
         self.pinyin = Pinyin()
         self.formats: dict = {
             11: "%Y",
@@ -77,6 +122,10 @@ class GenerateUtils:
             53: "%Y/%m/%d %H:%M:%S:%f",
             54: "%Y{0}%m{1}%d{2} %H{3}%M{4}%S{5}%f{6}".format("年", "月", "日", "时", "分", "秒", "毫秒"),
         }
+        # 含中文的格式先转义为 \uXXXX 再交给 strftime（规避部分平台 strftime 不支持非 ASCII 格式串），格式串固定，预先转义一次
+        self._formats_escaped: dict = {
+            k: self.formats[k].encode("unicode_escape").decode('utf-8') for k in (23, 33, 43, 53)
+        }
 
     def generate_country(self):
         """生成随机国家名称（中文）。"""
@@ -146,10 +195,11 @@ class GenerateUtils:
 
     @classmethod
     def generate_ident_card_gender(cls, ident_card_number: str):
-        return "女" if int(ident_card_number[-2]) % 2 == 0 else "男"
+        # 倒数第二位为顺序码，奇数为男、偶数为女；数字字符的编码奇偶与数值一致，无需 int 转换
+        return "男" if ord(ident_card_number[-2]) & 1 else "女"
 
     def generates(self, funcname: str, funcargs: Optional[dict] = None, funclocale: Literal["en", "cn"] = "cn"):
-        return getattr(eval("self.faker_" + funclocale), funcname)(**funcargs or {})
+        return getattr(self._fakers[funclocale], funcname)(**funcargs or {})
 
     @classmethod
     def generate_random_number(cls, min_: int, max_: int) -> int:
@@ -157,39 +207,24 @@ class GenerateUtils:
 
     @staticmethod
     def generate_string(length: int, digit: bool = False, char: bool = False, chinese: bool = False) -> str:
+        """
+        生成指定长度的随机字符串，可组合数字、英文字母、汉字，均未指定时默认生成纯数字。
+
+        :param length: 字符串长度
+        :param digit: 是否包含数字
+        :param char: 是否包含英文字母
+        :param chinese: 是否包含汉字
+        :return: 随机字符串
+        :raises ValueError: 长度参数无法转换为整数时抛出
+        """
         try:
             length: int = int(length)
-            number = "".join(random.sample(string.digits * length, length))
-            english = "".join(random.sample(string.ascii_letters * length, length))
-            word = str("".join([chr(random.randint(0x4e00, 0x9fbf)) for _ in range(length)]))
         except ValueError as ve:
             raise ValueError(f"随机生成字符串失败，处理长度参数[{length}]时发生意外错误：{ve}")
 
-        # 1.随机一种
-        if digit and not char and not chinese:
-            generate_string = number
-        elif char and not digit and not chinese:
-            generate_string = english
-        elif chinese and not digit and not char:
-            generate_string = english
-
-        # 2.随机两种
-        elif digit and char and not chinese:
-            generate_string = "".join(random.sample(number + english, length))
-        elif digit and chinese and not char:
-            generate_string = "".join(random.sample(number + word, length))
-        elif char and chinese and not digit:
-            generate_string = "".join(random.sample(english + word, length))
-
-        # 3.随机三种
-        elif digit and char and chinese:
-            generate_string = "".join(random.sample(number + word + english, length))
-
-        # 默认
-        else:
-            generate_string = number
-
-        return generate_string[::-1]
+        # 按启用的字符表取预建的字符池与累计权重，一次性有放回抽样，各字符表出现比例相同
+        population, cum_weights = _string_population(bool(digit), bool(char), bool(chinese))
+        return "".join(random.choices(population, cum_weights=cum_weights, k=length))
 
     def generate_datetime(self, year: int = 0, month: int = 0, day: int = 0,
                           hour: int = 0, minute: int = 0, second: int = 0,
@@ -211,20 +246,23 @@ class GenerateUtils:
         if not isMicrosecond:
             current_datetime = current_datetime.replace(microsecond=0)
 
-        # 计算偏移量
-        current_datetime = current_datetime + relativedelta(**{
-            "years": year, "months": month, "days": day,
-            "hours": hour, "minutes": minute, "seconds": second
-        })
+        # 计算偏移量：不涉及年、月时用 C 实现的 timedelta，仅跨年/月需要按日历计算时才使用 relativedelta
+        if not year and not month:
+            if day or hour or minute or second:
+                current_datetime = current_datetime + timedelta(days=day, hours=hour, minutes=minute, seconds=second)
+        else:
+            current_datetime = current_datetime + relativedelta(**{
+                "years": year, "months": month, "days": day,
+                "hours": hour, "minutes": minute, "seconds": second
+            })
 
         # 格式化
         if fmt:
-            if fmt not in (23, 33, 43, 53):
+            fmt_escaped = self._formats_escaped.get(fmt)
+            if fmt_escaped is None:
                 current_datetime = current_datetime.strftime(self.formats.get(fmt, fmt))
             else:
-                current_datetime = current_datetime.strftime(
-                    self.formats.get(fmt, fmt).encode("unicode_escape").decode('utf-8')
-                ).encode("utf-8").decode("unicode_escape")
+                current_datetime = current_datetime.strftime(fmt_escaped).encode("utf-8").decode("unicode_escape")
 
         return current_datetime
 
@@ -239,7 +277,8 @@ class GenerateUtils:
         ident_card_number: str = self.generate_ident_card_number_condition(minAge, maxAge)
         ident_card_gender: str = self.generate_ident_card_gender(ident_card_number)
         ident_card_birthday: str = self.generate_ident_card_birthday(ident_card_number)
-        ident_card_age: int = int(self.generate_datetime(fmt=11)) - int(ident_card_birthday[:4])
+        birthday_year, birthday_month, birthday_day = ident_card_birthday[:4], ident_card_birthday[4:6], ident_card_birthday[6:8]
+        ident_card_age: int = int(self.generate_datetime(fmt=11)) - int(birthday_year)
         bank_card_name: str = self.generate_bank_account_number()
         resp: dict = {
             "name": ident_card_name,
@@ -255,7 +294,7 @@ class GenerateUtils:
             "company_address": self.generate_address(),
             "job": self.generate_job(),
             "birthday1": ident_card_birthday,
-            "birthday2": ident_card_birthday[:4] + "-" + ident_card_birthday[4:-2] + "-" + ident_card_birthday[-2:],
+            "birthday2": f"{birthday_year}-{birthday_month}-{birthday_day}",
         }
         return resp
 
@@ -263,21 +302,21 @@ class GenerateUtils:
         """
         全局流水号，28位（年 + 月 + 日 + 时 + 分 + 秒 + 毫秒 + 9999 + 4位随机数）
         """
-        stamp = self.generate_datetime(fmt=51, isMicrosecond=True)
-        g1 = stamp + "9999" + self.generate_string(length=4)
-        g2 = stamp + "9999" + self.generate_string(length=4)
-        g3 = stamp + "9999" + self.generate_string(length=4)
-        return g1, g2, g3
+        prefix = self.generate_datetime(fmt=51, isMicrosecond=True) + "9999"
+        # 一次抽取 12 位随机数字，切分为三组 4 位随机数
+        digits = "".join(random.choices(_DIGITS, k=12))
+        return prefix + digits[:4], prefix + digits[4:8], prefix + digits[8:]
 
     @classmethod
     def generate_uuid(cls):
-        return uuid.uuid4().__str__()
+        # 保留带连字符的标准格式，用例占位符与工具箱生成结果依赖该格式
+        return str(uuid.uuid4())
 
     @classmethod
     def generate_timestamp(cls):
-        now = datetime.now()
-        timestamp = (now - datetime(1970, 1, 1)).total_seconds() * 1000000
-        return int(timestamp)
+        # 微秒级时间戳，保持原有口径（本地时间相对 1970-01-01 的偏移，即 UTC 时间戳 + 本地时区偏移），整数运算不构造 datetime
+        now_ns = time.time_ns()
+        return now_ns // 1000 + time.localtime(now_ns // 1000000000).tm_gmtoff * 1000000
 
     @classmethod
     def generate_seconds_until_22h(cls):
@@ -291,6 +330,11 @@ class GenerateUtils:
     @classmethod
     def generate_seconds_until(cls, year: int = 0, month: int = 0, day: int = 0,
                                hour: int = 0, minute: int = 0, second: int = 0) -> int:
+        # 不涉及年、月时偏移秒数与当前时间无关，直接换算
+        if not year and not month:
+            total_seconds: int = int(day * 86400 + hour * 3600 + minute * 60 + second)
+            return total_seconds if total_seconds > 0 else 0
+
         # 当前时间
         current_datetime: datetime = datetime.now()
         target_datetime: datetime = current_datetime
@@ -8,6 +8,7 @@
 """
 from .app_initialization import (
     register_database,
+    register_http_client,
     register_exceptions,
     register_middlewares,
     register_routers,
@@ -16,6 +17,7 @@ from .data_initialization import init_database_table
 
 __all__ = (
     register_database,
+    register_http_client,
     register_exceptions,
     register_middlewares,
     register_routers,
@@ -10,8 +10,10 @@ import os
 import shutil
 import sys
 import traceback
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from typing import Dict, Any
 
+import httpx
 import tortoise.exceptions
 from aerich import Command
 from fastapi import FastAPI
@@ -102,6 +104,16 @@ async def register_database(app: FastAPI) -> None:
     await command.upgrade(run_in_transaction=True)
 
 
+async def register_http_client(app: FastAPI) -> None:
+    # 全局共享的 HTTP 客户端(用于接口调试等场景), 复用连接池与 keep-alive/TLS 会话, 在应用关闭时统一释放
+    # Cookie 策略拒绝所有域名, 保证客户端不会在不同用户/请求之间携带上一次响应下发的 Cookie
+    app.state.http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+    )
+
+
 # 注册异常处理器
 def register_exceptions(app: FastAPI) -> None:
     # 当 FastAPI 在解析和验证请求数据时发现问题，会触发 RequestValidationError 异常
@@ -6,10 +6,12 @@
 @Module  : __init__.py.py
 @DateTime: 2025/1/12 19:44
 """
-from .app_middleware import logging_middleware
+from .app_middleware import logging_middleware, start_audit_writer, stop_audit_writer
 from .auth_middleware import auth_middleware
 
 __all__ = (
     logging_middleware,
+    start_audit_writer,
+    stop_audit_writer,
     auth_middleware,
 )
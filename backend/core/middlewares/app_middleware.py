@@ -6,12 +6,13 @@
 @Module  : app_middleware.py
 @DateTime: 2025/1/17 22:29
 """
-import json
+import asyncio
 import time
 from io import BytesIO
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, List
 from urllib.parse import unquote
 
+import orjson
 from fastapi import Request, Response
 from starlette.datastructures import FormData
 
@@ -32,44 +33,214 @@ def is_upload_request(request: Request) -> bool:
     return "multipart/form-data" in content_type.lower() or path.startswith("upload") or path.endswith("upload")
 
 
-def is_html_response(response: Response) -> bool:
-    """判断响应是否为 HTML 或 XML 文本类型。
+# 审计日志的 token -> (缓存时间, 用户ID, 用户名) 缓存：同一 token 在有效期内反复请求时，不必每次解码 JWT 并查询用户表
+_AUDIT_USER_CACHE: Dict[str, Tuple[float, int, str]] = {}
+_AUDIT_USER_CACHE_TTL: float = 300.0
+_AUDIT_USER_CACHE_MAXSIZE: int = 4096
+
+# 不记录审计日志的路由（根路径、审计列表自身及 OpenApi 文档），另外 /static/ 前缀的静态文件同样排除
+_AUDIT_EXCLUDED_ROUTES = frozenset((
+    '/',
+    '/base/audit/list',
+    PROJECT_CONFIG.APP_DOCS_URL,
+    PROJECT_CONFIG.APP_REDOC_URL,
+    PROJECT_CONFIG.APP_OPENAPI_URL,
+))
+
+# 审计日志批量写入：中间件只把记录放入队列，由后台任务按批 bulk_create，请求路径上不再等待单行 INSERT
+_AUDIT_BATCH_SIZE: int = 100
+_AUDIT_FLUSH_INTERVAL: float = 1.0
+_AUDIT_QUEUE_MAXSIZE: int = 10000
+_audit_queue: Optional[asyncio.Queue] = None
+_audit_writer: Optional[asyncio.Task] = None
+
+# 审计日志输出模板（loguru 的 {} 占位符，按参数顺序填充）
+_AUDIT_LOG_TEMPLATE: str = (
+    "\n> > > > > > > > > > > > > > > > > > > >\n"
+    "请求时间：{}\n"
+    "请求模块：{}\n"
+    "请求接口：{}\n"
+    "请求方式：{}\n"
+    "请求路由：{}\n"
+    "请求来源：{}\n"
+    "请求头部：{}\n"
+    "请求参数：{}\n"
+    "响应头部：{}\n"
+    "响应代码：{}\n"
+    "响应消息：{}\n"
+    "响应参数：{}\n"
+    "响应时间：{}\n"
+    "响应耗时：{}\n"
+    "< < < < < < < < < < < < < < < < < < < < "
+)
+
+# 路由 -> 模块/接口名映射：lifespan 启动时原地填充（不会重新赋值），导入时绑定同一 dict 对象，省去每次请求的配置属性查找
+_ROUTER_TAGS: Dict[str, Any] = GLOBAL_CONFIG.ROUTER_TAGS
+_ROUTER_SUMMARY: Dict[str, Any] = GLOBAL_CONFIG.ROUTER_SUMMARY
+
+# 审计时间格式化的单条缓存：(整秒时间戳, 格式化结果)，同一秒内的请求/响应直接复用
+_formatted_audit_time: Tuple[int, str] = (-1, "")
+
+# classify_response 返回的响应类型标记位
+RESPONSE_DOWNLOAD = 1
+RESPONSE_HTML = 2
+RESPONSE_IMAGE = 4
+RESPONSE_LONGTEXT = 8
+RESPONSE_STREAM = 16
+
+
+def classify_response(response: Response) -> int:
+    """一次读取响应头，判断响应是否为附件下载、HTML/XML 文本、图片或长文本（用于决定审计日志中响应体的记录方式）。
 
     :param response: 响应对象。
-    :returns: Content-Type 含 text/html 或 application/xml 时返回 True。
+    :returns: 标记位组合：Content-Disposition 含 attachment 为 RESPONSE_DOWNLOAD；
+              Content-Type 含 text/html 或 application/xml 为 RESPONSE_HTML；Content-Type 含 image 为 RESPONSE_IMAGE；
+              Content-Length 大于 102400 字节为 RESPONSE_LONGTEXT；
+              无 Content-Length（流式/分块输出，如 SuccessStreamResponse）为 RESPONSE_STREAM。
     """
-    content_type: str = response.headers.get("content-type", "")
-    return "text/html" in content_type.lower() or "application/xml" in content_type.lower()
+    headers = response.headers
+    content_type: str = headers.get("content-type", "").lower()
+    flags: int = 0
+    if "attachment" in headers.get("content-disposition", "").lower():
+        flags |= RESPONSE_DOWNLOAD
+    if "text/html" in content_type or "application/xml" in content_type:
+        flags |= RESPONSE_HTML
+    if "image" in content_type:
+        flags |= RESPONSE_IMAGE
+    content_length: Optional[str] = headers.get("content-length")
+    if content_length is None:
+        flags |= RESPONSE_STREAM
+    elif int(content_length) > 102400:
+        flags |= RESPONSE_LONGTEXT
+    return flags
+
+
+def format_audit_time(timestamp: float) -> str:
+    """按 GLOBAL_CONFIG.DATETIME_FORMAT2 格式化审计时间（精确到秒），同一秒内重复调用直接返回上次结果。
+
+    :param timestamp: time.time() 返回的时间戳。
+    :returns: 格式化后的本地时间字符串。
+    """
+    global _formatted_audit_time
+    seconds: int = int(timestamp)
+    if _formatted_audit_time[0] != seconds:
+        _formatted_audit_time = (seconds, time.strftime(GLOBAL_CONFIG.DATETIME_FORMAT2, time.localtime(seconds)))
+    return _formatted_audit_time[1]
 
 
-def is_image_response(response: Response) -> bool:
-    """判断响应是否为图片类型。
+def invalidate_audit_user_cache(token: Optional[str] = None) -> None:
+    """使审计日志的用户缓存失效（如用户信息变更或 token 作废后调用）。
 
-    :param response: 响应对象。
-    :returns: Content-Type 含 image 时返回 True。
+    :param token: 需要失效的 token；为 None 时清空全部缓存。
     """
-    content_type: str = response.headers.get("content-type", "")
-    return "image" in content_type.lower()
+    if token is None:
+        _AUDIT_USER_CACHE.clear()
+    else:
+        _AUDIT_USER_CACHE.pop(token, None)
 
 
-def is_download_response(response: Response) -> bool:
-    """判断响应是否为附件下载（Content-Disposition 含 attachment）。
+async def resolve_audit_user(token: Optional[str]) -> Tuple[int, str]:
+    """解析审计日志记录的用户ID与用户名，结果按 token 缓存 _AUDIT_USER_CACHE_TTL 秒。
 
-    :param response: 响应对象。
-    :returns: 为附件下载时返回 True。
+    :param token: 请求头中的 token。
+    :returns: (用户ID, 用户名)；无 token 或鉴权失败时返回 (0, "")，失败结果不缓存。
     """
-    content_disposition: str = response.headers.get("content-disposition", "")
-    return "attachment" in content_disposition.lower()
+    if not token:
+        return 0, ""
 
+    now: float = time.monotonic()
+    cached = _AUDIT_USER_CACHE.get(token)
+    if cached is not None and now - cached[0] < _AUDIT_USER_CACHE_TTL:
+        return cached[1], cached[2]
 
-def is_longtext_response(response: Response) -> bool:
-    """判断响应体是否超过 102400 字节（用于决定是否截断审计日志中的响应体）。
+    try:
+        user_obj: Optional[User] = await AuthControl.is_authed(token)
+    except Exception:
+        return 0, ""
+    if not user_obj:
+        return 0, ""
 
-    :param response: 响应对象。
-    :returns: Content-Length 大于 5000 时返回 True。
+    # 达到容量上限时淘汰最早写入的条目（dict 保持插入顺序）
+    if token not in _AUDIT_USER_CACHE and len(_AUDIT_USER_CACHE) >= _AUDIT_USER_CACHE_MAXSIZE:
+        _AUDIT_USER_CACHE.pop(next(iter(_AUDIT_USER_CACHE)))
+    _AUDIT_USER_CACHE[token] = (now, user_obj.id, user_obj.username)
+    return user_obj.id, user_obj.username
+
+
+async def _write_audit_logs(batch: List[Dict[str, Any]]) -> None:
+    """批量写入审计记录，失败只记录日志，不影响后续批次。
+
+    :param batch: 审计记录字典列表。
+    """
+    try:
+        await Audit.bulk_create([Audit(**audit_log) for audit_log in batch])
+    except Exception:
+        LOGGER.exception(f"审计日志批量落库失败, 丢弃 {len(batch)} 条记录")
+
+
+async def _audit_writer_loop(queue: asyncio.Queue) -> None:
+    """后台消费审计队列：攒够 _AUDIT_BATCH_SIZE 条或等待满 _AUDIT_FLUSH_INTERVAL 秒即写入一批，收到 None 时写完剩余记录后退出。
+
+    :param queue: 审计记录队列。
+    """
+    loop = asyncio.get_running_loop()
+    stopping: bool = False
+    while not stopping:
+        audit_log = await queue.get()
+        if audit_log is None:
+            break
+        batch: List[Dict[str, Any]] = [audit_log]
+        deadline: float = loop.time() + _AUDIT_FLUSH_INTERVAL
+        while len(batch) < _AUDIT_BATCH_SIZE:
+            try:
+                audit_log = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout: float = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    audit_log = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if audit_log is None:
+                stopping = True
+                break
+            batch.append(audit_log)
+        await _write_audit_logs(batch)
+
+
+async def start_audit_writer() -> None:
+    """启动审计日志后台写入任务（在应用 lifespan 启动阶段、数据库注册之后调用）。"""
+    global _audit_queue, _audit_writer
+    if _audit_writer is not None and not _audit_writer.done():
+        return
+    _audit_queue = asyncio.Queue(maxsize=_AUDIT_QUEUE_MAXSIZE)
+    _audit_writer = asyncio.create_task(_audit_writer_loop(_audit_queue))
+
+
+async def stop_audit_writer() -> None:
+    """停止审计日志后台写入任务，并等待队列中剩余记录写入完成（在关闭数据库连接之前调用）。"""
+    global _audit_queue, _audit_writer
+    queue, writer = _audit_queue, _audit_writer
+    _audit_queue, _audit_writer = None, None
+    if writer is None or writer.done():
+        return
+    await queue.put(None)
+    await writer
+
+
+async def save_audit_log(audit_log: Dict[str, Any]) -> None:
+    """保存一条审计记录：写入任务已启动时放入队列批量落库；未启动或队列已满时直接写库。
+
+    :param audit_log: 审计记录字典。
     """
-    content_length: int = response.headers.get("content-length", 0)
-    return int(content_length) > 102400
+    if _audit_queue is not None:
+        try:
+            _audit_queue.put_nowait(audit_log)
+            return
+        except asyncio.QueueFull:
+            pass
+    await Audit.create(**audit_log)
 
 
 async def logging_middleware(request: Request, call_next):
@@ -79,12 +250,14 @@ async def logging_middleware(request: Request, call_next):
     :param call_next: 下一层 ASGI 可调用对象。
     :returns: 下游返回的 Response。
     """
+    # 路由排除（静态文件&OpenApi文档）：不审计的请求直接放行，不缓冲请求体与响应体
+    request_router: str = request.url.path
+    if request_router.startswith("/static/") or request_router in _AUDIT_EXCLUDED_ROUTES:
+        return await call_next(request)
+
     # 接口服务时间
     start_time = time.time()
-    request_time: str = time.strftime(GLOBAL_CONFIG.DATETIME_FORMAT2, time.localtime(start_time))
-
-    # 变量初始化
-    request_body, response_body = b'', b''
+    request_time: str = format_audit_time(start_time)
 
     # 读取并保存原始请求体，重置请求流以便后续处理
     original_request_body: bytes = await request.body()
@@ -108,12 +281,13 @@ async def logging_middleware(request: Request, call_next):
                 form_data[field_name] = field_value
 
         # 重置流的位置到开头，确保后续处理能正确读取
-        request_body = json.dumps(form_data, ensure_ascii=False).encode("utf-8")
+        request_body: str = orjson.dumps(form_data).decode("utf-8")
         request._stream.seek(0)
+    else:
+        request_body: str = original_request_body.decode("utf-8", errors="ignore")
 
     # 记录请求信息
     request_method: str = request.method
-    request_router: str = request.url.path
     request_header: dict = dict(request.headers)
     if "referer" in request_header and request_header["referer"]:
         try:
@@ -121,112 +295,95 @@ async def logging_middleware(request: Request, call_next):
         except:
             pass
     request_client: str = request.client.host if request.client else "127.0.0.1"
-    request_tags: str = GLOBAL_CONFIG.ROUTER_TAGS.get(request_router or "未定义", "未定义")
-    request_summary: str = GLOBAL_CONFIG.ROUTER_SUMMARY.get(request_router or "未定义", "未定义")
-    request_body: bytes = request_body if is_upload else original_request_body.decode("utf-8", errors="ignore")
+    request_tags: str = _ROUTER_TAGS.get(request_router or "未定义", "未定义")
+    request_summary: str = _ROUTER_SUMMARY.get(request_router or "未定义", "未定义")
     request_params: str = unquote(request.query_params.__str__())
 
     # 请求流传递并获取响应
     response = await call_next(request)
 
     # 判断是否管控响应
-    is_download: bool = is_download_response(response)
-    is_html: bool = is_html_response(response)
-    is_image: bool = is_image_response(response)
-    is_longtext: bool = is_longtext_response(response)
+    response_flags: int = classify_response(response)
 
     response_header: dict = dict(response.headers)
 
-    # 路由排除（静态文件&OpenApi文档）
-    if not request_router.startswith("/static/") and request_router not in (
-            '/',
-            '/base/audit/list',
-            PROJECT_CONFIG.APP_DOCS_URL,
-            PROJECT_CONFIG.APP_REDOC_URL,
-            PROJECT_CONFIG.APP_OPENAPI_URL,
-    ):
-        # 消费响应体
-        if is_download:
-            response_body: bytes = b"<FILE DOWNLOAD>"
-        elif is_html:
-            response_body: bytes = b"<HTML CONTENT>"
-        elif is_image:
-            response_body: bytes = b"<IMAGE CONTENT>"
-        elif is_longtext:
-            response_body: bytes = b"<LONGTEXT CONTENT>"
-        else:
-            body_chunks = []
-            async for chunk in response.body_iterator:
-                body_chunks.append(chunk)
-
-            response_body: str = b"".join(body_chunks).decode("utf-8", errors="ignore")
-
-            # 重置响应体
-            response = Response(
-                content=response_body,
-                status_code=response.status_code,
-                headers=response_header,
-                media_type=response.media_type
-            )
-
-        # 接口服务结束时间
-        end_time = time.time()
-        response_time: str = time.strftime(GLOBAL_CONFIG.DATETIME_FORMAT2, time.localtime(end_time))
-        response_elapsed = f"{end_time - start_time:.4f}s"
-
-        # 记录日志
-        audit_log: Dict[str, Any] = {
-            "request_time": request_time,
-            "request_tags": request_tags,
-            "request_summary": request_summary,
-            "request_method": request_method,
-            "request_router": request_router,
-            "request_client": request_client,
-            "request_header": request_header,
-            "request_params": request_body or request_params,
-            "response_time": response_time,
-            "response_header": response_header,
-            "response_elapsed": response_elapsed
-        }
-        if isinstance(response_body, str):
-            _response = json.loads(response_body)
-            audit_log["response_code"] = _response.get("code", "")
-            audit_log["response_message"] = _response.get("message", "")[:512]
-            audit_log["response_params"] = response_body
-            del _response
-
-        request_message: str = f"\n> > > > > > > > > > > > > > > > > > > >\n" \
-                               f"请求时间：{audit_log.get('request_time')}\n" \
-                               f"请求模块：{audit_log.get('request_tags')}\n" \
-                               f"请求接口：{audit_log.get('request_summary')}\n" \
-                               f"请求方式：{audit_log.get('request_method')}\n" \
-                               f"请求路由：{audit_log.get('request_router')}\n" \
-                               f"请求来源：{audit_log.get('request_client')}\n" \
-                               f"请求头部：{audit_log.get('request_header')}\n" \
-                               f"请求参数：{audit_log.get('request_params')}\n" \
-                               f"响应头部：{audit_log.get('response_header')}\n" \
-                               f"响应代码：{audit_log.get('response_code')}\n" \
-                               f"响应消息：{audit_log.get('response_message')}\n" \
-                               f"响应参数：{audit_log.get('response_params')}\n" \
-                               f"响应时间：{audit_log.get('response_time')}\n" \
-                               f"响应耗时：{audit_log.get('response_elapsed')}\n" \
-                               f"< < < < < < < < < < < < < < < < < < < < "
-
-        LOGGER.info(request_message)
-
-        try:
-            # 获取用户信息
-            user_obj: Optional[User] = None
-            token = request.headers.get("token")
-            if token:
-                user_obj: User = await AuthControl.is_authed(token)
-            audit_log["user_id"] = user_obj.id if user_obj else 0
-            audit_log["username"] = user_obj.username if user_obj else ""
-        except Exception as e:
-            audit_log["user_id"] = 0
-            audit_log["username"] = ""
-
-        # 审计落库
-        await Audit.create(**audit_log)
+    # 消费响应体
+    if response_flags & RESPONSE_DOWNLOAD:
+        response_body: bytes = b"<FILE DOWNLOAD>"
+    elif response_flags & RESPONSE_HTML:
+        response_body: bytes = b"<HTML CONTENT>"
+    elif response_flags & RESPONSE_IMAGE:
+        response_body: bytes = b"<IMAGE CONTENT>"
+    elif response_flags & RESPONSE_LONGTEXT:
+        response_body: bytes = b"<LONGTEXT CONTENT>"
+    elif response_flags & RESPONSE_STREAM:
+        # 流式响应原样透传：缓冲整个响应体会使首字节等待全部输出完成，且峰值内存高于非流式响应
+        response_body: bytes = b"<STREAM CONTENT>"
+    else:
+        # 单个可增长缓冲区累积响应分块，直接在缓冲区上解码，不再保留分块列表
+        body_buffer = bytearray()
+        async for chunk in response.body_iterator:
+            body_buffer.extend(chunk)
+
+        response_body: str = body_buffer.decode("utf-8", errors="ignore")
+
+        # 重置响应体（使用原始字节，避免再次编码，且与原 content-length 保持一致）
+        response = Response(
+            content=bytes(body_buffer),
+            status_code=response.status_code,
+            headers=response_header,
+            media_type=response.media_type
+        )
+
+    # 接口服务结束时间
+    end_time = time.time()
+    response_time: str = format_audit_time(end_time)
+    response_elapsed = f"{end_time - start_time:.4f}s"
+
+    # 记录日志
+    audit_log: Dict[str, Any] = {
+        "request_time": request_time,
+        "request_tags": request_tags,
+        "request_summary": request_summary,
+        "request_method": request_method,
+        "request_router": request_router,
+        "request_client": request_client,
+        "request_header": request_header,
+        "request_params": request_body or request_params,
+        "response_time": response_time,
+        "response_header": response_header,
+        "response_elapsed": response_elapsed
+    }
+    if isinstance(response_body, str):
+        _response = orjson.loads(response_body)
+        audit_log["response_code"] = _response.get("code", "")
+        audit_log["response_message"] = _response.get("message", "")[:512]
+        audit_log["response_params"] = response_body
+        del _response
+
+    # 由 loguru 在日志实际输出时才格式化（级别被过滤时不做任何拼接）
+    LOGGER.info(
+        _AUDIT_LOG_TEMPLATE,
+        audit_log.get("request_time"),
+        audit_log.get("request_tags"),
+        audit_log.get("request_summary"),
+        audit_log.get("request_method"),
+        audit_log.get("request_router"),
+        audit_log.get("request_client"),
+        audit_log.get("request_header"),
+        audit_log.get("request_params"),
+        audit_log.get("response_header"),
+        audit_log.get("response_code"),
+        audit_log.get("response_message"),
+        audit_log.get("response_params"),
+        audit_log.get("response_time"),
+        audit_log.get("response_elapsed"),
+    )
+
+    # 获取用户信息
+    audit_log["user_id"], audit_log["username"] = await resolve_audit_user(request_header.get("token"))
+
+    # 审计落库
+    await save_audit_log(audit_log)
 
     return response
@@ -6,7 +6,7 @@
 @Module  : __init__.py.py
 @DateTime: 2025/1/12 19:44
 """
-from .base_response import BaseResponse
+from .base_response import BaseResponse, SuccessStreamResponse
 from .http_response import (
     SuccessResponse,
     FailureResponse,
@@ -29,6 +29,7 @@ from .http_response import (
 )
 
 __all__ = (
+    SuccessStreamResponse,
     SuccessResponse,
     FailureResponse,
     BadReqResponse,
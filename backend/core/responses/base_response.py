@@ -7,14 +7,39 @@
 @DateTime: 2025/1/16 16:14
 """
 import json
-from typing import Optional, Union, List, Any, Dict
+from typing import Optional, Union, List, Any, Dict, Iterable, Callable, AsyncIterator
 
+import orjson
 from fastapi.encoders import jsonable_encoder
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 
 from backend.enums import Code, Status, Message
 
 
+def dumps_content(content: Any, option: Optional[int] = None) -> bytes:
+    """
+    序列化响应内容为 JSON 字节串
+
+    dict/list/str/数值/datetime/UUID/Enum 等原生类型直接由 orjson 序列化, 跳过 jsonable_encoder 的逐项递归;
+    pydantic/ORM 模型、Decimal、set 等 orjson 不支持的值仅在其所在位置经 default 回调交给 jsonable_encoder 转换,
+    无需为个别字段把整个内容重新编码一遍; 非字符串键(如 int 主键)由始终开启的 OPT_NON_STR_KEYS 转为字符串键,
+    与标准库 json.dumps 一致; 仍无法序列化时(如超过 64 位的整数)整体经 jsonable_encoder 转换后改用标准库 json 序列化
+
+    :param content: 响应内容
+    :param option: orjson 序列化选项(如 orjson.OPT_NON_STR_KEYS)
+    :return: UTF-8 编码的 JSON 字节串
+    """
+    # 始终允许非字符串键(如按 int 主键分组的字典), 与标准库 json.dumps 一样输出为字符串键
+    option = orjson.OPT_NON_STR_KEYS | (option or 0)
+    try:
+        return orjson.dumps(content, default=jsonable_encoder, option=option)
+    except TypeError:
+        # orjson 无法处理的值(如超过 64 位的整数)整体回退到标准库 json, 与原 JSONResponse 的输出格式一致
+        return json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
 class BaseResponse(JSONResponse):
     http_status_code = 200
     code: Code = Code.CODE200
@@ -62,6 +87,56 @@ class BaseResponse(JSONResponse):
 
         super(BaseResponse, self).__init__(
             status_code=self.http_status_code,
-            content=jsonable_encoder(resp),
+            content=resp,
             **kwargs
         )
+
+    def render(self, content: Any) -> bytes:
+        # 使用 orjson 序列化响应体(输出即为 UTF-8 字节, 与 JSONResponse 的 ensure_ascii=False 紧凑格式一致),
+        # 对步骤树、分页列表等大体量响应的序列化耗时远低于标准库 json
+        return dumps_content(content)
+
+
+class SuccessStreamResponse(StreamingResponse):
+    """
+    流式输出的成功响应, 响应体结构与 SuccessResponse 一致({code, status, message, data, total})
+
+    data 中的 stream_field 字段(通常为体量最大的结果列表)逐项序列化后分块输出, 首字节无需等待整体序列化完成,
+    峰值内存也只保留单项的序列化结果
+    """
+
+    def __init__(self,
+                 message: Optional[str] = None,
+                 data: Optional[Dict[str, Any]] = None,
+                 stream_field: str = "results",
+                 stream_items: Optional[Iterable[Any]] = None,
+                 serializer: Optional[Callable[[Any], Any]] = None,
+                 total: Optional[int] = None,
+                 json_option: Optional[int] = None,
+                 **kwargs):
+        self.message = message or Message.MESSAGE200.value
+        self.data = data or {}
+        self.stream_field = stream_field
+        self.stream_items = stream_items or []
+        self.serializer = serializer
+        self.total = total
+        self.json_option = json_option
+        super(SuccessStreamResponse, self).__init__(self._iter_body(), media_type="application/json", **kwargs)
+
+    async def _iter_body(self) -> AsyncIterator[bytes]:
+        head: bytes = orjson.dumps({"code": Code.CODE200.value, "status": Status.SUCCESS.value, "message": self.message})
+        yield head[:-1] + b',"data":{'
+        for key, value in self.data.items():
+            yield orjson.dumps(str(key)) + b":" + dumps_content(value, self.json_option) + b","
+        yield orjson.dumps(self.stream_field) + b":["
+        try:
+            for index, item in enumerate(self.stream_items):
+                chunk: bytes = dumps_content(self.serializer(item) if self.serializer else item, self.json_option)
+                yield b"," + chunk if index else chunk
+            yield b"]"
+        except Exception as e:
+            # 响应头已发出, 无法再改写状态码: 闭合已输出的列表并附加 stream_error 标记, 保证响应体仍为合法 JSON
+            from backend.configure import LOGGER  # 延迟导入, 避免 configure -> common -> exceptions -> responses 的循环导入
+            LOGGER.exception(f"流式输出响应字段({self.stream_field})失败, 错误描述: {e}")
+            yield b'],"stream_error":' + orjson.dumps(str(e))
+        yield b'},"total":' + orjson.dumps(self.total) + b"}"
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+@Author  : yangkai
+@Email   : 807440781@qq.com
+@Project : Krun
+@Module  : test_base_response.py
+@DateTime: 2026/10/16 12:00
+"""
+import json
+
+from backend.core.responses import SuccessResponse
+from backend.core.responses.base_response import dumps_content
+
+
+def test_dumps_content_int_keys_and_sets():
+    """步骤树保存结果中的 process_detail 以 int case_id 为键、值为集合，需与标准库 json 一样输出字符串键。"""
+    content = {"process_detail": {1: {2, 3}}}
+    assert json.loads(dumps_content(content)) == {"process_detail": {"1": [2, 3]}}
+
+
+def test_success_response_int_keys():
+    response = SuccessResponse(data={"cases": [], "steps": {"process_detail": {1: {2}}}})
+    assert json.loads(response.body)["data"]["steps"]["process_detail"] == {"1": [2]}
+
+
+def test_dumps_content_big_int():
+    """超过 64 位的整数(如上游返回的 20 位订单号)orjson 无法序列化，需回退标准库 json 且保持精度。"""
+    content = {"v": 10 ** 20, "process_detail": {1: {2}}}
+    assert json.loads(dumps_content(content)) == {"v": 10 ** 20, "process_detail": {"1": [2]}}
+    response = SuccessResponse(data={"v": 10 ** 20})
+    assert json.loads(response.body)["data"]["v"] == 10 ** 20